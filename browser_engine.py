@@ -13,25 +13,59 @@ from selenium.webdriver.support.ui import Select
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+import contextlib
 import time
 import os
+import itertools
+import re
+from urllib.parse import urlparse
+import evidence_capture
+import rate_limiter
+import session_cache
+import session_recorder
+from session_recorder import recorded
+
+try:
+    import psutil
+except ImportError:  # psutil 为可选依赖，缺失时只按页面数回收浏览器
+    psutil = None
+
+# 同一秒内的多张截图用序号区分，避免文件名冲突
+_screenshot_counter = itertools.count()
 
 
 class BrowserEngine:
     """浏览器操作引擎"""
 
-    def __init__(self, headless: bool = False, timeout: int = 10):
+    def __init__(self, headless: bool = False, timeout: int = 10,
+                 max_pages: int = None, max_rss_mb: int = None):
         """
         初始化浏览器引擎
 
         Args:
             headless: 是否无头模式运行
             timeout: 默认等待超时时间（秒）
+            max_pages: 访问页面数达到该值后自动重启浏览器，None 表示不限制
+            max_rss_mb: Chrome 进程总内存超过该值（MB）后自动重启浏览器，需要 psutil
         """
         self.driver = None
         self.wait = None
         self.timeout = timeout
         self.headless = headless
+        self.user_data_dir = None
+        self.capture_writer = None
+        self.rate_limiter = None
+        self.pace_priority = rate_limiter.PRIORITY_NORMAL
+        self.recorder = None
+        self._record_depth = 0
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.pages_served = 0
+        self.recycle_count = 0
+        self._recycling = False
+        if max_rss_mb and psutil is None:
+            print("[警告] 未安装 psutil，无法监控浏览器内存，仅按页面数回收")
 
     def start_browser(self, user_data_dir: str = None):
         """
@@ -40,6 +74,7 @@ class BrowserEngine:
         Args:
             user_data_dir: Chrome用户数据目录，用于保持登录状态
         """
+        self.user_data_dir = user_data_dir
         try:
             # Chrome选项设置
             chrome_options = Options()
@@ -71,6 +106,7 @@ class BrowserEngine:
             print("请确保已安装 Chrome 浏览器和 ChromeDriver")
             return False
 
+    @recorded
     def navigate_to(self, url: str) -> bool:
         """
         导航到指定URL
@@ -82,13 +118,53 @@ class BrowserEngine:
             bool: 是否成功
         """
         try:
+            # 马上要跳转到新页面，回收时无需再打开当前页面
+            self.recycle_if_needed(restore_url=False)
+            self._pace(url)
             self.driver.get(url)
+            self.pages_served += 1
             print(f"[导航] 已访问: {url}")
             return True
         except Exception as e:
             print(f"[错误] 导航失败: {e}")
             return False
 
+    def set_rate_limiter(self, limiter: rate_limiter.RateLimiter,
+                         priority: int = rate_limiter.PRIORITY_NORMAL):
+        """
+        设置共享限速器，导航和点击前按域名获取访问令牌
+
+        Args:
+            limiter: 限速器实例，多个浏览器使用同一数据库文件即可共享限额
+            priority: 本浏览器使用的优先级通道
+        """
+        self.rate_limiter = limiter
+        self.pace_priority = priority
+
+    @contextlib.contextmanager
+    def priority_lane(self, priority: int):
+        """
+        临时切换限速优先级通道，如登录和会话探测使用高优先级，不必排在批量页面之后
+
+        Args:
+            priority: 代码块内使用的优先级通道
+        """
+        previous = self.pace_priority
+        self.pace_priority = priority
+        try:
+            yield
+        finally:
+            self.pace_priority = previous
+
+    def _pace(self, url: str = None):
+        """按目标域名限速，未设置限速器时直接返回"""
+        if not self.rate_limiter:
+            return
+        waited = self.rate_limiter.acquire_for_url(url or self.get_current_url(), self.pace_priority)
+        if waited >= 1:
+            print(f"[限速] 等待 {waited:.1f} 秒")
+
+    @recorded
     def find_element_safe(self, selector: str, by: By = By.CSS_SELECTOR):
         """
         安全地查找元素
@@ -107,6 +183,7 @@ class BrowserEngine:
             print(f"[警告] 未找到元素: {selector}")
             return None
 
+    @recorded
     def find_and_fill(self, selector: str, value: str, by: By = By.CSS_SELECTOR) -> bool:
         """
         查找元素并填入值
@@ -133,6 +210,7 @@ class BrowserEngine:
             print(f"[错误] 填充失败 {selector}: {e}")
             return False
 
+    @recorded
     def find_and_click(self, selector: str, by: By = By.CSS_SELECTOR) -> bool:
         """
         查找元素并点击
@@ -146,6 +224,7 @@ class BrowserEngine:
         """
         try:
             element = self.wait.until(EC.element_to_be_clickable((by, selector)))
+            self._pace()
             element.click()
             print(f"[点击] {selector}")
             return True
@@ -156,6 +235,7 @@ class BrowserEngine:
             print(f"[错误] 点击失败 {selector}: {e}")
             return False
 
+    @recorded
     def select_dropdown(self, selector: str, value: str, by: By = By.CSS_SELECTOR) -> bool:
         """
         选择下拉框选项
@@ -183,6 +263,7 @@ class BrowserEngine:
             print(f"[错误] 下拉选择失败 {selector}: {e}")
             return False
 
+    @recorded
     def wait_for_element(self, selector: str, by: By = By.CSS_SELECTOR, timeout: int = None):
         """
         等待元素出现
@@ -204,6 +285,7 @@ class BrowserEngine:
             print(f"[超时] 等待元素超时: {selector}")
             return None
 
+    @recorded
     def scroll_to_element(self, selector: str, by: By = By.CSS_SELECTOR) -> bool:
         """
         滚动到指定元素
@@ -226,6 +308,161 @@ class BrowserEngine:
             print(f"[错误] 滚动失败 {selector}: {e}")
             return False
 
+    @recorded
+    def upload_file(self, selector: str, path: str, by: By = By.CSS_SELECTOR) -> bool:
+        """
+        通过文件输入框上传文件，隐藏的 input[type=file] 会先临时显示出来
+
+        Args:
+            selector: 文件输入框的选择器
+            path: 本地文件路径
+            by: 查找方式，默认CSS选择器
+
+        Returns:
+            bool: 是否成功提交文件
+        """
+        try:
+            element = self.wait_for_element(selector, by)
+            if not element:
+                return False
+            # 很多网站把文件输入框隐藏在自定义按钮后面，隐藏的元素无法接收 send_keys
+            self.driver.execute_script("""
+                var input = arguments[0];
+                input.removeAttribute('hidden');
+                input.style.display = 'block';
+                input.style.visibility = 'visible';
+                input.style.opacity = 1;
+                input.style.width = '1px';
+                input.style.height = '1px';
+            """, element)
+            element.send_keys(os.path.abspath(path))
+            print(f"[上传] {selector} = {os.path.basename(path)}")
+            return True
+        except Exception as e:
+            print(f"[错误] 上传失败 {selector}: {e}")
+            return False
+
+    def install_field_observer(self, selectors: dict) -> bool:
+        """
+        在页面中注入字段观察器：MutationObserver 在 DOM 变化时检查各字段选择器，
+        新出现（懒加载、展开后渲染）的字段进入待处理列表，由 poll_field_observer 取回
+
+        Args:
+            selectors: {字段名: CSS选择器}
+
+        Returns:
+            bool: 是否注入成功
+        """
+        try:
+            self.driver.execute_script("""
+                var selectors = arguments[0];
+                if (window.__fieldObserver) { window.__fieldObserver.disconnect(); }
+                var state = {pending: [], seen: {}};
+                state.scan = function () {
+                    Object.keys(selectors).forEach(function (name) {
+                        if (state.seen[name]) { return; }
+                        var element = null;
+                        try { element = document.querySelector(selectors[name]); } catch (e) { return; }
+                        if (element) {
+                            state.seen[name] = true;
+                            state.pending.push({name: name, element: element});
+                        }
+                    });
+                };
+                var observer = new MutationObserver(state.scan);
+                observer.observe(document.documentElement, {childList: true, subtree: true});
+                state.disconnect = function () { observer.disconnect(); };
+                window.__fieldObserver = state;
+                state.scan();
+            """, selectors)
+            return True
+        except Exception as e:
+            print(f"[错误] 注入字段观察器失败: {e}")
+            return False
+
+    def poll_field_observer(self):
+        """
+        取回观察器发现的新字段，按在文档中的先后顺序排列
+
+        Returns:
+            list 或 None: 字段名列表；页面已跳转或重新加载（观察器丢失）时返回 None
+        """
+        try:
+            return self.driver.execute_script("""
+                var state = window.__fieldObserver;
+                if (!state) { return null; }
+                state.scan();
+                var items = state.pending.splice(0);
+                items.sort(function (a, b) {
+                    return a.element.compareDocumentPosition(b.element) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1;
+                });
+                return items.map(function (item) { return item.name; });
+            """)
+        except Exception:
+            return None
+
+    def remove_field_observer(self):
+        """停止页面中的字段观察器"""
+        try:
+            self.driver.execute_script(
+                "if (window.__fieldObserver) { window.__fieldObserver.disconnect(); delete window.__fieldObserver; }")
+        except Exception:
+            pass
+
+    def scroll_page_step(self, fraction: float = 0.8) -> bool:
+        """
+        向下滚动一段（不等待），触发懒加载的区块渲染
+
+        Args:
+            fraction: 每次滚动的距离占窗口高度的比例
+
+        Returns:
+            bool: 是否已滚动到页面底部
+        """
+        try:
+            return self.driver.execute_script("""
+                window.scrollBy(0, Math.round(window.innerHeight * arguments[0]));
+                var root = document.scrollingElement || document.documentElement;
+                return window.innerHeight + window.scrollY >= root.scrollHeight - 2;
+            """, fraction)
+        except Exception as e:
+            print(f"[错误] 滚动页面失败: {e}")
+            return True
+
+    @recorded
+    def click_if_present(self, selector: str) -> bool:
+        """
+        元素存在时立即点击（不等待），用于展开折叠的区块
+
+        Args:
+            selector: CSS选择器，可包含多个以逗号分隔的备选写法
+
+        Returns:
+            bool: 是否点击了元素
+        """
+        try:
+            if self.rate_limiter:
+                # 先确认元素存在再获取令牌，轮询时找不到元素不消耗访问限额
+                if not self.driver.execute_script("""
+                    try { return document.querySelector(arguments[0]) !== null; } catch (e) { return false; }
+                """, selector):
+                    return False
+                self._pace()
+            clicked = self.driver.execute_script("""
+                var element = null;
+                try { element = document.querySelector(arguments[0]); } catch (e) { return false; }
+                if (!element) { return false; }
+                element.scrollIntoView({block: 'center'});
+                element.click();
+                return true;
+            """, selector)
+            if clicked:
+                print(f"[点击] {selector}")
+            return bool(clicked)
+        except Exception as e:
+            print(f"[错误] 点击失败 {selector}: {e}")
+            return False
+
     def take_screenshot(self, filename: str = None) -> str:
         """
         截图
@@ -237,7 +474,8 @@ class BrowserEngine:
             str: 截图文件路径
         """
         if not filename:
-            filename = f"screenshot_{int(time.time())}.png"
+            stamp = time.strftime('%Y%m%d_%H%M%S')
+            filename = f"screenshot_{stamp}_{os.getpid()}_{next(_screenshot_counter)}.png"
 
         try:
             self.driver.save_screenshot(filename)
@@ -247,6 +485,91 @@ class BrowserEngine:
             print(f"[错误] 截图失败: {e}")
             return None
 
+    def enable_capture(self, output_dir: str = "captures", image_format: str = "webp",
+                       quality: int = 80):
+        """
+        启用后台取证截图
+
+        Args:
+            output_dir: 截图保存目录
+            image_format: 图片格式，png/webp/jpeg
+            quality: 有损压缩质量 (1-100)
+        """
+        if self.capture_writer:
+            self.capture_writer.close()
+        self.capture_writer = evidence_capture.CaptureWriter(output_dir, image_format, quality)
+
+    def capture_evidence(self, label: str, selector: str = None, include_dom: bool = False,
+                         by: By = By.CSS_SELECTOR) -> bool:
+        """
+        抓取截图并交给后台写入，不等待磁盘写入和图片压缩
+
+        Args:
+            label: 截图标签
+            selector: 指定时只截取该元素，否则截取整个可视区域
+            include_dom: 是否同时保存DOM快照
+            by: 查找方式，默认CSS选择器
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self.capture_writer:
+            self.enable_capture()
+
+        try:
+            if selector:
+                element = self.find_element_safe(selector, by)
+                if not element:
+                    return False
+                png_bytes = element.screenshot_as_png
+            else:
+                png_bytes = self.driver.get_screenshot_as_png()
+
+            dom_html = self.driver.page_source if include_dom else None
+            self.capture_writer.submit(label, png_bytes, dom_html, self.get_current_url())
+            return True
+        except Exception as e:
+            print(f"[错误] 截图失败: {e}")
+            return False
+
+    def start_recording(self, output_dir: str = "recordings") -> str:
+        """
+        开始录制会话：记录每条命令的耗时，并在导航后保存DOM快照
+
+        Args:
+            output_dir: 录制文件的根目录
+
+        Returns:
+            str: 本次录制的目录
+        """
+        self.stop_recording()
+        self.recorder = session_recorder.SessionRecorder(output_dir)
+        return self.recorder.session_dir
+
+    def record_snapshot(self, label: str):
+        """
+        在关键时刻保存DOM快照，未开启录制时不做任何事
+
+        Args:
+            label: 快照标签
+
+        Returns:
+            str 或 None: 快照文件名
+        """
+        if not self.recorder:
+            return None
+        try:
+            return self.recorder.record_snapshot(label, self.get_current_url(), self.driver.page_source)
+        except Exception as e:
+            print(f"[错误] 保存DOM快照失败: {e}")
+            return None
+
+    def stop_recording(self):
+        """结束录制"""
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
     def wait_seconds(self, seconds: int):
         """
         等待指定秒数
@@ -271,8 +594,276 @@ class BrowserEngine:
         except:
             return ""
 
+    def export_session(self) -> dict:
+        """
+        导出当前站点的登录状态
+
+        Returns:
+            dict: {url, cookies, local_storage, session_storage, saved_at}
+        """
+        return {
+            'url': self.get_current_url(),
+            'cookies': self.driver.get_cookies(),
+            'local_storage': self.driver.execute_script(
+                "return Object.assign({}, window.localStorage);") or {},
+            'session_storage': self.driver.execute_script(
+                "return Object.assign({}, window.sessionStorage);") or {},
+            'saved_at': time.time(),
+        }
+
+    def import_session(self, session: dict, origin_url: str) -> bool:
+        """
+        恢复登录状态（Cookie 只能在同域名页面上设置，因此先打开站点首页）
+
+        Args:
+            session: export_session 导出的数据
+            origin_url: 站点首页URL
+
+        Returns:
+            bool: 是否成功
+        """
+        try:
+            if not self.navigate_to(origin_url):
+                return False
+            for cookie in session_cache.drop_expired_cookies(session.get('cookies', [])):
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception as e:
+                    print(f"[警告] 恢复 Cookie 失败 {cookie.get('name')}: {e}")
+            self.driver.execute_script("""
+                var data = arguments[0];
+                Object.keys(data.local_storage || {}).forEach(function (k) {
+                    window.localStorage.setItem(k, data.local_storage[k]);
+                });
+                Object.keys(data.session_storage || {}).forEach(function (k) {
+                    window.sessionStorage.setItem(k, data.session_storage[k]);
+                });
+            """, session)
+            self.driver.refresh()
+            print("[会话] 已恢复登录状态")
+            return True
+        except Exception as e:
+            print(f"[错误] 恢复登录状态失败: {e}")
+            return False
+
+    def wait_for_page(self, url_pattern: str = None, signature_selectors: list = None,
+                      min_matches: int = 1, timeout: float = 600, poll_interval: float = 0.3) -> bool:
+        """
+        等待目标页面就绪：URL 匹配且页面上出现足够多的特征元素
+
+        每次轮询只读取一次 URL，URL 匹配后用一次脚本调用检查全部特征选择器，
+        因此可以用很短的轮询间隔，页面一就绪就返回
+
+        Args:
+            url_pattern: URL 正则表达式，None 表示不检查 URL
+            signature_selectors: 特征元素的 CSS 选择器列表
+            min_matches: 至少需要出现的特征元素个数
+            timeout: 最长等待时间（秒）
+            poll_interval: 轮询间隔（秒）
+
+        Returns:
+            bool: 页面是否在超时前就绪
+        """
+        pattern = re.compile(url_pattern) if url_pattern else None
+        selectors = signature_selectors or []
+        min_matches = min(min_matches, len(selectors))
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            try:
+                if pattern is None or pattern.search(self.driver.current_url):
+                    if not selectors:
+                        return True
+                    found = self.driver.execute_script("""
+                        return arguments[0].filter(function (s) {
+                            try { return document.querySelector(s) !== null; } catch (e) { return false; }
+                        }).length;
+                    """, selectors)
+                    if found >= min_matches:
+                        print(f"[就绪] 页面已就绪: {self.driver.current_url}")
+                        return True
+            except Exception:
+                # 页面跳转过程中脚本可能执行失败，下次轮询再试
+                pass
+            time.sleep(poll_interval)
+
+        print(f"[超时] 等待页面就绪超时 ({timeout} 秒)")
+        return False
+
+    def get_texts(self, selector: str) -> list:
+        """
+        一次脚本调用读取所有匹配元素的文本
+
+        Args:
+            selector: CSS 选择器
+
+        Returns:
+            list: 去掉首尾空白的文本，页面跳转或选择器无效时返回空列表
+        """
+        try:
+            return self.driver.execute_script("""
+                return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function (el) {
+                    return (el.textContent || '').trim();
+                });
+            """, selector) or []
+        except Exception:
+            return []
+
+    def wait_for_text(self, selector: str, text: str = None, changed_from: list = None,
+                      timeout: float = 10, poll_interval: float = 0.3) -> bool:
+        """
+        等待元素文本包含指定内容，或与之前读取的文本不同
+
+        Args:
+            selector: CSS 选择器
+            text: 任一匹配元素的文本包含该内容即返回
+            changed_from: 之前 get_texts 的结果，匹配元素的文本与之不同（且不为空）即返回
+            timeout: 最长等待时间（秒）
+            poll_interval: 轮询间隔（秒）
+
+        Returns:
+            bool: 是否在超时前满足条件
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            texts = self.get_texts(selector)
+            if text and any(text in item for item in texts):
+                return True
+            if changed_from is not None and texts and texts != changed_from:
+                return True
+            time.sleep(poll_interval)
+        return False
+
+    def probe_element(self, selector: str, timeout: float = 5, by: By = By.CSS_SELECTOR) -> bool:
+        """
+        快速探测元素是否存在（不输出超时警告），用于检查登录状态等
+
+        Args:
+            selector: 选择器
+            timeout: 最长等待时间（秒）
+            by: 查找方式
+
+        Returns:
+            bool: 是否存在
+        """
+        try:
+            WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((by, selector)))
+            return True
+        except TimeoutException:
+            return False
+
+    def chrome_rss_mb(self):
+        """
+        统计 chromedriver 及其启动的所有 Chrome 进程的内存占用
+
+        Returns:
+            float 或 None: 常驻内存（MB），无法统计时返回 None
+        """
+        if psutil is None or not self.driver:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            total = 0
+            for process in [root] + root.children(recursive=True):
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / (1024 * 1024)
+        except Exception:
+            return None
+
+    def recycle_if_needed(self, restore_url: bool = True) -> bool:
+        """
+        页面数或内存超过阈值时重启浏览器
+
+        Args:
+            restore_url: 重启后是否重新打开当前页面
+
+        Returns:
+            bool: 是否进行了重启
+        """
+        if self._recycling or not self.driver:
+            return False
+
+        reason = None
+        if self.max_pages and self.pages_served >= self.max_pages:
+            reason = f"已访问 {self.pages_served} 个页面"
+        elif self.max_rss_mb:
+            rss = self.chrome_rss_mb()
+            if rss is not None and rss >= self.max_rss_mb:
+                reason = f"内存占用 {rss:.0f} MB"
+
+        if reason:
+            print(f"[回收] {reason}，重启浏览器以释放资源")
+            return self.recycle(restore_url)
+        return False
+
+    def recycle(self, restore_url: bool = True) -> bool:
+        """
+        重启浏览器并恢复登录状态和当前页面
+
+        Args:
+            restore_url: 是否重新打开重启前的页面
+
+        Returns:
+            bool: 是否成功
+        """
+        self._recycling = True
+        try:
+            url = self.get_current_url()
+            session = None
+            try:
+                session = self.export_session()
+            except Exception as e:
+                print(f"[警告] 导出登录状态失败，重启后可能需要重新登录: {e}")
+
+            if not self.restart_browser():
+                return False
+            self.pages_served = 0
+            self.recycle_count += 1
+
+            parsed = urlparse(url)
+            if session and parsed.scheme.startswith('http'):
+                self.import_session(session, f"{parsed.scheme}://{parsed.netloc}/")
+            if restore_url and url.startswith('http'):
+                self.navigate_to(url)
+            return True
+        finally:
+            self._recycling = False
+
+    def is_alive(self) -> bool:
+        """检查浏览器会话是否仍然可用"""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def restart_browser(self) -> bool:
+        """
+        重启浏览器（沿用上次的用户数据目录）
+
+        Returns:
+            bool: 是否成功
+        """
+        print("[浏览器] 正在重启...")
+        try:
+            if self.driver:
+                self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+        return self.start_browser(self.user_data_dir)
+
     def close_browser(self):
         """关闭浏览器"""
+        self.stop_recording()
+        if self.capture_writer:
+            self.capture_writer.close()
+            self.capture_writer = None
         if self.driver:
             self.driver.quit()
             print("[浏览器] 已关闭")
@@ -287,18 +878,22 @@ class BrowserEngine:
 
 
 # 便捷函数
-def create_browser(headless: bool = False, timeout: int = 10) -> BrowserEngine:
+def create_browser(headless: bool = False, timeout: int = 10,
+                   max_pages: int = None, max_rss_mb: int = None) -> BrowserEngine:
     """
     创建浏览器引擎实例
 
     Args:
         headless: 是否无头模式
         timeout: 默认超时时间
+        max_pages: 访问页面数达到该值后自动重启浏览器
+        max_rss_mb: 浏览器内存超过该值（MB）后自动重启浏览器
 
     Returns:
         BrowserEngine: 浏览器引擎实例
     """
-    return BrowserEngine(headless=headless, timeout=timeout)
+    return BrowserEngine(headless=headless, timeout=timeout,
+                         max_pages=max_pages, max_rss_mb=max_rss_mb)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令行入口（非交互）
+供脚本、定时任务和批处理调用，所有子命令都有明确的退出码，并支持 JSON 输出
+
+用法示例:
+    python cli.py fill --profile 张三 --no-prompt --json
+    python cli.py batch --add urls.txt --no-prompt
+    python cli.py config get PersonalInfo.name
+    python cli.py config set PersonalInfo.phone 13800138000 --profile 张三
+    python cli.py config import candidates.json
+    python cli.py config import-resume resumes/
+    python cli.py bench saved_pages/
+    python cli.py serve --workers 4
+    python cli.py rate stats --json
+    python cli.py mock load --concurrency 4 --jobs 20 --late 0.3 --absent 0.1
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+import config_manager
+
+
+# 退出码
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2            # 与 argparse 参数错误一致
+EXIT_MISSING_CONFIG = 3
+EXIT_NOT_FOUND = 4
+
+
+# 真正的标准输出；--json 模式下过程日志会被重定向到标准错误，保证标准输出只有 JSON
+_stdout = sys.stdout
+
+
+def _emit(args, payload: dict, text: str = None):
+    """按输出格式打印结果：--json 时输出单行 JSON，否则输出可读文本"""
+    if getattr(args, 'json', False):
+        print(json.dumps(payload, ensure_ascii=False), file=_stdout)
+    elif text is not None:
+        print(text, file=_stdout)
+
+
+def _parse_key(dotted: str) -> tuple:
+    """解析 节名.键名"""
+    if '.' not in dotted:
+        raise ValueError(f"格式错误，请使用 节名.键名: {dotted}")
+    section, key = dotted.split('.', 1)
+    return section, key
+
+
+def _rate_priority(args) -> int:
+    """--rate-priority 对应的限速优先级通道"""
+    import rate_limiter
+    return rate_limiter.PRIORITY_NAMES[args.rate_priority]
+
+
+def cmd_fill(args) -> int:
+    """填充单个页面"""
+    import zhipin_filler
+
+    filler = zhipin_filler.ZhipinFiller(
+        profile=args.profile, record_dir=args.record, interactive=not args.no_prompt,
+        headless=args.headless, incremental=args.incremental, attachment=args.attachment,
+        capture_dir=args.capture, rate_db=args.rate_db, rate_priority=_rate_priority(args))
+
+    missing = filler.missing_required_keys()
+    if args.no_prompt and missing:
+        _emit(args, {'ok': False, 'error': 'missing_config', 'missing_keys': missing},
+              f"缺少必填配置: {', '.join(missing)}")
+        return EXIT_MISSING_CONFIG
+
+    started = time.perf_counter()
+    ok = filler.start_filling_process(args.url)
+    payload = {
+        'ok': ok,
+        'profile': args.profile,
+        'url': args.url,
+        'elapsed': round(time.perf_counter() - started, 3),
+        'error': filler.last_error,
+        **filler.fill_stats,
+    }
+    _emit(args, payload, "填充完成" if ok else f"填充失败: {filler.last_error}")
+    return EXIT_OK if ok else EXIT_FAILURE
+
+
+def cmd_batch(args) -> int:
+    """处理任务队列"""
+    import job_queue
+    import zhipin_filler
+
+    queue = job_queue.JobQueue(args.db)
+    try:
+        if args.add:
+            with open(args.add, 'r', encoding='utf-8') as f:
+                print(f"[队列] 已添加 {queue.add_many(f.readlines())} 个任务")
+        if args.retry_failed:
+            print(f"[队列] 已重新加入 {queue.retry_failed()} 个失败任务")
+        if args.recover:
+            queue.recover(force=True)
+
+        filler = zhipin_filler.ZhipinFiller(
+            profile=args.profile, record_dir=args.record, interactive=not args.no_prompt,
+            headless=args.headless, max_pages=args.recycle_pages or None,
+            max_rss_mb=args.recycle_rss_mb or None, incremental=args.incremental,
+            attachment=args.attachment, capture_dir=args.capture,
+            rate_db=args.rate_db, rate_priority=_rate_priority(args))
+        missing = filler.missing_required_keys()
+        if args.no_prompt and missing:
+            _emit(args, {'ok': False, 'error': 'missing_config', 'missing_keys': missing},
+                  f"缺少必填配置: {', '.join(missing)}")
+            return EXIT_MISSING_CONFIG
+
+        stats = filler.run_queue(queue, args.max_jobs)
+    finally:
+        queue.close()
+
+    # 浏览器启动失败、无法登录等情况下没有处理任何任务，也要报告失败
+    ok = not filler.last_error and stats[job_queue.FAILED] == 0
+    _emit(args, {'ok': ok, 'error': filler.last_error or None, **stats},
+          f"批量填充失败: {filler.last_error}" if filler.last_error else None)
+    return EXIT_OK if ok else EXIT_FAILURE
+
+
+def cmd_config_get(args) -> int:
+    """读取配置项"""
+    section, key = _parse_key(args.key)
+    value = config_manager.get_manager(args.profile).get_config_value(section, key)
+    if not value:
+        _emit(args, {'ok': False, 'key': args.key, 'error': 'not_found'}, f"未设置: {args.key}")
+        return EXIT_NOT_FOUND
+    _emit(args, {'ok': True, 'key': args.key, 'value': value}, value)
+    return EXIT_OK
+
+
+def cmd_config_set(args) -> int:
+    """写入配置项"""
+    section, key = _parse_key(args.key)
+    config_manager.get_manager(args.profile, create=args.create).set_config_value(section, key, args.value)
+    _emit(args, {'ok': True, 'key': args.key, 'value': args.value}, None)
+    return EXIT_OK
+
+
+def cmd_config_import(args) -> int:
+    """导入配置：.json/.csv 导入档案库，.ini 导入为 --profile 指定的档案"""
+    store = config_manager.get_profile_store()
+    path = args.file
+    lower = path.lower()
+    if lower.endswith('.json'):
+        count = store.import_json(path)
+    elif lower.endswith('.csv'):
+        count = store.import_csv(path)
+    elif lower.endswith('.ini'):
+        if not args.profile:
+            _emit(args, {'ok': False, 'error': 'profile_required'}, "导入 ini 文件需要指定 --profile")
+            return EXIT_USAGE
+        store.import_ini(args.profile, path)
+        count = 1
+    else:
+        _emit(args, {'ok': False, 'error': 'unsupported_format'}, f"不支持的文件格式: {path}")
+        return EXIT_USAGE
+
+    _emit(args, {'ok': True, 'file': path, 'imported': count}, f"已导入: {count}")
+    return EXIT_OK
+
+
+def cmd_config_import_resume(args) -> int:
+    """从简历文件导入：指定 --profile 时写入该档案，否则每份简历创建一个以姓名命名的档案"""
+    import resume_importer
+
+    if args.profile:
+        if len(args.files) != 1:
+            _emit(args, {'ok': False, 'error': 'single_file_required'}, "指定 --profile 时只能导入一份简历")
+            return EXIT_USAGE
+        # 导入到新档案时直接创建
+        data = resume_importer.import_resume(
+            args.files[0], config_manager.get_manager(args.profile, create=True), args.overwrite)
+        results = [{'file': args.files[0], 'profile': args.profile,
+                    'imported': sum(len(items) for items in data.values()), 'error': None}]
+    else:
+        results = resume_importer.import_resumes(args.files, overwrite=args.overwrite)
+
+    ok = bool(results) and not any(item['error'] for item in results)
+    lines = []
+    for item in results:
+        status = item['error'] or f"档案 {item['profile']} 导入 {item['imported']} 项"
+        lines.append(f"{item['file']}: {status}")
+    text = "\n".join(lines)
+    _emit(args, {'ok': ok, 'results': results}, text or "没有找到简历文件")
+    return EXIT_OK if ok else EXIT_FAILURE
+
+
+def cmd_bench(args) -> int:
+    """基准测试：配置读取和离线填充规划的耗时"""
+    import field_catalog
+    import fill_planner
+
+    config = config_manager.get_manager(args.profile)
+    keys = [(field['config_section'], field['config_key']) for _, _, field in field_catalog.iter_fields()]
+
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        for section, key in keys:
+            config.get_config_value(section, key)
+    elapsed = time.perf_counter() - started
+    reads = args.iterations * len(keys)
+
+    payload = {
+        'ok': True,
+        'config_reads': reads,
+        'config_read_us': round(elapsed / reads * 1e6, 3),
+    }
+    if args.pages:
+        corpus = fill_planner.plan_corpus(args.pages, config)
+        pages = len(corpus['pages'])
+        payload.update({
+            'pages': pages,
+            'plan_total_ms': corpus['total_ms'],
+            'plan_avg_ms': round(corpus['total_ms'] / pages, 3) if pages else 0.0,
+            'field_hits': corpus['field_hits'],
+        })
+
+    text = f"配置读取: {reads} 次, 平均 {payload['config_read_us']} 微秒"
+    if args.pages:
+        text += f"\n填充规划: {payload['pages']} 个页面, 平均 {payload['plan_avg_ms']} ms"
+    _emit(args, payload, text)
+    return EXIT_OK
+
+
+def cmd_serve(args) -> int:
+    """启动本地填充任务服务"""
+    import job_service
+
+    job_service.serve(args.host, args.port, workers=args.workers, max_pending=args.max_pending,
+                      headless=not args.show_browser, incremental=args.incremental,
+                      rate_db=None if args.no_rate_limit else args.rate_db)
+    return EXIT_OK
+
+
+def cmd_rate_stats(args) -> int:
+    """显示限速数据库中各域名的排队深度和等待时间"""
+    import rate_limiter
+
+    limiter = rate_limiter.RateLimiter(args.rate_db)
+    try:
+        metrics = limiter.get_metrics()
+    finally:
+        limiter.close()
+
+    lines = [f"{domain}: 排队 {m['queue_depth']}  已放行 {m['acquired']}  "
+             f"平均等待 {m['avg_wait']}s  最长等待 {m['max_wait']}s"
+             for domain, m in metrics.items()]
+    _emit(args, {'ok': True, 'rate_db': args.rate_db, 'domains': metrics},
+          "\n".join(lines) or "还没有限速记录")
+    return EXIT_OK
+
+
+def cmd_mock_serve(args) -> int:
+    """启动模拟招聘网站"""
+    import mock_site
+
+    site = mock_site.MockSite(args.host, args.port, mock_site.options_from_args(args))
+    print(f"[模拟站点] 简历编辑页面: {site.resume_url}")
+    try:
+        site.serve_forever()
+    finally:
+        site.server_close()
+    return EXIT_OK
+
+
+def cmd_mock_load(args) -> int:
+    """对模拟站点（或 --url 指定的页面）运行并发填充压测"""
+    import mock_site
+
+    site = None
+    url = args.url
+    if not url:
+        site = mock_site.MockSite(options=mock_site.options_from_args(args))
+        url = site.start()
+    try:
+        report = mock_site.run_load(url, args.concurrency, args.jobs, args.profile, headless=not args.show_browser,
+                                    incremental=args.incremental, fetch_only=args.fetch_only)
+    finally:
+        if site:
+            site.stop()
+
+    if not args.json:
+        mock_site.print_load_report(report)
+    _emit(args, {'ok': report['failed'] == 0 and report['jobs'] > 0, **report}, None)
+    return EXIT_OK if report['failed'] == 0 and report['jobs'] > 0 else EXIT_FAILURE
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--profile', help="候选人档案名称，默认使用 config.ini")
+    common.add_argument('--json', action='store_true', help="以 JSON 输出结果，过程日志输出到标准错误")
+
+    browser = argparse.ArgumentParser(add_help=False)
+    browser.add_argument('--no-prompt', action='store_true',
+                         help="严格无提示模式：缺少配置或需要手动登录时立即失败，不等待输入")
+    browser.add_argument('--headless', action='store_true', help="无头模式运行浏览器")
+    browser.add_argument('--record', metavar='DIR', help="录制填充会话到指定目录")
+    browser.add_argument('--capture', metavar='DIR',
+                         help="每个批次完成后和失败时保存截图与DOM快照到指定目录（后台写入，用于审计）")
+    browser.add_argument('--incremental', action='store_true',
+                         help="增量填充：字段出现即填充，适合懒加载和折叠区块较多的页面")
+    browser.add_argument('--attachment', metavar='FILE',
+                         help="上传附件简历，网站上已有相同文件时跳过（默认使用配置 Others.resume_attachment）")
+    browser.add_argument('--rate-db', metavar='FILE',
+                         help="按域名限制访问频率，与使用同一数据库的其他批量进程和服务共享限额")
+    browser.add_argument('--rate-priority', choices=['high', 'normal', 'low'], default='normal',
+                         help="填充页面使用的限速优先级通道（登录和会话探测始终使用 high）")
+
+    parser = argparse.ArgumentParser(prog="cli.py", description="自动求职信息填充工具 - 命令行模式")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fill = subparsers.add_parser('fill', parents=[common, browser], help="填充简历页面")
+    fill.add_argument('--url', help="要填充的页面，默认为简历编辑页面")
+    fill.set_defaults(func=cmd_fill)
+
+    batch = subparsers.add_parser('batch', parents=[common, browser], help="处理批量任务队列")
+    batch.add_argument('--db', default="job_queue.db", help="任务队列数据库")
+    batch.add_argument('--add', metavar='FILE', help="先从文件添加URL（每行一个）")
+    batch.add_argument('--max-jobs', type=int, help="最多处理的任务数")
+    batch.add_argument('--retry-failed', action='store_true', help="重新加入失败的任务")
+    batch.add_argument('--recover', action='store_true',
+                       help="立即恢复所有进行中的任务（确认没有其他进程在处理队列时使用）")
+    batch.add_argument('--recycle-pages', type=int, default=100,
+                       help="浏览器访问页面数达到该值后自动重启，0 表示不限制")
+    batch.add_argument('--recycle-rss-mb', type=int, default=2048,
+                       help="浏览器内存超过该值（MB）后自动重启（需要 psutil），0 表示不限制")
+    batch.set_defaults(func=cmd_batch)
+
+    config = subparsers.add_parser('config', help="读写配置")
+    config_sub = config.add_subparsers(dest='config_command', required=True)
+    get = config_sub.add_parser('get', parents=[common], help="读取配置项")
+    get.add_argument('key', help="节名.键名")
+    get.set_defaults(func=cmd_config_get)
+    set_ = config_sub.add_parser('set', parents=[common], help="写入配置项")
+    set_.add_argument('key', help="节名.键名")
+    set_.add_argument('value', help="配置值")
+    set_.add_argument('--create', action='store_true', help="--profile 指定的档案不存在时新建空档案")
+    set_.set_defaults(func=cmd_config_set)
+    import_ = config_sub.add_parser('import', parents=[common], help="导入 JSON/CSV/ini 配置")
+    import_.add_argument('file', help="要导入的文件")
+    import_.set_defaults(func=cmd_config_import)
+    import_resume = config_sub.add_parser('import-resume', parents=[common],
+                                          help="从简历文件（PDF/DOCX/Markdown）导入档案")
+    import_resume.add_argument('files', nargs='+', help="简历文件或目录")
+    import_resume.add_argument('--overwrite', action='store_true', help="覆盖已有的配置值")
+    import_resume.set_defaults(func=cmd_config_import_resume)
+
+    bench = subparsers.add_parser('bench', parents=[common], help="配置读取和离线规划的基准测试")
+    bench.add_argument('pages', nargs='*', help="保存的页面文件或目录")
+    bench.add_argument('--iterations', type=int, default=1000, help="配置读取的轮数")
+    bench.set_defaults(func=cmd_bench)
+
+    serve = subparsers.add_parser('serve', help="启动本地 HTTP 填充任务服务")
+    serve.add_argument('--host', default='127.0.0.1', help="监听地址")
+    serve.add_argument('--port', type=int, default=8765, help="监听端口")
+    serve.add_argument('--workers', type=int, default=2, help="浏览器工作线程数")
+    serve.add_argument('--max-pending', type=int, default=100, help="排队任务上限，超过时拒绝提交")
+    serve.add_argument('--show-browser', action='store_true', help="显示浏览器窗口（默认无头模式）")
+    serve.add_argument('--incremental', action='store_true', help="使用增量填充")
+    serve.add_argument('--rate-db', default="rate_limits.db", help="访问限速数据库")
+    serve.add_argument('--no-rate-limit', action='store_true', help="不限制访问频率")
+    serve.set_defaults(func=cmd_serve)
+
+    rate = subparsers.add_parser('rate', help="访问限速")
+    rate_sub = rate.add_subparsers(dest='rate_command', required=True)
+    rate_stats = rate_sub.add_parser('stats', parents=[common], help="查看各域名的排队深度和等待时间")
+    rate_stats.add_argument('--rate-db', default="rate_limits.db", help="访问限速数据库")
+    rate_stats.set_defaults(func=cmd_rate_stats)
+
+    # 模拟站点的行为参数（mock serve 与 mock load 共用，mock_site.py 直接运行时也使用）
+    mock_options = argparse.ArgumentParser(add_help=False)
+    mock_options.add_argument('--latency', type=float, default=0.0, help="页面响应延迟（秒）")
+    mock_options.add_argument('--jitter', type=float, default=0.0, help="追加的随机延迟上限（秒）")
+    mock_options.add_argument('--late', type=float, default=0.0, help="字段延迟渲染的概率")
+    mock_options.add_argument('--late-delay', type=float, default=1.5, help="延迟渲染字段的最长出现时间（秒）")
+    mock_options.add_argument('--rerender', type=float, default=0.0, help="SPA 整体重渲染间隔（秒）")
+    mock_options.add_argument('--absent', type=float, default=0.0, help="字段缺失的概率")
+    mock_options.add_argument('--collapsed', action='store_true', help="有展开按钮的区块默认折叠")
+    mock_options.add_argument('--seed', type=int, help="随机种子")
+
+    mock = subparsers.add_parser('mock', help="模拟招聘网站与并发压测")
+    mock_sub = mock.add_subparsers(dest='mock_command', required=True)
+    mock_serve = mock_sub.add_parser('serve', parents=[mock_options], help="启动模拟招聘网站")
+    mock_serve.add_argument('--host', default='127.0.0.1', help="监听地址")
+    mock_serve.add_argument('--port', type=int, default=8900, help="监听端口")
+    mock_serve.set_defaults(func=cmd_mock_serve)
+    mock_load = mock_sub.add_parser('load', parents=[common, mock_options], help="并发运行多个填充器并统计耗时")
+    mock_load.add_argument('--url', help="压测的页面，默认在本地启动模拟站点")
+    mock_load.add_argument('--concurrency', type=int, default=4, help="并发填充器数量")
+    mock_load.add_argument('--jobs', type=int, default=20, help="任务总数")
+    mock_load.add_argument('--show-browser', action='store_true', help="显示浏览器窗口（默认无头模式）")
+    mock_load.add_argument('--incremental', action='store_true', help="使用增量填充")
+    mock_load.add_argument('--fetch-only', action='store_true', help="只请求页面不启动浏览器，测量服务端延迟")
+    mock_load.set_defaults(func=cmd_mock_load)
+
+    return parser
+
+
+def main(argv: list = None) -> int:
+    """
+    命令行主函数
+
+    Args:
+        argv: 命令行参数，默认使用 sys.argv
+
+    Returns:
+        int: 退出码
+    """
+    args = build_parser().parse_args(argv)
+    log_target = sys.stderr if getattr(args, 'json', False) else sys.stdout
+    try:
+        with contextlib.redirect_stdout(log_target):
+            return args.func(args)
+    except config_manager.MissingConfigError as e:
+        _emit(args, {'ok': False, 'error': 'missing_config', 'missing_keys': [f"{e.section}.{e.key}"]},
+              str(e))
+        return EXIT_MISSING_CONFIG
+    except config_manager.UnknownProfileError as e:
+        _emit(args, {'ok': False, 'error': 'unknown_profile', 'profile': e.profile}, f"❌ {e}")
+        return EXIT_NOT_FOUND
+    except (ValueError, OSError) as e:
+        _emit(args, {'ok': False, 'error': str(e)}, f"❌ {e}")
+        return EXIT_USAGE if isinstance(e, ValueError) else EXIT_FAILURE
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        _emit(args, {'ok': False, 'error': str(e)}, f"❌ 程序异常: {e}")
+        return EXIT_FAILURE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,38 +6,101 @@
 """
 
 import configparser
-import os
+import threading
 from typing import Optional
+import config_snapshot
+import profile_store
+
+
+class MissingConfigError(Exception):
+    """无提示模式下缺少必需的配置项"""
+
+    def __init__(self, section: str, key: str):
+        super().__init__(f"缺少配置项: {section}.{key}")
+        self.section = section
+        self.key = key
+
+
+class UnknownProfileError(Exception):
+    """指定的候选人档案不存在"""
+
+    def __init__(self, profile: str):
+        super().__init__(f"档案不存在: {profile}")
+        self.profile = profile
 
 
 class ConfigManager:
     """配置管理器 - 实现读写和按需补充功能"""
 
-    def __init__(self, config_file: str = "config.ini"):
+    def __init__(self, config_file: str = "config.ini", profile: str = None,
+                 store: profile_store.ProfileStore = None, reload_interval: float = 1.0,
+                 create: bool = False):
         """
         初始化配置管理器
 
         Args:
             config_file: 配置文件路径，默认为 config.ini
+            profile: 候选人档案名称，指定时从档案库读写而不是 config.ini
+            store: 档案库实例，默认使用 profiles.db
+            reload_interval: 检查配置是否被其他进程修改的最小间隔（秒）
+            create: 档案不存在时创建空档案，否则抛出 UnknownProfileError
+
+        Raises:
+            UnknownProfileError: 档案不存在且 create 为 False
         """
         self.config_file = config_file
-        self.config = configparser.ConfigParser()
-        self._load_config()
-
-    def _load_config(self):
-        """加载配置文件，如果不存在则创建默认配置"""
-        if os.path.exists(self.config_file):
-            self.config.read(self.config_file, encoding='utf-8')
-        else:
+        self.profile = profile
+        self.store = (store or profile_store.ProfileStore()) if profile else None
+        self.reload_interval = reload_interval
+        if profile and not create and not self.store.has_profile(profile):
+            raise UnknownProfileError(profile)
+
+        # 读取走共享快照（其他进程已解析过的配置直接 mmap 加载），configparser 只用于写入
+        self.shared = config_snapshot.SharedConfig(config_file, profile, self.store, reload_interval)
+        self._load_config(self.shared.snapshot)
+        self.shared.subscribe(self._on_change)
+        if self.shared.snapshot.signature is None:
             self._create_default_config()
 
+    def _load_config(self, snapshot: config_snapshot.ConfigSnapshot):
+        """
+        按快照重建内存中的 configparser
+
+        Args:
+            snapshot: 配置快照
+        """
+        # 值按原样保存，不对 % 做插值（简历、薪资等内容中经常出现 %）
+        self.config = configparser.ConfigParser(interpolation=None)
+        self.config.read_dict(snapshot.to_dict())
+
+    def _on_change(self, old: config_snapshot.ConfigSnapshot, new: config_snapshot.ConfigSnapshot):
+        """配置来源变化时的回调，内容与内存中一致（自己写入）时不重新加载"""
+        current = {section: dict(self.config.items(section)) for section in self.config.sections()}
+        if new.to_dict() == current:
+            return
+        self._load_config(new)
+        print(f"[重新加载] 配置已被修改: {self.describe()}")
+
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """
+        配置被其他进程或其他实例修改时重新加载
+
+        Args:
+            force: 忽略检查间隔，立即检查
+
+        Returns:
+            bool: 配置来源是否发生了变化
+        """
+        return self.shared.refresh() if force else self.shared.poll()
+
     def _create_default_config(self):
-        """创建默认的配置文件"""
-        # 基础个人信息
+        """创建默认的配置文件（新档案只包含空白的节）"""
+        # 基础个人信息（示例值只写入 config.ini）
         self.config.add_section('PersonalInfo')
-        self.config.set('PersonalInfo', 'name', '张三')
-        self.config.set('PersonalInfo', 'phone', '13800138000')
-        self.config.set('PersonalInfo', 'email', 'zhangsan@example.com')
+        if not self.profile:
+            self.config.set('PersonalInfo', 'name', '张三')
+            self.config.set('PersonalInfo', 'phone', '13800138000')
+            self.config.set('PersonalInfo', 'email', 'zhangsan@example.com')
 
         # 工作相关信息（空白，等待用户填充）
         self.config.add_section('WorkInfo')
@@ -49,13 +112,24 @@ class ConfigManager:
         self.config.add_section('Others')
 
         self._save_config()
-        print(f"[初始化] 已创建默认配置文件: {self.config_file}")
+        print(f"[初始化] 已创建默认配置: {self.describe()}")
+
+    def describe(self) -> str:
+        """返回当前配置来源的描述"""
+        return f"档案 {self.profile}" if self.profile else self.config_file
 
     def _save_config(self):
         """保存配置到文件"""
+        if self.profile:
+            self.store.save_profile(self.profile, {
+                section: dict(self.config.items(section)) for section in self.config.sections()
+            })
+            self.shared.refresh()
+            return
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 self.config.write(f)
+            self.shared.refresh()
         except Exception as e:
             print(f"[错误] 保存配置文件失败: {e}")
 
@@ -68,16 +142,24 @@ class ConfigManager:
             key: 配置键名
             value: 配置值
         """
+        # 先合并其他进程的修改，避免被内存中的旧配置覆盖
+        self.reload_if_changed(force=True)
+
         # 确保节存在
         if not self.config.has_section(section):
             self.config.add_section(section)
 
         # 设置值并保存
         self.config.set(section, key, value)
-        self._save_config()
+        if self.profile:
+            # 档案模式只写入变化的一项
+            self.store.set_value(self.profile, section, self.config.optionxform(key), value)
+            self.shared.refresh()
+        else:
+            self._save_config()
         print(f"[保存] {section}.{key} = {value}")
 
-    def get_or_ask(self, section: str, key: str, prompt_text: str) -> str:
+    def get_or_ask(self, section: str, key: str, prompt_text: str, interactive: bool = True) -> str:
         """
         核心函数：获取配置值，如果不存在则询问用户并保存
 
@@ -85,33 +167,32 @@ class ConfigManager:
             section: 配置节名
             key: 配置键名
             prompt_text: 当配置不存在时向用户显示的提示文本
+            interactive: 为 False 时不询问用户，配置不存在直接抛出 MissingConfigError
 
         Returns:
             str: 配置值（从文件读取或用户输入）
         """
-        try:
-            # 尝试从配置文件读取
-            value = self.config.get(section, key)
-            if value and value.strip():  # 检查值是否非空
-                print(f"[读取] {section}.{key} = {value}")
-                return value
-            else:
-                # 值为空，需要询问用户
-                raise configparser.NoOptionError(key, section)
-
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            # 配置不存在，询问用户
-            print(f"\n{prompt_text}")
+        # 尝试从配置快照读取
+        value = self.shared.snapshot.get(section, self.config.optionxform(key))
+        if value.strip():  # 检查值是否非空
+            print(f"[读取] {section}.{key} = {value}")
+            return value
+
+        # 配置不存在或值为空，需要询问用户
+        if not interactive:
+            raise MissingConfigError(section, key)
+
+        print(f"\n{prompt_text}")
+        user_input = input("请输入: ").strip()
+
+        # 如果用户输入为空，再次询问
+        while not user_input:
+            print("输入不能为空，请重新输入:")
             user_input = input("请输入: ").strip()
 
-            # 如果用户输入为空，再次询问
-            while not user_input:
-                print("输入不能为空，请重新输入:")
-                user_input = input("请输入: ").strip()
-
-            # 保存用户输入到配置文件
-            self._write_to_config(section, key, user_input)
-            return user_input
+        # 保存用户输入到配置文件
+        self._write_to_config(section, key, user_input)
+        return user_input
 
     def get_config_value(self, section: str, key: str, default: str = "") -> str:
         """
@@ -125,10 +206,7 @@ class ConfigManager:
         Returns:
             str: 配置值或默认值
         """
-        try:
-            return self.config.get(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return default
+        return self.shared.snapshot.get(section, self.config.optionxform(key), default)
 
     def set_config_value(self, section: str, key: str, value: str):
         """
@@ -141,8 +219,36 @@ class ConfigManager:
         """
         self._write_to_config(section, key, value)
 
+    def set_many(self, data: dict):
+        """
+        批量设置配置值，只保存一次（档案模式为单个事务）
+
+        Args:
+            data: {节名: {键名: 值}}
+        """
+        # 先合并其他进程的修改，避免被内存中的旧配置覆盖
+        self.reload_if_changed(force=True)
+
+        rows = {}
+        for section, items in data.items():
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            rows[section] = {}
+            for key, value in items.items():
+                value = str(value)
+                self.config.set(section, key, value)
+                rows[section][self.config.optionxform(key)] = value
+
+        if self.profile:
+            self.store.set_values(self.profile, rows)
+            self.shared.refresh()
+        else:
+            self._save_config()
+        print(f"[保存] 已批量写入 {sum(len(items) for items in rows.values())} 项: {self.describe()}")
+
     def show_all_config(self):
         """显示所有配置信息"""
+        self.reload_if_changed(force=True)
         print("\n=== 当前配置信息 ===")
         for section_name in self.config.sections():
             print(f"\n[{section_name}]")
@@ -154,9 +260,85 @@ class ConfigManager:
 # 创建全局配置管理器实例
 _config_manager = ConfigManager()
 
+# 已加载的档案，避免重复读取
+_profile_managers = {}
+_profile_managers_lock = threading.RLock()
+_profile_store = None
+
+
+def get_manager(profile: str = None, create: bool = False) -> ConfigManager:
+    """
+    获取配置管理器
+
+    Args:
+        profile: 档案名称，不指定时返回当前使用的配置管理器
+        create: 档案不存在时创建空档案
+
+    Returns:
+        ConfigManager: 配置管理器实例
+
+    Raises:
+        UnknownProfileError: 档案不存在且 create 为 False
+    """
+    if not profile:
+        return _config_manager
+    with _profile_managers_lock:
+        if profile not in _profile_managers:
+            _profile_managers[profile] = ConfigManager(profile=profile, store=get_profile_store(), create=create)
+        return _profile_managers[profile]
+
+
+def create_manager(profile: str = None) -> ConfigManager:
+    """
+    创建独立的配置管理器（不缓存），供每个工作线程各自使用
+
+    Args:
+        profile: 档案名称，不指定时使用 config.ini
+
+    Returns:
+        ConfigManager: 新的配置管理器实例
+
+    Raises:
+        UnknownProfileError: 档案不存在
+    """
+    if not profile:
+        return ConfigManager()
+    return ConfigManager(profile=profile, store=get_profile_store())
+
+
+def use_profile(profile: str = None, create: bool = False):
+    """
+    切换便捷函数使用的档案
+
+    Args:
+        profile: 档案名称，None 表示切回 config.ini
+        create: 档案不存在时创建空档案
+    """
+    global _config_manager
+    _config_manager = get_manager(profile, create) if profile else ConfigManager()
+
+
+def current_profile() -> Optional[str]:
+    """返回当前使用的档案名称，使用 config.ini 时返回 None"""
+    return _config_manager.profile
+
+
+def get_profile_store() -> profile_store.ProfileStore:
+    """返回共享的档案库实例"""
+    global _profile_store
+    with _profile_managers_lock:
+        if _profile_store is None:
+            _profile_store = profile_store.ProfileStore()
+        return _profile_store
+
+
+def forget_profile(profile: str):
+    """丢弃已加载的档案缓存（档案被删除或重新导入后调用）"""
+    _profile_managers.pop(profile, None)
+
 
 # 提供便捷的函数接口
-def get_or_ask(section: str, key: str, prompt_text: str) -> str:
+def get_or_ask(section: str, key: str, prompt_text: str, interactive: bool = True) -> str:
     """
     便捷函数：获取配置值，如果不存在则询问用户并保存
 
@@ -164,11 +346,12 @@ def get_or_ask(section: str, key: str, prompt_text: str) -> str:
         section: 配置节名
         key: 配置键名
         prompt_text: 提示文本
+        interactive: 为 False 时不询问用户，配置不存在直接抛出 MissingConfigError
 
     Returns:
         str: 配置值
     """
-    return _config_manager.get_or_ask(section, key, prompt_text)
+    return _config_manager.get_or_ask(section, key, prompt_text, interactive)
 
 
 def get_config(section: str, key: str, default: str = "") -> str:
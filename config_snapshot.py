@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享配置快照
+把配置序列化为只读快照文件，供多个工作进程直接加载而无需重新解析 config.ini，
+并在配置被其他进程修改后自动刷新、通知订阅者
+"""
+
+import configparser
+import hashlib
+import marshal
+import mmap
+import os
+import re
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Optional
+
+import profile_store
+
+
+class ConfigSnapshot:
+    """不可变的配置快照"""
+
+    def __init__(self, data: dict, signature: tuple):
+        """
+        初始化快照
+
+        Args:
+            data: {节名: {键名: 值}}
+            signature: 配置来源的版本标识，来源不变则快照不变
+        """
+        self.signature = signature
+        self._data = MappingProxyType({
+            section: MappingProxyType(dict(items)) for section, items in data.items()
+        })
+
+    def get(self, section: str, key: str, default: str = "") -> str:
+        """获取配置值，不存在时返回默认值"""
+        items = self._data.get(section)
+        if items is None:
+            return default
+        return items.get(key, default)
+
+    def sections(self) -> list:
+        """返回所有节名"""
+        return list(self._data)
+
+    def items(self, section: str):
+        """返回某个节下的全部配置（只读）"""
+        return self._data.get(section, MappingProxyType({}))
+
+    def to_dict(self) -> dict:
+        """转换为普通字典"""
+        return {section: dict(items) for section, items in self._data.items()}
+
+
+def source_signature(config_file: str = "config.ini", profile: str = None,
+                     store: profile_store.ProfileStore = None) -> Optional[tuple]:
+    """
+    获取配置来源的版本标识（只做一次 stat 或一次主键查询）
+
+    Args:
+        config_file: ini 配置文件路径
+        profile: 档案名称，指定时以档案库中的更新时间为准
+        store: 档案库实例
+
+    Returns:
+        tuple 或 None: 来源不存在时返回 None
+    """
+    if profile:
+        version = store.profile_version(profile)
+        return None if version is None else ('profile', profile, version)
+    try:
+        stat = os.stat(config_file)
+    except FileNotFoundError:
+        return None
+    return ('ini', stat.st_mtime_ns, stat.st_size)
+
+
+class SharedConfig:
+    """
+    跨进程共享的配置读取器
+
+    第一个发现配置变化的进程负责解析并写出快照文件，其余进程通过 mmap 直接加载快照
+    """
+
+    def __init__(self, config_file: str = "config.ini", profile: str = None,
+                 store: profile_store.ProfileStore = None, poll_interval: float = 1.0):
+        """
+        初始化共享配置
+
+        Args:
+            config_file: ini 配置文件路径
+            profile: 档案名称，指定时从档案库读取
+            store: 档案库实例，默认使用 profiles.db
+            poll_interval: 两次检查配置变化的最小间隔（秒）
+        """
+        self.config_file = config_file
+        self.profile = profile
+        self.store = (store or profile_store.ProfileStore()) if profile else None
+        self.poll_interval = poll_interval
+        if profile:
+            # 档案名称可能包含路径分隔符等字符，只保留安全字符并附加哈希区分
+            safe_name = re.sub(r'[^\w.-]', '_', profile)
+            digest = hashlib.sha1(profile.encode('utf-8')).hexdigest()[:8]
+            self.snapshot_file = f"{self.store.db_file}.{safe_name}-{digest}.snapshot"
+        else:
+            self.snapshot_file = f"{config_file}.snapshot"
+
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._checked_at = time.monotonic()
+        self._snapshot = self._load(source_signature(config_file, profile, self.store))
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """当前快照，距上次检查超过 poll_interval 时先检查配置是否变化"""
+        self.poll()
+        return self._snapshot
+
+    def poll(self) -> bool:
+        """
+        距上次检查超过 poll_interval 时检查配置是否变化
+
+        Returns:
+            bool: 配置是否发生了变化
+        """
+        if time.monotonic() - self._checked_at < self.poll_interval:
+            return False
+        return self.refresh()
+
+    def get(self, section: str, key: str, default: str = "") -> str:
+        """便捷读取，等价于 snapshot.get()"""
+        return self.snapshot.get(section, key, default)
+
+    def refresh(self) -> bool:
+        """
+        立即检查配置是否变化，变化时重新加载并通知订阅者
+
+        Returns:
+            bool: 配置是否发生了变化
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            signature = source_signature(self.config_file, self.profile, self.store)
+            if signature == self._snapshot.signature:
+                return False
+            old, self._snapshot = self._snapshot, self._load(signature)
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(old, self._snapshot)
+            except Exception as e:
+                print(f"[错误] 配置变更回调失败: {e}")
+        return True
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot, ConfigSnapshot], None]):
+        """
+        订阅配置变化
+
+        Args:
+            callback: 回调函数，参数为 (旧快照, 新快照)
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable):
+        """取消订阅"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _load(self, signature: Optional[tuple]) -> ConfigSnapshot:
+        """优先加载与来源版本一致的快照文件，否则解析来源并写出新快照"""
+        cached = self._read_snapshot_file()
+        if cached and cached[0] == signature:
+            return ConfigSnapshot(cached[1], signature)
+
+        data = self._parse_source()
+        # 解析期间来源可能再次变化，以解析后的版本为准写出快照
+        signature_after = source_signature(self.config_file, self.profile, self.store)
+        if signature_after == signature:
+            self._write_snapshot_file(signature, data)
+        return ConfigSnapshot(data, signature)
+
+    def _parse_source(self) -> dict:
+        """解析配置来源"""
+        config = configparser.ConfigParser(interpolation=None)
+        if self.profile:
+            # 与 ini 一样按 configparser 的规则统一键名（导入的档案可能包含大写键名）
+            config.read_dict(self.store.load_profile(self.profile))
+            return {section: dict(config.items(section)) for section in config.sections()}
+        config.read(self.config_file, encoding='utf-8')
+        return {section: dict(config.items(section)) for section in config.sections()}
+
+    def _read_snapshot_file(self) -> Optional[tuple]:
+        """通过 mmap 读取快照文件，返回 (版本标识, 数据)"""
+        try:
+            with open(self.snapshot_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    signature, data = marshal.loads(mm)
+            return tuple(signature) if signature else None, data
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+
+    def _write_snapshot_file(self, signature: Optional[tuple], data: dict):
+        """原子地写出快照文件，读取方不会看到写了一半的内容"""
+        tmp_file = f"{self.snapshot_file}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(marshal.dumps((signature, data)))
+            os.replace(tmp_file, self.snapshot_file)
+        except OSError as e:
+            print(f"[警告] 写入配置快照失败: {e}")
+
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+取证截图模块
+在后台线程中写入截图与DOM快照，避免阻塞自动化填充流程
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import queue
+import threading
+import time
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 为可选依赖，缺失时只能保存原始PNG
+    Image = None
+
+
+# 支持的压缩格式: 格式名 -> (文件扩展名, Pillow格式名)
+IMAGE_FORMATS = {
+    'png': ('png', None),
+    'webp': ('webp', 'WEBP'),
+    'jpeg': ('jpg', 'JPEG'),
+}
+
+
+class CaptureWriter:
+    """后台截图写入器 - 内容寻址存储，相同画面只保存一次"""
+
+    def __init__(self, output_dir: str = "captures", image_format: str = "webp",
+                 quality: int = 80, max_pending: int = 64):
+        """
+        初始化截图写入器
+
+        Args:
+            output_dir: 截图保存目录
+            image_format: 图片格式，png/webp/jpeg
+            quality: 有损压缩质量 (1-100)
+            max_pending: 待写入队列的最大长度，超出时丢弃最旧的截图
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"不支持的图片格式: {image_format}")
+        if image_format != 'png' and Image is None:
+            print(f"[警告] 未安装 Pillow，无法压缩为 {image_format}，将保存为 png")
+            image_format = 'png'
+
+        self.output_dir = output_dir
+        self.image_format = image_format
+        self.quality = quality
+        self.objects_dir = os.path.join(output_dir, "objects")
+        self.index_file = os.path.join(output_dir, "index.tsv")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._known = set(os.listdir(self.objects_dir))
+        self._encoded = {}  # 原始PNG哈希 -> 已保存的对象名，重复画面无需再次压缩
+        self._worker = threading.Thread(target=self._run, name="capture-writer", daemon=True)
+        self._worker.start()
+
+    def submit(self, label: str, png_bytes: bytes, dom_html: str = None, url: str = ""):
+        """
+        提交截图到写入队列（立即返回，不等待磁盘写入）
+
+        Args:
+            label: 截图标签，用于索引文件
+            png_bytes: 浏览器返回的PNG数据
+            dom_html: 可选的DOM快照，将以gzip压缩保存
+            url: 截图时的页面URL
+        """
+        item = (time.time(), label, png_bytes, dom_html, url)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # 磁盘跟不上时丢弃最旧的一张，保证填充流程不被阻塞
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+            print("[警告] 截图队列已满，丢弃最旧的截图")
+            self._queue.put(item)
+
+    def flush(self):
+        """等待队列中的截图全部写入磁盘"""
+        self._queue.join()
+
+    def close(self):
+        """写完剩余截图并停止后台线程"""
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        """后台线程主循环"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                print(f"[错误] 写入截图失败: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, taken_at: float, label: str, png_bytes: bytes, dom_html: str, url: str):
+        """压缩并以内容哈希命名保存截图，追加索引记录"""
+        raw_digest = hashlib.sha256(png_bytes).hexdigest()
+        image_name = self._encoded.get(raw_digest)
+        if image_name is None:
+            image_name = self._store(self._encode_image(png_bytes), IMAGE_FORMATS[self.image_format][0])
+            self._encoded[raw_digest] = image_name
+
+        dom_name = ""
+        if dom_html is not None:
+            dom_name = self._store(gzip.compress(dom_html.encode('utf-8')), "html.gz")
+
+        stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(taken_at))
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            f.write(f"{stamp}\t{label}\t{image_name}\t{dom_name}\t{url}\n")
+
+    def _encode_image(self, png_bytes: bytes) -> bytes:
+        """按配置的格式压缩图片"""
+        pil_format = IMAGE_FORMATS[self.image_format][1]
+        if pil_format is None:
+            return png_bytes
+
+        image = Image.open(io.BytesIO(png_bytes))
+        if pil_format == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, format=pil_format, quality=self.quality)
+        return buffer.getvalue()
+
+    def _store(self, data: bytes, extension: str) -> str:
+        """以 sha256 命名写入对象目录，已存在则跳过（去重）"""
+        name = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        if name not in self._known:
+            path = os.path.join(self.objects_dir, name)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._known.add(name)
+        return name
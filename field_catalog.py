@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BOSS直聘字段目录
+简历表单中各字段的选择器与配置项的对应关系，供填充脚本和离线规划共用
+"""
+
+import re
+
+
+# 字段目录中的每个备选选择器都限于这一子集，离线规划的后备解析器和模拟站点按它解析选择器:
+# tag[attr="v"] / tag[attr*="v"] / tag[attr^="v"] / tag[attr$="v"]
+SIMPLE_SELECTOR_RE = re.compile(
+    r'^\s*(?P<tag>[a-zA-Z][\w-]*|\*)?'
+    r'(?:\[(?P<attr>[\w-]+)(?:(?P<op>[*^$]?=)"(?P<value>[^"]*)")?\])?\s*$')
+
+# 字段批次: 批次名称 -> 标题、是否必填、字段列表
+# expand_selector（可选）: 折叠区块的展开/添加按钮，增量填充时仅在该批次有配置值时点击
+# 选择器为常见的字段写法（需要根据实际页面调整）
+FIELD_CATALOG = {
+    'personal': {
+        'title': '个人基础信息',
+        'required': True,
+        'fields': [
+            {
+                'selector': 'input[name="name"], input[placeholder*="姓名"], input[placeholder*="真实姓名"]',
+                'config_section': 'PersonalInfo',
+                'config_key': 'name',
+                'prompt': '[个人信息] 请输入您的真实姓名:',
+            },
+            {
+                'selector': 'input[name="mobile"], input[placeholder*="手机"], input[placeholder*="电话"]',
+                'config_section': 'PersonalInfo',
+                'config_key': 'phone',
+                'prompt': '[个人信息] 请输入您的手机号码:',
+            },
+            {
+                'selector': 'input[name="email"], input[placeholder*="邮箱"], input[type="email"]',
+                'config_section': 'PersonalInfo',
+                'config_key': 'email',
+                'prompt': '[个人信息] 请输入您的邮箱地址:',
+            },
+            {
+                'selector': 'input[name="age"], input[placeholder*="年龄"]',
+                'config_section': 'PersonalInfo',
+                'config_key': 'age',
+                'prompt': '[个人信息] 请输入您的年龄:',
+            },
+            {
+                'selector': 'input[name="address"], input[placeholder*="地址"], input[placeholder*="现居"]',
+                'config_section': 'PersonalInfo',
+                'config_key': 'address',
+                'prompt': '[个人信息] 请输入您的现居地址:',
+            },
+        ],
+    },
+    'work': {
+        'title': '工作相关信息',
+        'required': True,
+        'fields': [
+            {
+                'selector': 'input[name="expectedSalary"], input[placeholder*="期望薪资"], input[placeholder*="薪资"]',
+                'config_section': 'WorkInfo',
+                'config_key': 'expected_salary',
+                'prompt': '[工作信息] 请输入您的期望薪资 (如: 15k-25k):',
+            },
+            {
+                'selector': 'input[name="jobTitle"], input[placeholder*="职位"], input[placeholder*="岗位"]',
+                'config_section': 'WorkInfo',
+                'config_key': 'desired_position',
+                'prompt': '[工作信息] 请输入您的期望职位:',
+            },
+            {
+                'selector': 'input[name="workExperience"], input[placeholder*="工作经验"], input[placeholder*="经验"]',
+                'config_section': 'WorkInfo',
+                'config_key': 'work_experience',
+                'prompt': '[工作信息] 请输入您的工作经验 (如: 3年):',
+            },
+            {
+                'selector': 'textarea[name="selfIntroduction"], textarea[placeholder*="自我介绍"], textarea[placeholder*="个人描述"]',
+                'config_section': 'WorkInfo',
+                'config_key': 'self_introduction',
+                'prompt': '[工作信息] 请输入您的自我介绍:',
+            },
+        ],
+    },
+    'education': {
+        'title': '教育背景信息',
+        'required': True,
+        'expand_selector': '[ka*="add-edu"], .edu-add, button[class*="add-education"]',
+        'fields': [
+            {
+                'selector': 'input[name="school"], input[placeholder*="学校"], input[placeholder*="院校"]',
+                'config_section': 'Education',
+                'config_key': 'school_name',
+                'prompt': '[教育背景] 请输入您的毕业院校:',
+            },
+            {
+                'selector': 'input[name="major"], input[placeholder*="专业"]',
+                'config_section': 'Education',
+                'config_key': 'major',
+                'prompt': '[教育背景] 请输入您的专业:',
+            },
+            {
+                'selector': 'input[name="degree"], input[placeholder*="学历"]',
+                'config_section': 'Education',
+                'config_key': 'degree',
+                'prompt': '[教育背景] 请输入您的学历 (如: 本科/硕士/博士):',
+            },
+            {
+                'selector': 'input[name="graduationYear"], input[placeholder*="毕业时间"], input[placeholder*="毕业年份"]',
+                'config_section': 'Education',
+                'config_key': 'graduation_year',
+                'prompt': '[教育背景] 请输入您的毕业年份 (如: 2020):',
+            },
+        ],
+    },
+    'others': {
+        'title': '其他信息',
+        'required': False,
+        'expand_selector': '[ka*="add-project"], .project-add, button[class*="add-project"]',
+        'fields': [
+            {
+                'selector': 'textarea[name="projectExperience"], textarea[placeholder*="项目经验"]',
+                'config_section': 'Others',
+                'config_key': 'project_experience',
+                'prompt': '[其他信息] 请输入您的项目经验:',
+            },
+            {
+                'selector': 'textarea[name="skills"], textarea[placeholder*="技能"], textarea[placeholder*="专业技能"]',
+                'config_section': 'Others',
+                'config_key': 'professional_skills',
+                'prompt': '[其他信息] 请输入您的专业技能:',
+            },
+            {
+                'selector': 'input[name="github"], input[placeholder*="GitHub"], input[placeholder*="github"]',
+                'config_section': 'Others',
+                'config_key': 'github_url',
+                'prompt': '[其他信息] 请输入您的GitHub地址 (可选，直接回车跳过):',
+            },
+        ],
+    },
+}
+
+
+def iter_fields(catalog: dict = None):
+    """
+    按填充顺序遍历所有字段
+
+    Args:
+        catalog: 字段目录，默认 FIELD_CATALOG
+
+    Yields:
+        tuple: (批次名称, 是否必填, 字段配置字典)
+    """
+    for step_name, step in (catalog or FIELD_CATALOG).items():
+        for field in step['fields']:
+            yield step_name, step['required'], field
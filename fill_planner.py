@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线填充规划
+不启动浏览器，直接用本地 HTML 解析器匹配字段目录中的选择器，
+输出填充计划和缺失的配置项；也可批量检查一组保存的页面，用于选择器回归测试
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from html.parser import HTMLParser
+from typing import Optional
+
+import config_manager
+import field_catalog
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # selectolax 为可选依赖
+    SelectolaxParser = None
+
+try:
+    import lxml.html
+    import cssselect  # noqa: F401  lxml 的 CSS 选择器依赖 cssselect
+except ImportError:  # lxml 为可选依赖
+    lxml = None
+
+
+# 字段状态
+ACTION_FILL = 'fill'                    # 找到字段且已有配置值
+ACTION_MISSING_VALUE = 'missing_value'  # 找到字段但缺少配置值
+ACTION_NOT_FOUND = 'not_found'          # 页面上没有该字段
+
+
+class _SimpleDocument(HTMLParser):
+    """
+    标准库后备解析器，仅支持字段目录用到的选择器子集:
+    tag[attr="v"] / tag[attr*="v"] / tag[attr^="v"] / tag[attr$="v"]
+    """
+
+    _SELECTOR_RE = field_catalog.SIMPLE_SELECTOR_RE
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.elements = []  # (tag, attrs)，按文档顺序
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        self.elements.append((tag, {name: value or '' for name, value in attrs}))
+
+    handle_startendtag = handle_starttag
+
+    def matches(self, selector: str) -> bool:
+        """判断是否有元素匹配单个选择器"""
+        return self.first_index(selector) is not None
+
+    def first_index(self, selector: str) -> Optional[int]:
+        """返回第一个匹配单个选择器的元素在文档中的位置，没有匹配时返回 None"""
+        match = self._SELECTOR_RE.match(selector)
+        if not match:
+            raise ValueError(f"后备解析器不支持的选择器: {selector}，请安装 selectolax 或 lxml")
+        tag = (match.group('tag') or '*').lower()
+        attr, op, expected = match.group('attr'), match.group('op'), match.group('value')
+
+        for index, (element_tag, attrs) in enumerate(self.elements):
+            if tag != '*' and element_tag != tag:
+                continue
+            if attr is None:
+                return index
+            if attr not in attrs:
+                continue
+            actual = attrs[attr]
+            if (op is None
+                    or (op == '=' and actual == expected)
+                    or (op == '*=' and expected in actual)
+                    or (op == '^=' and actual.startswith(expected))
+                    or (op == '$=' and actual.endswith(expected))):
+                return index
+        return None
+
+
+class PageDocument:
+    """已解析的页面，自动选择可用的最快解析器"""
+
+    def __init__(self, html: str):
+        """
+        解析页面
+
+        Args:
+            html: 页面源码
+        """
+        if SelectolaxParser is not None:
+            self.engine = 'selectolax'
+            self._tree = SelectolaxParser(html)
+        elif lxml is not None:
+            self.engine = 'lxml'
+            self._tree = lxml.html.fromstring(html)
+        else:
+            self.engine = 'html.parser'
+            self._tree = _SimpleDocument(html)
+        self._positions = None
+
+    def first_match(self, selector: str) -> str:
+        """
+        在逗号分隔的各个备选选择器中，返回匹配元素在文档中最靠前的一个
+        （与浏览器 querySelector 对整个选择器组返回的元素一致）
+
+        Args:
+            selector: 选择器，可包含多个以逗号分隔的备选写法
+
+        Returns:
+            str: 匹配到的备选选择器，均未匹配时返回空字符串
+        """
+        best, best_index = "", None
+        for alternative in (part.strip() for part in selector.split(',')):
+            index = self._first_index(alternative)
+            if index is not None and (best_index is None or index < best_index):
+                best, best_index = alternative, index
+        return best
+
+    def _first_index(self, selector: str) -> Optional[int]:
+        """返回单个选择器第一个匹配元素的文档位置，没有匹配时返回 None"""
+        if self.engine == 'selectolax':
+            node = self._tree.css_first(selector)
+            if node is None:
+                return None
+            if self._positions is None:
+                # 按先序遍历记录每个节点的位置，只在第一次需要时计算
+                root = self._tree.root
+                self._positions = {item.mem_id: index
+                                   for index, item in enumerate(root.traverse())} if root else {}
+            return self._positions.get(node.mem_id, 0)
+        if self.engine == 'lxml':
+            elements = self._tree.cssselect(selector)
+            if not elements:
+                return None
+            # cssselect 按文档顺序返回，第一个元素之前的全部元素即其先序位置
+            return int(elements[0].xpath('count(preceding::*) + count(ancestor::*)'))
+        return self._tree.first_index(selector)
+
+
+def plan_fill(html: str, config: config_manager.ConfigManager = None, catalog: dict = None) -> dict:
+    """
+    生成填充计划（只读配置，不会询问用户）
+
+    Args:
+        html: 页面源码
+        config: 配置管理器，默认为当前配置
+        catalog: 字段目录，默认 field_catalog.FIELD_CATALOG
+
+    Returns:
+        dict: {engine, elapsed_ms, fields: [...], missing_keys: [...]}
+    """
+    config = config or config_manager.get_manager()
+    started = time.perf_counter()
+    document = PageDocument(html)
+
+    fields = []
+    missing_keys = []
+    for step_name, required, field in field_catalog.iter_fields(catalog):
+        matched = document.first_match(field['selector'])
+        has_value = bool(config.get_config_value(field['config_section'], field['config_key']).strip())
+
+        if not matched:
+            action = ACTION_NOT_FOUND
+        elif has_value:
+            action = ACTION_FILL
+        else:
+            action = ACTION_MISSING_VALUE
+            if required:
+                missing_keys.append(f"{field['config_section']}.{field['config_key']}")
+
+        fields.append({
+            'step': step_name,
+            'config_section': field['config_section'],
+            'config_key': field['config_key'],
+            'required': required,
+            'matched_selector': matched,
+            'action': action,
+        })
+
+    return {
+        'engine': document.engine,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        'fields': fields,
+        'missing_keys': missing_keys,
+    }
+
+
+def print_plan(plan: dict, title: str = ""):
+    """打印填充计划"""
+    labels = {ACTION_FILL: '填充', ACTION_MISSING_VALUE: '缺值', ACTION_NOT_FOUND: '未找到'}
+    print(f"\n=== 填充计划 {title} ===")
+    for item in plan['fields']:
+        print(f"[{labels[item['action']]}] {item['config_section']}.{item['config_key']}"
+              f"  {item['matched_selector']}")
+    if plan['missing_keys']:
+        print(f"缺失的必填配置: {', '.join(plan['missing_keys'])}")
+    print(f"解析器: {plan['engine']}  耗时: {plan['elapsed_ms']} ms")
+    print("==================\n")
+
+
+def iter_html_files(paths: list):
+    """展开文件和目录，返回所有 .html/.htm 文件路径"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(('.html', '.htm')):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def plan_corpus(paths: list, config: config_manager.ConfigManager = None) -> dict:
+    """
+    批量规划一组保存的页面，统计每个字段在多少页面上能被匹配
+
+    Args:
+        paths: 页面文件或目录列表
+        config: 配置管理器
+
+    Returns:
+        dict: {pages: {路径: 计划}, field_hits: {节.键: 匹配页面数}, total_ms}
+    """
+    pages = {}
+    field_hits = {}
+    started = time.perf_counter()
+    for path in iter_html_files(paths):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            plan = plan_fill(f.read(), config)
+        pages[path] = plan
+        for item in plan['fields']:
+            key = f"{item['config_section']}.{item['config_key']}"
+            field_hits[key] = field_hits.get(key, 0) + (item['action'] != ACTION_NOT_FOUND)
+    return {
+        'pages': pages,
+        'field_hits': field_hits,
+        'total_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def main(argv: list = None) -> int:
+    """命令行入口: python fill_planner.py [--profile 档案] [--json] 页面或目录..."""
+    parser = argparse.ArgumentParser(description="离线生成填充计划，无需启动浏览器")
+    parser.add_argument('paths', nargs='+', help="保存的页面文件或目录")
+    parser.add_argument('--profile', help="候选人档案名称，默认使用 config.ini")
+    parser.add_argument('--json', action='store_true', help="以 JSON 输出")
+    args = parser.parse_args(argv)
+
+    result = plan_corpus(args.paths, config_manager.get_manager(args.profile))
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        for path, plan in result['pages'].items():
+            print_plan(plan, path)
+        if len(result['pages']) > 1:
+            print(f"=== 字段命中统计 ({len(result['pages'])} 个页面, {result['total_ms']} ms) ===")
+            for key, hits in result['field_hits'].items():
+                print(f"{key}: {hits}/{len(result['pages'])}")
+
+    # 任一页面缺少必填配置时返回非零，便于脚本判断
+    return 1 if any(plan['missing_keys'] for plan in result['pages'].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
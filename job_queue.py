@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量任务队列
+基于 SQLite 持久化待填充的职位URL，记录每个任务的进度检查点，支持崩溃后自动恢复
+"""
+
+import json
+import sqlite3
+import time
+from typing import Optional
+
+
+# 任务状态
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobQueue:
+    """持久化任务队列 - 每个任务对应一个待填充的页面URL"""
+
+    def __init__(self, db_file: str = "job_queue.db", max_attempts: int = 3,
+                 lease_seconds: int = 600):
+        """
+        初始化任务队列
+
+        Args:
+            db_file: SQLite 数据库文件路径
+            max_attempts: 单个任务的最大尝试次数，超出后标记为失败
+            lease_seconds: running 任务超过该时间没有检查点即视为进程已崩溃
+        """
+        self.db_file = db_file
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.conn = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+        self.recover()
+
+    def _create_tables(self):
+        """创建任务表"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                checkpoint TEXT NOT NULL DEFAULT '[]',
+                error TEXT NOT NULL DEFAULT '',
+                created_at REAL NOT NULL,
+                started_at REAL,
+                heartbeat_at REAL,
+                finished_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, id)")
+
+    def recover(self, force: bool = False) -> int:
+        """
+        进程崩溃时遗留的 running 任务重新放回队列，保留检查点
+
+        Args:
+            force: 为 True 时不等待租约过期，直接恢复所有 running 任务
+                   （仅在确认没有其他进程在处理队列时使用）
+
+        Returns:
+            int: 恢复的任务数
+        """
+        deadline = float('inf') if force else time.time() - self.lease_seconds
+        cursor = self.conn.execute(
+            "UPDATE jobs SET state = ? WHERE state = ? AND heartbeat_at < ?",
+            (PENDING, RUNNING, deadline))
+        if cursor.rowcount:
+            print(f"[队列] 恢复了 {cursor.rowcount} 个未完成的任务")
+        return cursor.rowcount
+
+    def add(self, url: str) -> int:
+        """
+        添加一个任务
+
+        Args:
+            url: 待填充页面的URL
+
+        Returns:
+            int: 任务ID
+        """
+        cursor = self.conn.execute(
+            "INSERT INTO jobs (url, created_at) VALUES (?, ?)", (url, time.time()))
+        return cursor.lastrowid
+
+    def add_many(self, urls: list) -> int:
+        """
+        批量添加任务（单个事务）
+
+        Args:
+            urls: URL列表，空行会被忽略
+
+        Returns:
+            int: 新增任务数
+        """
+        now = time.time()
+        rows = [(url.strip(), now) for url in urls if url.strip()]
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany("INSERT INTO jobs (url, created_at) VALUES (?, ?)", rows)
+        return len(rows)
+
+    def claim_next(self) -> Optional[dict]:
+        """
+        领取下一个待处理任务并标记为 running
+
+        Returns:
+            dict 或 None: 任务信息，checkpoint 为已完成的字段批次列表
+        """
+        with self.conn:
+            # IMMEDIATE 事务保证多个进程不会领取到同一个任务
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.recover()
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE state = ? ORDER BY id LIMIT 1", (PENDING,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, started_at = ?, heartbeat_at = ? "
+                "WHERE id = ?",
+                (RUNNING, now, now, row['id']))
+
+        job = dict(row)
+        job['state'] = RUNNING
+        job['attempts'] += 1
+        job['checkpoint'] = json.loads(job['checkpoint'])
+        return job
+
+    def save_checkpoint(self, job_id: int, completed: list):
+        """
+        保存检查点，同时续期任务租约
+
+        Args:
+            job_id: 任务ID
+            completed: 已完成的字段批次名称列表
+        """
+        self.conn.execute(
+            "UPDATE jobs SET checkpoint = ?, heartbeat_at = ? WHERE id = ?",
+            (json.dumps(completed), time.time(), job_id))
+
+    def mark_done(self, job_id: int):
+        """标记任务完成"""
+        self.conn.execute(
+            "UPDATE jobs SET state = ?, error = '', finished_at = ? WHERE id = ?",
+            (DONE, time.time(), job_id))
+
+    def mark_failed(self, job_id: int, error: str):
+        """
+        记录任务失败，未超过最大尝试次数时重新放回队列
+
+        Args:
+            job_id: 任务ID
+            error: 错误信息
+        """
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            state = FAILED if row and row['attempts'] >= self.max_attempts else PENDING
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+                (state, error, time.time(), job_id))
+
+    def retry_failed(self) -> int:
+        """把所有失败任务重新放回队列，返回数量"""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET state = ?, attempts = 0, checkpoint = '[]' WHERE state = ?",
+            (PENDING, FAILED))
+        return cursor.rowcount
+
+    def get_stats(self) -> dict:
+        """
+        统计队列状态、吞吐量和失败率
+
+        Returns:
+            dict: 各状态数量、每分钟完成数、失败率、平均耗时（秒）
+        """
+        stats = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for row in self.conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+            stats[row['state']] = row['n']
+
+        row = self.conn.execute("""
+            SELECT MIN(started_at) AS first, MAX(finished_at) AS last,
+                   AVG(finished_at - started_at) AS avg_seconds
+            FROM jobs WHERE state = ?
+        """, (DONE,)).fetchone()
+
+        finished = stats[DONE] + stats[FAILED]
+        elapsed = (row['last'] - row['first']) if row['first'] and row['last'] else 0
+        stats['throughput_per_minute'] = round(stats[DONE] / elapsed * 60, 2) if elapsed > 0 else 0.0
+        stats['failure_rate'] = round(stats[FAILED] / finished, 4) if finished else 0.0
+        stats['avg_seconds'] = round(row['avg_seconds'] or 0.0, 2)
+        return stats
+
+    def show_stats(self):
+        """显示队列统计信息"""
+        stats = self.get_stats()
+        print("\n=== 任务队列统计 ===")
+        print(f"待处理: {stats[PENDING]}  进行中: {stats[RUNNING]}  "
+              f"已完成: {stats[DONE]}  失败: {stats[FAILED]}")
+        print(f"吞吐量: {stats['throughput_per_minute']} 个/分钟")
+        print(f"失败率: {stats['failure_rate']:.1%}")
+        print(f"平均耗时: {stats['avg_seconds']} 秒")
+        print("==================\n")
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+
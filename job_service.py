@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地填充任务服务
+通过 HTTP 接口接收填充任务（档案 + URL + 站点），由固定数量的浏览器工作线程执行
+（每个工作线程保持一个已登录的浏览器，连续的同档案任务无需重新启动浏览器），
+支持流式查看任务进度，并在 /metrics 提供队列深度、延迟分位数和各工作线程利用率
+
+接口:
+    POST /jobs                 提交任务 {"profile": "张三", "url": "...", "site": "zhipin", "priority": "normal"}
+    GET  /jobs                 所有任务概要
+    GET  /jobs/<id>            任务状态与结果
+    GET  /jobs/<id>/events     流式输出任务事件（每行一个 JSON，任务结束后断开）
+    GET  /metrics              运行指标（含各域名的限速排队深度和等待时间）
+"""
+
+import collections
+import http.server
+import io
+import itertools
+import json
+import math
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+import config_manager
+import rate_limiter
+
+
+# 任务状态
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _zhipin_filler(**kwargs):
+    """BOSS直聘填充器（延迟导入，启动服务时不加载浏览器相关依赖）"""
+    import zhipin_filler
+    return zhipin_filler.ZhipinFiller(**kwargs)
+
+
+# 站点注册表: 站点名称 -> 填充器工厂，工厂需接受 ZhipinFiller 的关键字参数（包括 config）
+SITES = {
+    'zhipin': _zhipin_filler,
+}
+
+
+def register_site(name: str, factory: Callable):
+    """
+    注册新站点的填充器
+
+    Args:
+        name: 站点名称，提交任务时通过 site 字段指定
+        factory: 填充器工厂，返回的对象需提供 open_session/recover_session/close_session/
+                 fill_specific_page/missing_required_keys/fill_stats/last_error/browser
+    """
+    SITES[name] = factory
+
+
+def percentile(values: list, fraction: float) -> float:
+    """最近秩法计算分位数，values 为空时返回 0"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return round(ordered[index], 3)
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    按线程分发的标准输出：工作线程中的 print 同时写入所属任务的事件流，
+    其他线程的输出保持不变
+    """
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self._sinks = {}
+
+    def attach(self, sink: Callable[[str], None]):
+        """把当前线程的输出转发给 sink（每次一整行）"""
+        self._sinks[threading.get_ident()] = [sink, '']
+
+    def detach(self):
+        """停止转发当前线程的输出"""
+        entry = self._sinks.pop(threading.get_ident(), None)
+        if entry and entry[1].strip():
+            entry[0](entry[1])
+
+    def write(self, text):
+        entry = self._sinks.get(threading.get_ident())
+        if entry:
+            lines = (entry[1] + text).split('\n')
+            entry[1] = lines.pop()
+            for line in lines:
+                if line.strip():
+                    entry[0](line)
+        return self.fallback.write(text)
+
+    def flush(self):
+        self.fallback.flush()
+
+
+class Job:
+    """一个填充任务及其事件记录"""
+
+    def __init__(self, job_id: int, profile: Optional[str], url: Optional[str], site: str,
+                 priority: str = 'normal'):
+        self.id = job_id
+        self.profile = profile
+        self.url = url
+        self.site = site
+        self.priority = priority
+        self.state = QUEUED
+        self.worker = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.events = []
+        self.changed = threading.Condition()
+        self.add_event('queued')
+
+    def add_event(self, event_type: str, **fields):
+        """追加一条事件并唤醒正在流式读取的连接"""
+        with self.changed:
+            self.events.append({'type': event_type, 'time': round(time.time(), 3), **fields})
+            self.changed.notify_all()
+
+    def finish(self, state: str, result: dict):
+        """
+        结束任务：状态和结束事件在同一把锁内更新，流式读取不会在收到结束事件前看到已结束状态
+
+        Args:
+            state: DONE 或 FAILED
+            result: 任务结果
+        """
+        with self.changed:
+            self.finished_at = time.time()
+            self.result = result
+            self.state = state
+            self.add_event(state, result=result)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (DONE, FAILED)
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        """转换为接口返回的字典"""
+        data = {
+            'id': self.id,
+            'profile': self.profile,
+            'url': self.url,
+            'site': self.site,
+            'priority': self.priority,
+            'state': self.state,
+            'worker': self.worker,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+class _Worker(threading.Thread):
+    """浏览器工作线程，同一时间只执行一个任务，在任务之间复用已启动并登录的浏览器"""
+
+    def __init__(self, service: 'JobService', index: int):
+        super().__init__(name=f"fill-worker-{index}", daemon=True)
+        self.service = service
+        self.jobs_done = 0
+        self.busy_seconds = 0.0
+        self.busy_since = None
+        self.limiter = None
+        # 配置管理器不是线程安全的，每个工作线程按档案缓存自己的实例
+        self.configs = {}
+        self.filler = None
+        self.filler_key = None
+
+    def config_for(self, profile: Optional[str]) -> config_manager.ConfigManager:
+        """返回本线程使用的档案配置"""
+        if profile not in self.configs:
+            self.configs[profile] = config_manager.create_manager(profile)
+        return self.configs[profile]
+
+    def filler_for(self, job: Job):
+        """
+        返回本线程的填充器：同一站点和档案的任务复用已打开的浏览器，
+        浏览器崩溃时重启并恢复登录，切换站点或档案时关闭旧浏览器再启动新的
+
+        Args:
+            job: 要执行的任务
+
+        Returns:
+            填充器，浏览器已启动并登录
+
+        Raises:
+            RuntimeError: 浏览器无法启动或无法登录
+        """
+        key = (job.site, job.profile)
+        if self.filler is not None and self.filler_key != key:
+            self.close_filler()
+        if self.filler is None:
+            filler = SITES[job.site](profile=job.profile, interactive=False, headless=self.service.headless,
+                                     incremental=self.service.incremental, config=self.config_for(job.profile))
+            if self.limiter:
+                filler.browser.set_rate_limiter(self.limiter)
+            if not filler.open_session():
+                filler.close_session()
+                raise RuntimeError(filler.last_error)
+            self.filler, self.filler_key = filler, key
+        elif not self.filler.recover_session():
+            error = self.filler.last_error
+            self.close_filler()
+            raise RuntimeError(error)
+        return self.filler
+
+    def close_filler(self):
+        """关闭本线程的浏览器"""
+        if self.filler is None:
+            return
+        try:
+            self.filler.close_session()
+        except Exception as e:
+            print(f"[错误] 关闭浏览器失败: {e}")
+        self.filler = None
+        self.filler_key = None
+
+    def run(self):
+        # sqlite 连接不能跨线程共享，每个工作线程使用自己的限速器（通过数据库共享令牌桶）
+        self.limiter = rate_limiter.RateLimiter(self.service.rate_db) if self.service.rate_db else None
+        try:
+            while True:
+                job = self.service._pending.get()
+                if job is None:
+                    break
+                self.busy_since = time.monotonic()
+                try:
+                    self.service._run(job, self)
+                finally:
+                    self.busy_seconds += time.monotonic() - self.busy_since
+                    self.busy_since = None
+                    self.jobs_done += 1
+        finally:
+            self.close_filler()
+            if self.limiter:
+                self.limiter.close()
+
+    def stats(self, uptime: float) -> dict:
+        """工作线程的利用率统计"""
+        busy = self.busy_seconds + (time.monotonic() - self.busy_since if self.busy_since else 0.0)
+        return {
+            'name': self.name,
+            'busy': self.busy_since is not None,
+            'jobs': self.jobs_done,
+            'busy_seconds': round(busy, 3),
+            'utilization': round(busy / uptime, 4) if uptime else 0.0,
+        }
+
+
+class JobService:
+    """填充任务服务 - 有界的任务队列 + 固定数量的浏览器工作线程"""
+
+    def __init__(self, workers: int = 2, max_pending: int = 100, headless: bool = True,
+                 incremental: bool = False, rate_db: str = "rate_limits.db", history: int = 1000):
+        """
+        初始化服务
+
+        Args:
+            workers: 浏览器工作线程数（即同时运行的浏览器数量上限）
+            max_pending: 排队任务上限，超过时拒绝提交
+            headless: 是否无头模式运行浏览器
+            incremental: 是否使用增量填充
+            rate_db: 访问限速数据库，None 表示不限速
+            history: 延迟统计保留的最近任务数
+        """
+        self.headless = headless
+        self.incremental = incremental
+        self.rate_db = rate_db
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._wait_times = collections.deque(maxlen=history)
+        self._run_times = collections.deque(maxlen=history)
+        self._totals = {DONE: 0, FAILED: 0}
+        self._output = None
+        self._workers = [_Worker(self, index) for index in range(1, workers + 1)]
+
+    def start(self):
+        """启动工作线程"""
+        if not isinstance(sys.stdout, _ThreadOutput):
+            sys.stdout = _ThreadOutput(sys.stdout)
+        self._output = sys.stdout
+        self._started = time.monotonic()
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self, timeout: float = None):
+        """停止接收任务，等待工作线程处理完已排队的任务后退出"""
+        for _ in self._workers:
+            self._pending.put(None)
+        for worker in self._workers:
+            worker.join(timeout)
+        if isinstance(sys.stdout, _ThreadOutput):
+            sys.stdout = sys.stdout.fallback
+
+    def submit(self, profile: str = None, url: str = None, site: str = 'zhipin',
+               priority: str = 'normal') -> Job:
+        """
+        提交任务
+
+        Args:
+            profile: 候选人档案名称
+            url: 要填充的页面
+            site: 站点名称
+            priority: 限速优先级通道 high/normal/low
+
+        Returns:
+            Job: 新任务
+
+        Raises:
+            ValueError: 站点未注册或优先级无效
+            config_manager.UnknownProfileError: 档案不存在
+            queue.Full: 排队任务已达上限
+        """
+        if site not in SITES:
+            raise ValueError(f"未注册的站点: {site}")
+        if priority not in rate_limiter.PRIORITY_NAMES:
+            raise ValueError(f"无效的优先级: {priority}")
+        if profile and not config_manager.get_profile_store().has_profile(profile):
+            raise config_manager.UnknownProfileError(profile)
+        with self._lock:
+            job = Job(next(self._ids), profile, url, site, priority)
+            self._pending.put_nowait(job)
+            self._jobs[job.id] = job
+        print(f"[服务] 已接收任务 {job.id}: {site} {profile or '默认配置'} {url or ''}")
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """按编号获取任务"""
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> list:
+        """所有任务的概要"""
+        return [job.to_dict(include_result=False) for job in list(self._jobs.values())]
+
+    def _run(self, job: Job, worker: _Worker):
+        """在工作线程中执行任务"""
+        job.state = RUNNING
+        job.worker = worker.name
+        job.started_at = time.time()
+        job.add_event('started', worker=worker.name)
+        self._output.attach(lambda line: job.add_event('log', message=line))
+        try:
+            filler = worker.filler_for(job)
+            missing = filler.missing_required_keys()
+            if missing:
+                raise RuntimeError(f"缺少必填配置: {', '.join(missing)}")
+            if worker.limiter:
+                filler.browser.set_rate_limiter(worker.limiter, rate_limiter.PRIORITY_NAMES[job.priority])
+            ok = filler.fill_specific_page(job.url)
+            result = {'ok': ok, 'error': filler.last_error, **filler.fill_stats}
+        except Exception as e:
+            result = {'ok': False, 'error': str(e)}
+        finally:
+            self._output.detach()
+
+        job.finish(DONE if result['ok'] else FAILED, result)
+        with self._lock:
+            self._totals[job.state] += 1
+            self._wait_times.append(job.started_at - job.submitted_at)
+            self._run_times.append(job.finished_at - job.started_at)
+
+    def get_metrics(self) -> dict:
+        """
+        运行指标
+
+        Returns:
+            dict: 队列深度、任务数、等待/执行/总延迟分位数（秒）、各工作线程利用率，
+                  以及各域名的限速排队深度和等待时间
+        """
+        uptime = time.monotonic() - self._started
+        with self._lock:
+            waits = list(self._wait_times)
+            runs = list(self._run_times)
+            totals = dict(self._totals)
+        latency = [wait + run for wait, run in zip(waits, runs)]
+        running = sum(1 for worker in self._workers if worker.busy_since is not None)
+        return {
+            'uptime': round(uptime, 3),
+            'queue_depth': self._pending.qsize(),
+            'running': running,
+            'submitted': len(self._jobs),
+            'done': totals[DONE],
+            'failed': totals[FAILED],
+            'throughput_per_minute': round((totals[DONE] + totals[FAILED]) / uptime * 60, 3) if uptime else 0.0,
+            'latency': {name: {'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95),
+                               'p99': percentile(values, 0.99)}
+                        for name, values in (('wait', waits), ('run', runs), ('total', latency))},
+            'workers': [worker.stats(uptime) for worker in self._workers],
+            'rate_limits': self._rate_metrics(),
+        }
+
+    def _rate_metrics(self) -> dict:
+        """读取限速数据库中的统计（sqlite 连接不能跨线程共享，每次读取使用单独的连接）"""
+        if not self.rate_db:
+            return {}
+        limiter = rate_limiter.RateLimiter(self.rate_db)
+        try:
+            return limiter.get_metrics()
+        finally:
+            limiter.close()
+
+
+class _ServiceHandler(http.server.BaseHTTPRequestHandler):
+    """HTTP 接口处理器"""
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def service(self) -> JobService:
+        return self.server.service
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job_from_path(self, parts: list) -> Optional[Job]:
+        try:
+            job = self.service.get(int(parts[1]))
+        except ValueError:
+            job = None
+        if job is None:
+            self._send_json(404, {'error': 'job_not_found'})
+        return job
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?', 1)[0].split('/') if part]
+        if parts == ['metrics']:
+            self._send_json(200, self.service.get_metrics())
+        elif parts == ['jobs']:
+            self._send_json(200, self.service.list_jobs())
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self._job_from_path(parts)
+            if job:
+                self._send_json(200, job.to_dict())
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'events':
+            job = self._job_from_path(parts)
+            if job:
+                self._stream_events(job)
+        else:
+            self._send_json(404, {'error': 'not_found'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            self._send_json(404, {'error': 'not_found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            job = self.service.submit(payload.get('profile'), payload.get('url'), payload.get('site', 'zhipin'),
+                                      payload.get('priority', 'normal'))
+        except config_manager.UnknownProfileError as e:
+            self._send_json(400, {'error': 'unknown_profile', 'profile': e.profile})
+            return
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except queue.Full:
+            self._send_json(503, {'error': 'queue_full'})
+            return
+        self._send_json(202, {'id': job.id, 'state': job.state})
+
+    def _stream_events(self, job: Job):
+        """逐行输出任务事件，任务结束后关闭连接"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        sent = 0
+        try:
+            while True:
+                with job.changed:
+                    while sent == len(job.events) and not job.finished:
+                        job.changed.wait(15)
+                    events = job.events[sent:]
+                    finished = job.finished
+                for event in events:
+                    self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode('utf-8'))
+                self.wfile.flush()
+                sent += len(events)
+                if finished and sent == len(job.events):
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class ServiceServer(http.server.ThreadingHTTPServer):
+    """携带任务服务实例的 HTTP 服务器"""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, service: JobService):
+        super().__init__(address, _ServiceHandler)
+        self.service = service
+
+
+def serve(host: str = '127.0.0.1', port: int = 8765, **service_options):
+    """
+    启动服务并阻塞运行，Ctrl+C 停止
+
+    Args:
+        host: 监听地址（默认只监听本机）
+        port: 监听端口
+        service_options: JobService 的参数
+    """
+    service = JobService(**service_options)
+    server = ServiceServer((host, port), service)
+    service.start()
+    print(f"[服务] 正在监听 http://{host}:{server.server_address[1]}/ "
+          f"（{len(service._workers)} 个工作线程）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[服务] 正在停止，等待进行中的任务完成...")
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    serve()
@@ -9,7 +9,9 @@
 
 import sys
 import traceback
+import cli
 import config_manager
+import job_queue
 import zhipin_filler
 
 
@@ -28,12 +30,15 @@ def show_banner():
 
 def show_menu():
     """显示主菜单"""
-    print("\n📋 请选择操作:")
+    print(f"\n👤 当前档案: {config_manager.current_profile() or '默认 (config.ini)'}")
+    print("📋 请选择操作:")
     print("1. 启动 BOSS直聘 信息填充")
     print("2. 查看当前配置信息")
     print("3. 手动编辑配置信息")
     print("4. 清空所有配置")
     print("5. 帮助信息")
+    print("6. 批量填充 (任务队列)")
+    print("7. 候选人档案管理")
     print("0. 退出程序")
     print("-" * 30)
 
@@ -50,7 +55,7 @@ def handle_zhipin_filling():
     confirm = input("\n是否继续? (y/n): ").strip().lower()
     if confirm in ['y', 'yes', '是']:
         try:
-            filler = zhipin_filler.ZhipinFiller()
+            filler = zhipin_filler.ZhipinFiller(profile=config_manager.current_profile())
             success = filler.start_filling_process()
 
             if success:
@@ -68,6 +73,41 @@ def handle_zhipin_filling():
         print("操作已取消")
 
 
+def handle_batch_filling():
+    """处理批量填充任务队列"""
+    print("\n📦 批量填充 (任务队列)")
+    queue = job_queue.JobQueue()
+    # 菜单模式下只有本进程处理队列，上次中断的任务可以直接恢复
+    queue.recover(force=True)
+    queue.show_stats()
+
+    url_file = input("输入URL列表文件路径以添加任务 (直接回车跳过): ").strip()
+    if url_file:
+        try:
+            with open(url_file, 'r', encoding='utf-8') as f:
+                count = queue.add_many(f.readlines())
+            print(f"✅ 已添加 {count} 个任务")
+        except Exception as e:
+            print(f"❌ 读取URL列表失败: {e}")
+
+    if queue.get_stats()[job_queue.FAILED]:
+        retry = input("是否重试失败的任务? (y/n): ").strip().lower()
+        if retry in ['y', 'yes', '是']:
+            print(f"已重新加入 {queue.retry_failed()} 个任务")
+
+    confirm = input("\n是否开始处理队列? (y/n): ").strip().lower()
+    if confirm in ['y', 'yes', '是']:
+        try:
+            filler = zhipin_filler.ZhipinFiller(profile=config_manager.current_profile())
+            filler.run_queue(queue)
+        except Exception as e:
+            print(f"\n❌ 程序异常: {e}")
+            traceback.print_exc()
+    else:
+        print("操作已取消")
+    queue.close()
+
+
 def handle_view_config():
     """处理查看配置"""
     print("\n📄 当前配置信息:")
@@ -115,13 +155,22 @@ def handle_clear_config():
     print("\n⚠️  危险操作: 清空所有配置")
     print("这将删除所有已保存的个人信息!")
 
+    profile = config_manager.current_profile()
+    if profile:
+        print(f"将只删除当前档案: {profile}")
+
     confirm1 = input("确定要继续吗? (yes/no): ").strip().lower()
     if confirm1 == 'yes':
         confirm2 = input("请再次确认，输入 'DELETE' 来执行清空操作: ").strip()
         if confirm2 == 'DELETE':
             try:
                 import os
-                if os.path.exists("config.ini"):
+                if profile:
+                    config_manager.get_profile_store().delete_profile(profile)
+                    config_manager.forget_profile(profile)
+                    config_manager.use_profile(None)
+                    print(f"✅ 档案 {profile} 已删除，已切回默认配置")
+                elif os.path.exists("config.ini"):
                     os.remove("config.ini")
                     print("✅ 配置文件已删除，程序重启后将重新创建")
                 else:
@@ -134,6 +183,71 @@ def handle_clear_config():
         print("操作已取消")
 
 
+def handle_profiles():
+    """处理候选人档案管理"""
+    store = config_manager.get_profile_store()
+    while True:
+        profiles = store.list_profiles()
+        print(f"\n👥 候选人档案 (共 {len(profiles)} 个)")
+        print("1. 选择档案")
+        print("2. 新建档案")
+        print("3. 将 config.ini 迁移为档案")
+        print("4. 导入档案 (JSON/CSV)")
+        print("5. 导出档案 (JSON/CSV)")
+        print("6. 切回默认配置 (config.ini)")
+        print("0. 返回主菜单")
+        choice = input("请输入选项数字: ").strip()
+
+        try:
+            if choice == '1':
+                name = input("请输入档案名称 (输入 'list' 查看全部): ").strip()
+                if name == 'list':
+                    print("\n".join(profiles) or "暂无档案")
+                elif name in profiles:
+                    config_manager.use_profile(name)
+                    print(f"✅ 已切换到档案: {name}")
+                else:
+                    print("❌ 档案不存在")
+            elif choice == '2':
+                name = input("请输入新档案名称: ").strip()
+                if name in profiles:
+                    print("❌ 档案已存在，请使用选项 1 切换")
+                elif name:
+                    config_manager.use_profile(name, create=True)
+                    print(f"✅ 已创建并切换到档案: {name}")
+            elif choice == '3':
+                name = input("请输入新档案名称: ").strip()
+                if name:
+                    store.import_ini(name, "config.ini")
+                    config_manager.forget_profile(name)
+                    print(f"✅ 已将 config.ini 迁移为档案: {name}")
+            elif choice == '4':
+                path = input("请输入文件路径: ").strip()
+                if path.lower().endswith('.csv'):
+                    print(f"✅ 已导入 {store.import_csv(path)} 条配置")
+                else:
+                    print(f"✅ 已导入 {store.import_json(path)} 个档案")
+                # 导入可能覆盖已加载的档案，当前档案需要重新读取
+                for name in profiles:
+                    config_manager.forget_profile(name)
+                config_manager.use_profile(config_manager.current_profile())
+            elif choice == '5':
+                path = input("请输入导出文件路径 (.json 或 .csv): ").strip()
+                if path.lower().endswith('.csv'):
+                    print(f"✅ 已导出 {store.export_csv(path)} 条配置")
+                else:
+                    print(f"✅ 已导出 {store.export_json(path)} 个档案")
+            elif choice == '6':
+                config_manager.use_profile(None)
+                print("✅ 已切回默认配置")
+            elif choice == '0':
+                break
+            else:
+                print("❌ 无效选项，请重新选择")
+        except Exception as e:
+            print(f"❌ 档案操作失败: {e}")
+
+
 def show_help():
     """显示帮助信息"""
     print("\n📚 帮助信息")
@@ -157,7 +271,7 @@ def show_help():
     print("• 自动记忆新增信息")
     print("")
     print("🔒 隐私保护:")
-    print("• 所有信息存储在本地 config.ini 文件")
+    print("• 所有信息存储在本地 config.ini 文件或 profiles.db 档案库")
     print("• 不会上传任何个人信息")
     print("• 可随时删除配置文件")
     print("")
@@ -186,6 +300,10 @@ def main():
                 handle_clear_config()
             elif choice == '5':
                 show_help()
+            elif choice == '6':
+                handle_batch_filling()
+            elif choice == '7':
+                handle_profiles()
             elif choice == '0':
                 print("\n👋 感谢使用，祝您求职顺利!")
                 break
@@ -206,4 +324,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # 带参数运行时使用非交互的命令行模式，如: python main.py fill --no-prompt
+    if len(sys.argv) > 1:
+        sys.exit(cli.main(sys.argv[1:]))
     main()
\ No newline at end of file
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模拟招聘网站
+按字段目录生成简历编辑表单（随机使用 name/placeholder/textarea 等不同写法），
+可注入页面延迟、延迟渲染字段、SPA 式整体重渲染、折叠区块和随机缺失字段；
+并提供压测驱动，同时运行多个填充器并统计吞吐量和 p50/p95/p99 填充耗时
+
+用法:
+    python mock_site.py --port 8900 --latency 0.3 --late 0.3 --absent 0.1
+    python cli.py mock load --concurrency 4 --jobs 20 --late 0.3
+"""
+
+import html
+import http.server
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+import field_catalog
+
+
+RESUME_PATH = "/web/geek/resume"
+
+# 页面脚本：延迟渲染字段、点击展开折叠区块、定时整体重渲染（保留已填写的值）
+_PAGE_SCRIPT = """
+(function () {
+  var mock = %s;
+  function fields(step) { return document.querySelector('[data-step="' + step + '"] .fields'); }
+  mock.late.forEach(function (item) {
+    setTimeout(function () { fields(item.step).insertAdjacentHTML('beforeend', item.html); }, item.delay);
+  });
+  Object.keys(mock.collapsed).forEach(function (step) {
+    var button = document.querySelector('[data-step="' + step + '"] button');
+    button.addEventListener('click', function () {
+      fields(step).insertAdjacentHTML('beforeend', mock.collapsed[step]);
+      button.remove();
+    });
+  });
+  if (mock.rerender) {
+    setInterval(function () {
+      document.querySelectorAll('#resume-form input, #resume-form textarea').forEach(function (element) {
+        var copy = element.cloneNode(true);
+        copy.value = element.value;
+        element.replaceWith(copy);
+      });
+    }, mock.rerender);
+  }
+})();
+"""
+
+
+def render_field(alternative: str, field_id: str) -> str:
+    """
+    生成一个能被指定选择器写法匹配到的表单元素
+
+    Args:
+        alternative: 单个选择器写法，如 input[placeholder*="姓名"]
+        field_id: 元素 id
+
+    Returns:
+        str: 元素 HTML
+    """
+    match = field_catalog.SIMPLE_SELECTOR_RE.match(alternative)
+    if not match:
+        raise ValueError(f"模拟站点不支持的选择器: {alternative}")
+    tag = match.group('tag')
+    tag = 'input' if tag in (None, '*') else tag.lower()
+    attrs = {'id': field_id}
+    attr, op, value = match.group('attr'), match.group('op'), match.group('value')
+    if attr:
+        # placeholder 的包含匹配生成更接近真实页面的提示文字
+        attrs[attr] = f"请输入{value}" if attr == 'placeholder' and op == '*=' else (value or '')
+    if tag == 'input':
+        attrs.setdefault('type', 'text')
+    rendered = " ".join(f'{name}="{html.escape(str(val), quote=True)}"' for name, val in attrs.items())
+    return f'<textarea {rendered}></textarea>' if tag == 'textarea' else f'<{tag} {rendered}>'
+
+
+class MockOptions:
+    """模拟站点的行为参数，URL 查询参数可以覆盖同名参数"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, late: float = 0.0,
+                 late_delay: float = 1.5, rerender: float = 0.0, absent: float = 0.0,
+                 collapsed: bool = False, seed: int = None):
+        """
+        Args:
+            latency: 页面响应延迟（秒）
+            jitter: 在延迟基础上追加的随机延迟上限（秒）
+            late: 字段延迟渲染的概率
+            late_delay: 延迟渲染字段的最长出现时间（秒）
+            rerender: SPA 整体重渲染间隔（秒），0 表示不重渲染
+            absent: 字段缺失的概率
+            collapsed: 有展开按钮的批次（expand_selector）是否默认折叠
+            seed: 随机种子，指定时同一请求序号生成相同页面
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.late = late
+        self.late_delay = late_delay
+        self.rerender = rerender
+        self.absent = absent
+        self.collapsed = collapsed
+        self.seed = seed
+
+    def override(self, query: dict) -> 'MockOptions':
+        """返回用查询参数覆盖后的副本"""
+        options = MockOptions(**vars(self))
+        for name, values in query.items():
+            if hasattr(options, name):
+                current = getattr(options, name)
+                value = values[-1]
+                if isinstance(current, bool):
+                    value = value.lower() in ('1', 'true', 'yes')
+                elif name == 'seed':
+                    value = int(value)
+                else:
+                    value = float(value)
+                setattr(options, name, value)
+        return options
+
+
+def render_resume_page(options: MockOptions, rng: random.Random) -> str:
+    """
+    生成简历编辑页面
+
+    Args:
+        options: 行为参数
+        rng: 随机数生成器
+
+    Returns:
+        str: 页面 HTML
+    """
+    sections = []
+    script = {'late': [], 'collapsed': {}, 'rerender': int(options.rerender * 1000)}
+    absent = []
+    for step_name, step in field_catalog.FIELD_CATALOG.items():
+        expand = step.get('expand_selector')
+        button_class = re.search(r'\.([\w-]+)', expand).group(1) if expand and options.collapsed else None
+
+        visible = []
+        collapsed = []
+        for index, field in enumerate(step['fields']):
+            key = f"{field['config_section']}.{field['config_key']}"
+            if rng.random() < options.absent:
+                absent.append(key)
+                continue
+            alternative = rng.choice([part.strip() for part in field['selector'].split(',')])
+            element = f'<label>{html.escape(key)} {render_field(alternative, f"{step_name}-{index}")}</label>'
+            if button_class:
+                collapsed.append(element)
+            elif rng.random() < options.late:
+                script['late'].append({'step': step_name, 'html': element,
+                                       'delay': int(rng.uniform(0.1, options.late_delay) * 1000)})
+            else:
+                visible.append(element)
+
+        button = f'<button type="button" class="{button_class}">添加{step["title"]}</button>' if button_class else ''
+        if collapsed:
+            script['collapsed'][step_name] = "".join(collapsed)
+        elif button_class:
+            button = ''
+        sections.append(f'<section data-step="{step_name}"><h2>{step["title"]}</h2>{button}'
+                        f'<div class="fields">{"".join(visible)}</div></section>')
+
+    # 字段 HTML 嵌在脚本中，转义 </ 以免提前结束 <script>
+    script_data = json.dumps(script, ensure_ascii=False).replace('</', '<\\/')
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>模拟简历编辑</title>'
+        f'<meta name="mock-absent" content="{html.escape(",".join(absent))}"></head><body>'
+        '<div class="user-nav">模拟用户</div>'
+        f'<form id="resume-form">{"".join(sections)}</form>'
+        f'<script>{_PAGE_SCRIPT % script_data}</script>'
+        '</body></html>'
+    )
+
+
+class _MockHandler(http.server.BaseHTTPRequestHandler):
+    """模拟站点的请求处理器"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        site = self.server
+        options = site.options.override(urllib.parse.parse_qs(url.query))
+        request_no = next(site.requests)
+        rng = random.Random(f"{options.seed}:{request_no}" if options.seed is not None else None)
+
+        if url.path == RESUME_PATH:
+            body = render_resume_page(options, rng)
+        elif url.path == '/':
+            body = (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>模拟招聘网站</title></head>'
+                    f'<body><div class="user-nav">模拟用户</div><a href="{RESUME_PATH}">编辑简历</a></body></html>')
+        else:
+            self.send_error(404)
+            return
+
+        time.sleep(options.latency + rng.uniform(0, options.jitter))
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockSite(http.server.ThreadingHTTPServer):
+    """模拟招聘网站服务器"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, options: MockOptions = None):
+        """
+        Args:
+            host: 监听地址
+            port: 监听端口，0 表示自动选择
+            options: 默认行为参数
+        """
+        super().__init__((host, port), _MockHandler)
+        self.options = options or MockOptions()
+        self.requests = itertools.count(1)
+        self._thread = None
+
+    @property
+    def resume_url(self) -> str:
+        """简历编辑页面的URL"""
+        return f"http://{self.server_address[0]}:{self.server_address[1]}{RESUME_PATH}"
+
+    def start(self) -> str:
+        """在后台线程中运行，返回简历编辑页面的URL"""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-site", daemon=True)
+        self._thread.start()
+        return self.resume_url
+
+    def stop(self):
+        """停止服务器"""
+        self.shutdown()
+        self.server_close()
+
+
+def run_load(url: str, concurrency: int = 4, jobs: int = 20, profile: str = None,
+             headless: bool = True, incremental: bool = False, fetch_only: bool = False) -> dict:
+    """
+    压测：多个填充器并发填充同一页面
+
+    每个并发线程使用一个填充器（一个浏览器），依次领取任务，直到完成 jobs 个任务
+
+    Args:
+        url: 要填充的页面
+        concurrency: 并发填充器数量
+        jobs: 任务总数
+        profile: 填充使用的档案
+        headless: 是否无头模式运行浏览器
+        incremental: 是否使用增量填充
+        fetch_only: 只请求页面不启动浏览器，用于单独测量服务端延迟
+
+    Returns:
+        dict: {jobs, concurrency, succeeded, failed, elapsed, throughput_per_minute, p50, p95, p99, filled, not_found}
+    """
+    # 与任务服务使用相同的分位数算法
+    from job_service import percentile
+
+    tickets = iter(range(jobs))
+    tickets_lock = threading.Lock()
+    results = []
+    results_lock = threading.Lock()
+
+    def next_ticket() -> bool:
+        with tickets_lock:
+            return next(tickets, None) is not None
+
+    def fetch_worker():
+        while next_ticket():
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url) as response:
+                    response.read()
+                result = {'ok': True, 'filled': 0, 'not_found': 0}
+            except Exception as e:
+                print(f"[错误] 请求失败: {e}")
+                result = {'ok': False, 'filled': 0, 'not_found': 0}
+            result['seconds'] = time.perf_counter() - started
+            with results_lock:
+                results.append(result)
+
+    def fill_worker():
+        import config_manager
+        import zhipin_filler
+
+        # 每个线程使用独立的配置管理器
+        filler = zhipin_filler.ZhipinFiller(profile=profile, use_session_cache=False, interactive=False,
+                                            headless=headless, incremental=incremental,
+                                            config=config_manager.create_manager(profile))
+        missing = filler.missing_required_keys()
+        if missing:
+            print(f"[错误] 缺少必填配置: {', '.join(missing)}")
+            return
+        if not filler.browser.start_browser():
+            return
+        try:
+            while next_ticket():
+                started = time.perf_counter()
+                try:
+                    opened = filler.fill_specific_page(url)
+                    stats = filler.fill_stats
+                    result = {'ok': opened and not stats['failed'], 'filled': len(stats['filled']),
+                              'not_found': len(stats['not_found'])}
+                except Exception as e:
+                    print(f"[错误] 填充失败: {e}")
+                    result = {'ok': False, 'filled': 0, 'not_found': 0}
+                result['seconds'] = time.perf_counter() - started
+                with results_lock:
+                    results.append(result)
+        finally:
+            filler.browser.close_browser()
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=fetch_worker if fetch_only else fill_worker, name=f"load-{index}")
+               for index in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    times = [result['seconds'] for result in results]
+    succeeded = sum(1 for result in results if result['ok'])
+    return {
+        'jobs': len(results),
+        'concurrency': concurrency,
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'elapsed': round(elapsed, 3),
+        'throughput_per_minute': round(len(results) / elapsed * 60, 3) if elapsed else 0.0,
+        'p50': percentile(times, 0.5),
+        'p95': percentile(times, 0.95),
+        'p99': percentile(times, 0.99),
+        'filled': sum(result['filled'] for result in results),
+        'not_found': sum(result['not_found'] for result in results),
+    }
+
+
+def print_load_report(report: dict):
+    """打印压测结果"""
+    print("\n=== 压测结果 ===")
+    print(f"任务: {report['jobs']} (成功 {report['succeeded']}, 失败 {report['failed']})  并发: {report['concurrency']}")
+    print(f"总耗时: {report['elapsed']}s  吞吐量: {report['throughput_per_minute']} 个/分钟")
+    print(f"填充耗时: p50 {report['p50']}s  p95 {report['p95']}s  p99 {report['p99']}s")
+    print(f"已填充字段: {report['filled']}  未找到字段: {report['not_found']}")
+    print("==================\n")
+
+
+def options_from_args(args) -> MockOptions:
+    """从命令行参数构造行为参数"""
+    return MockOptions(latency=args.latency, jitter=args.jitter, late=args.late, late_delay=args.late_delay,
+                       rerender=args.rerender, absent=args.absent, collapsed=args.collapsed, seed=args.seed)
+
+
+def main(argv: list = None) -> int:
+    """命令行入口: python mock_site.py [--port 端口] [行为参数]，等价于 python cli.py mock serve"""
+    import cli
+
+    return cli.main(['mock', 'serve', *(sys.argv[1:] if argv is None else argv)])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多候选人档案存储
+基于 SQLite 保存多个候选人的配置信息，支持 JSON/CSV 批量导入导出
+"""
+
+import configparser
+import csv
+import json
+import sqlite3
+import threading
+import time
+
+
+class ProfileStore:
+    """档案存储 - 以 (档案, 节, 键) 为主键保存配置值"""
+
+    def __init__(self, db_file: str = "profiles.db"):
+        """
+        初始化档案存储
+
+        Args:
+            db_file: SQLite 数据库文件路径
+        """
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, timeout=30, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # 同一连接可能被多个线程共享，写事务需要串行
+        self._lock = threading.RLock()
+        self._create_tables()
+
+    def _create_tables(self):
+        """创建档案表和配置项表"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                name TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                profile TEXT NOT NULL,
+                section TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (profile, section, key)
+            ) WITHOUT ROWID;
+        """)
+
+    def list_profiles(self) -> list:
+        """返回所有档案名称"""
+        return [row[0] for row in self.conn.execute("SELECT name FROM profiles ORDER BY name")]
+
+    def has_profile(self, name: str) -> bool:
+        """判断档案是否存在"""
+        row = self.conn.execute("SELECT 1 FROM profiles WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def profile_version(self, name: str):
+        """
+        返回档案最后一次修改的时间，用于判断档案是否被其他进程修改
+
+        Returns:
+            float 或 None: 档案不存在时返回 None
+        """
+        row = self.conn.execute("SELECT updated_at FROM profiles WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def load_profile(self, name: str) -> dict:
+        """
+        一次性读取整个档案
+
+        Args:
+            name: 档案名称
+
+        Returns:
+            dict: {节名: {键名: 值}}
+        """
+        data = {}
+        rows = self.conn.execute(
+            "SELECT section, key, value FROM entries WHERE profile = ?", (name,))
+        for section, key, value in rows:
+            items = data.setdefault(section, {})
+            if key:  # 空键是空节的占位记录
+                items[key] = value
+        return data
+
+    def save_profile(self, name: str, data: dict):
+        """
+        整体覆盖保存一个档案（单个事务）
+
+        Args:
+            name: 档案名称
+            data: {节名: {键名: 值}}，值为空字典的节也会保留
+        """
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM entries WHERE profile = ?", (name,))
+            self._upsert(name, data)
+
+    def set_values(self, name: str, data: dict):
+        """
+        批量写入配置项，不影响档案中的其他配置（单个事务）
+
+        Args:
+            name: 档案名称
+            data: {节名: {键名: 值}}
+        """
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            self._upsert(name, data)
+
+    def set_value(self, name: str, section: str, key: str, value: str):
+        """写入单个配置项"""
+        self.set_values(name, {section: {key: value}})
+
+    def delete_profile(self, name: str) -> bool:
+        """
+        删除档案及其全部配置
+
+        Returns:
+            bool: 档案是否存在
+        """
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM entries WHERE profile = ?", (name,))
+            cursor = self.conn.execute("DELETE FROM profiles WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def _upsert(self, name: str, data: dict):
+        """在当前事务中写入档案记录和配置项"""
+        now = time.time()
+        self.conn.execute("""
+            INSERT INTO profiles (name, created_at, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET updated_at = excluded.updated_at
+        """, (name, now, now))
+        # 空节用一个占位键记录，保证节在读取时依然存在
+        rows = []
+        for section, items in data.items():
+            if not items:
+                rows.append((name, section, '', ''))
+            for key, value in items.items():
+                rows.append((name, section, key, str(value)))
+        self.conn.executemany(
+            "REPLACE INTO entries (profile, section, key, value) VALUES (?, ?, ?, ?)", rows)
+
+    def export_json(self, path: str, names: list = None) -> int:
+        """
+        导出档案到 JSON 文件
+
+        Args:
+            path: 输出文件路径
+            names: 要导出的档案，默认全部
+
+        Returns:
+            int: 导出的档案数
+        """
+        names = names or self.list_profiles()
+        payload = {name: self.load_profile(name) for name in names}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        return len(payload)
+
+    def import_json(self, path: str) -> int:
+        """
+        从 JSON 文件导入档案，格式为 {档案: {节: {键: 值}}}，同名档案会被覆盖
+
+        Returns:
+            int: 导入的档案数
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            for name, data in payload.items():
+                self.conn.execute("DELETE FROM entries WHERE profile = ?", (name,))
+                self._upsert(name, data)
+        return len(payload)
+
+    def export_csv(self, path: str, names: list = None) -> int:
+        """
+        导出档案到 CSV 文件，每行为 profile,section,key,value
+
+        Returns:
+            int: 导出的行数
+        """
+        names = names or self.list_profiles()
+        count = 0
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['profile', 'section', 'key', 'value'])
+            for name in names:
+                rows = self.conn.execute(
+                    "SELECT profile, section, key, value FROM entries WHERE profile = ? AND key != '' "
+                    "ORDER BY section, key", (name,))
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+        return count
+
+    def import_csv(self, path: str) -> int:
+        """
+        从 CSV 文件批量导入配置项（流式读取，单个事务），已有配置项会被覆盖
+
+        Returns:
+            int: 导入的行数
+        """
+        count = 0
+        with open(path, 'r', encoding='utf-8', newline='') as f, self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            seen = set()
+            for row in csv.DictReader(f):
+                name = row['profile']
+                if name not in seen:
+                    self._upsert(name, {})
+                    seen.add(name)
+                self.conn.execute(
+                    "REPLACE INTO entries (profile, section, key, value) VALUES (?, ?, ?, ?)",
+                    (name, row['section'], row['key'], row['value']))
+                count += 1
+        return count
+
+    def import_ini(self, name: str, config_file: str = "config.ini"):
+        """
+        把旧的单人 config.ini 迁移为一个档案
+
+        Args:
+            name: 新档案名称
+            config_file: ini 配置文件路径
+        """
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(config_file, encoding='utf-8')
+        self.save_profile(name, {section: dict(config.items(section)) for section in config.sections()})
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按域名限速的调度器
+基于 SQLite 的令牌桶，在多个进程和标签页之间共享访问频率限制，避免触发反爬机制
+"""
+
+import os
+import random
+import sqlite3
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+
+# 优先级通道，数值越小越先获得令牌
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# 命令行和任务接口中使用的通道名称
+PRIORITY_NAMES = {'high': PRIORITY_HIGH, 'normal': PRIORITY_NORMAL, 'low': PRIORITY_LOW}
+
+
+class RateLimiter:
+    """跨进程共享的令牌桶限速器，按域名分别计数"""
+
+    def __init__(self, db_file: str = "rate_limits.db", rate: float = 0.5, burst: int = 3,
+                 jitter: float = 0.5, domain_rates: dict = None, poll_interval: float = 0.05):
+        """
+        初始化限速器
+
+        Args:
+            db_file: 共享状态的 SQLite 文件，所有使用同一文件的进程共用限额
+            rate: 默认每秒发放的令牌数
+            burst: 令牌桶容量，即允许的突发请求数
+            jitter: 获得令牌后额外随机等待的最大秒数，打散请求节奏
+            domain_rates: 按域名覆盖的 (rate, burst)，如 {'zhipin.com': (0.3, 2)}
+            poll_interval: 排队时的轮询间隔（秒）
+        """
+        self.db_file = db_file
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.domain_rates = domain_rates or {}
+        self.poll_interval = poll_interval
+        self.conn = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        """创建令牌桶、排队和统计表"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                domain TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS waiters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                domain TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                pid INTEGER NOT NULL,
+                seen_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_waiters_domain ON waiters (domain, priority, id);
+            CREATE TABLE IF NOT EXISTS metrics (
+                domain TEXT PRIMARY KEY,
+                acquired INTEGER NOT NULL DEFAULT 0,
+                total_wait REAL NOT NULL DEFAULT 0,
+                max_wait REAL NOT NULL DEFAULT 0
+            );
+        """)
+
+    def _limits_for(self, domain: str) -> tuple:
+        """返回域名对应的 (rate, burst)，子域名沿用上级域名的设置"""
+        parts = domain.split('.')
+        for i in range(len(parts) - 1):
+            limits = self.domain_rates.get('.'.join(parts[i:]))
+            if limits:
+                return limits
+        return self.rate, self.burst
+
+    def acquire(self, domain: str, priority: int = PRIORITY_NORMAL,
+                timeout: Optional[float] = None) -> float:
+        """
+        获取一个令牌，必要时排队等待
+
+        Args:
+            domain: 目标域名
+            priority: 优先级通道，高优先级的排队者先获得令牌
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            float: 实际等待的秒数（含随机抖动）
+
+        Raises:
+            TimeoutError: 超过 timeout 仍未获得令牌
+        """
+        rate, burst = self._limits_for(domain)
+        started = time.time()
+        waiter_id = self.conn.execute(
+            "INSERT INTO waiters (domain, priority, pid, seen_at) VALUES (?, ?, ?, ?)",
+            (domain, priority, os.getpid(), started)).lastrowid
+
+        try:
+            while True:
+                delay = self._try_take(domain, waiter_id, priority, rate, burst, started)
+                if delay is None:
+                    break
+                if timeout is not None and time.time() - started + delay > timeout:
+                    raise TimeoutError(f"等待 {domain} 的访问令牌超时")
+                # 分段睡眠，保持排队记录的活跃时间不被当作崩溃进程清理
+                time.sleep(min(max(delay, self.poll_interval), 1.0))
+        finally:
+            self.conn.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+        return time.time() - started
+
+    def _try_take(self, domain: str, waiter_id: int, priority: int, rate: float, burst: int,
+                  started: float) -> Optional[float]:
+        """
+        尝试取走一个令牌
+
+        Returns:
+            None 表示已获得令牌，否则为建议的等待秒数
+        """
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            cursor = self.conn.execute("UPDATE waiters SET seen_at = ? WHERE id = ?", (now, waiter_id))
+            if not cursor.rowcount:
+                # 排队记录被误清理（如进程长时间挂起），按原顺序重新登记
+                self.conn.execute(
+                    "INSERT INTO waiters (id, domain, priority, pid, seen_at) VALUES (?, ?, ?, ?, ?)",
+                    (waiter_id, domain, priority, os.getpid(), now))
+            # 清理已崩溃进程遗留的排队记录，避免永久阻塞其他进程
+            self.conn.execute("DELETE FROM waiters WHERE seen_at < ?", (now - 30,))
+
+            head = self.conn.execute(
+                "SELECT id FROM waiters WHERE domain = ? ORDER BY priority, id LIMIT 1",
+                (domain,)).fetchone()
+            if head['id'] != waiter_id:
+                return self.poll_interval
+
+            row = self.conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE domain = ?", (domain,)).fetchone()
+            tokens = burst if row is None else min(burst, row['tokens'] + (now - row['updated_at']) * rate)
+            if tokens < 1:
+                self.conn.execute(
+                    "REPLACE INTO buckets (domain, tokens, updated_at) VALUES (?, ?, ?)",
+                    (domain, tokens, now))
+                return (1 - tokens) / rate
+
+            waited = now - started
+            self.conn.execute(
+                "REPLACE INTO buckets (domain, tokens, updated_at) VALUES (?, ?, ?)",
+                (domain, tokens - 1, now))
+            self.conn.execute("""
+                INSERT INTO metrics (domain, acquired, total_wait, max_wait) VALUES (?, 1, ?, ?)
+                ON CONFLICT(domain) DO UPDATE SET
+                    acquired = acquired + 1,
+                    total_wait = total_wait + excluded.total_wait,
+                    max_wait = MAX(max_wait, excluded.max_wait)
+            """, (domain, waited, waited))
+            return None
+
+    def acquire_for_url(self, url: str, priority: int = PRIORITY_NORMAL,
+                        timeout: Optional[float] = None) -> float:
+        """
+        按URL的域名获取令牌，无法解析域名时不限速
+
+        Args:
+            url: 目标URL
+            priority: 优先级通道
+            timeout: 最长等待秒数
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        domain = urlparse(url).hostname
+        if not domain:
+            return 0.0
+        return self.acquire(domain, priority, timeout)
+
+    def get_metrics(self) -> dict:
+        """
+        获取各域名的排队深度和等待时间统计
+
+        Returns:
+            dict: 域名 -> {queue_depth, queue_by_priority, acquired, avg_wait, max_wait}
+        """
+        metrics = {}
+        for row in self.conn.execute("SELECT * FROM metrics"):
+            metrics[row['domain']] = {
+                'queue_depth': 0,
+                'queue_by_priority': {},
+                'acquired': row['acquired'],
+                'avg_wait': round(row['total_wait'] / row['acquired'], 3) if row['acquired'] else 0.0,
+                'max_wait': round(row['max_wait'], 3),
+            }
+
+        rows = self.conn.execute(
+            "SELECT domain, priority, COUNT(*) AS n FROM waiters GROUP BY domain, priority")
+        for row in rows:
+            entry = metrics.setdefault(row['domain'], {
+                'queue_depth': 0, 'queue_by_priority': {}, 'acquired': 0,
+                'avg_wait': 0.0, 'max_wait': 0.0,
+            })
+            entry['queue_depth'] += row['n']
+            entry['queue_by_priority'][row['priority']] = row['n']
+        return metrics
+
+    def show_metrics(self):
+        """显示限速统计信息"""
+        print("\n=== 访问限速统计 ===")
+        for domain, m in self.get_metrics().items():
+            print(f"{domain}: 排队 {m['queue_depth']}  已放行 {m['acquired']}  "
+                  f"平均等待 {m['avg_wait']}s  最长等待 {m['max_wait']}s")
+        print("==================\n")
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
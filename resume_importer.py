@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+简历文件导入
+流式读取本地简历（PDF/DOCX/Markdown/纯文本），用规则提取姓名、联系方式、教育背景、
+专业技能和项目经验，一次性批量写入档案，新候选人无需逐项回答填充时的提问
+"""
+
+import argparse
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+
+import config_manager
+import profile_store
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf 为可选依赖，缺失时尝试 pdfminer.six
+    PdfReader = None
+
+try:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+except ImportError:  # pdfminer.six 为可选依赖
+    extract_pages = None
+
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.md', '.markdown', '.txt')
+
+_DOCX_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MARKDOWN_PREFIX_RE = re.compile(r'^\s*(?:#{1,6}|[-*+>]|\d+\.)\s+')
+_MARKDOWN_INLINE_RE = re.compile(r'\*\*|__|`')
+
+_EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+_PHONE_RE = re.compile(r'(?<!\d)(?:\+?86[- ]?)?(1[3-9]\d(?:[- ]?\d{4}){2})(?!\d)')
+_SCHOOL_RE = re.compile(r'[一-龥]{2,20}(?:大学|学院|学校)')
+_YEAR_RANGE_RE = re.compile(
+    r'((?:19|20)\d{2})(?:[./\-年]\d{1,2}月?)?\s*[-~至–—]+\s*((?:19|20)\d{2}|至今|今)')
+_NAME_RE = re.compile(r'^[一-龥·]{2,5}$')
+
+# 带标签的字段，如 "姓名：张三  电话：13800138000"
+_LABEL_RE = re.compile(
+    r'(姓名|手机号?|电话|邮箱|电子邮箱|毕业院校|院校|学校|专业|学历|毕业时间|毕业年份)\s*[:：]\s*'
+    r'([^\s|｜,，;；]+)')
+_LABEL_FIELDS = {
+    '姓名': 'name', '手机': 'phone', '手机号': 'phone', '电话': 'phone',
+    '邮箱': 'email', '电子邮箱': 'email', '毕业院校': 'school', '院校': 'school', '学校': 'school',
+    '专业': 'major', '学历': 'degree', '毕业时间': 'graduation_year', '毕业年份': 'graduation_year',
+}
+
+# 区块标题: 区块名称 -> 标题正则
+_SECTION_HEADINGS = [
+    ('education', r'教育(?:背景|经历)|学历'),
+    ('skills', r'(?:专业|个人)?技能(?:特长)?|技术栈'),
+    ('projects', r'项目(?:经验|经历)'),
+    ('work', r'工作(?:经验|经历)|实习经历'),
+    ('other', r'自我评价|个人(?:简介|总结)|证书|荣誉奖项|获奖情况'),
+]
+_HEADING_RES = [
+    (name, re.compile(r'(?:[一二三四五六七八九十\d]+[、.]\s*)?(?:' + pattern + r')\s*[:：]?'))
+    for name, pattern in _SECTION_HEADINGS
+]
+
+# 学历从高到低，同义词映射为配置中使用的写法
+_DEGREES = [('博士', '博士'), ('硕士', '硕士'), ('研究生', '硕士'), ('本科', '本科'), ('学士', '本科'),
+            ('大专', '大专'), ('专科', '大专')]
+
+# 提取结果 -> (配置节, 配置键)，与 field_catalog 中的字段一致
+FIELD_MAPPING = {
+    'name': ('PersonalInfo', 'name'),
+    'phone': ('PersonalInfo', 'phone'),
+    'email': ('PersonalInfo', 'email'),
+    'school': ('Education', 'school_name'),
+    'major': ('Education', 'major'),
+    'degree': ('Education', 'degree'),
+    'graduation_year': ('Education', 'graduation_year'),
+    'skills': ('Others', 'professional_skills'),
+    'projects': ('Others', 'project_experience'),
+}
+
+
+def iter_lines(path: str):
+    """
+    按行流式读取简历文本，不把整个文件载入内存
+
+    Args:
+        path: 简历文件路径
+
+    Yields:
+        str: 去掉首尾空白的文本行（可能为空行）
+    """
+    lower = path.lower()
+    if lower.endswith('.docx'):
+        yield from _iter_docx_lines(path)
+    elif lower.endswith('.pdf'):
+        yield from _iter_pdf_lines(path)
+    else:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                yield _MARKDOWN_INLINE_RE.sub('', _MARKDOWN_PREFIX_RE.sub('', line)).strip()
+
+
+def _iter_docx_lines(path: str):
+    """逐段解析 word/document.xml，每处理完一段即释放该段的节点"""
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as f:
+        parts = []
+        for _, element in ET.iterparse(f, events=('end',)):
+            if element.tag == _DOCX_NS + 't':
+                parts.append(element.text or '')
+            elif element.tag in (_DOCX_NS + 'tab', _DOCX_NS + 'br'):
+                parts.append(' ')
+            elif element.tag == _DOCX_NS + 'p':
+                yield ''.join(parts).strip()
+                parts = []
+                element.clear()
+
+
+def _iter_pdf_lines(path: str):
+    """逐页提取 PDF 文本，优先使用 pypdf，其次 pdfminer.six"""
+    if PdfReader is not None:
+        for page in PdfReader(path).pages:
+            for line in (page.extract_text() or '').splitlines():
+                yield line.strip()
+    elif extract_pages is not None:
+        for page_layout in extract_pages(path):
+            for element in page_layout:
+                if isinstance(element, LTTextContainer):
+                    for line in element.get_text().splitlines():
+                        yield line.strip()
+    else:
+        raise RuntimeError("读取 PDF 需要安装 pypdf 或 pdfminer.six")
+
+
+def _section_of(line: str):
+    """判断一行是否为区块标题，是则返回区块名称"""
+    if len(line) > 12:
+        return None
+    for name, pattern in _HEADING_RES:
+        if pattern.fullmatch(line):
+            return name
+    return None
+
+
+def extract_fields(lines) -> dict:
+    """
+    按规则从简历文本中提取字段（单次遍历）
+
+    Args:
+        lines: 文本行的可迭代对象
+
+    Returns:
+        dict: {字段名: 值}，字段名见 FIELD_MAPPING，未识别的字段不包含在结果中
+    """
+    fields = {}
+    section = None
+    section_lines = {'skills': [], 'projects': []}
+    education_lines = []
+    leading_lines = []   # 第一个区块标题之前的行，姓名通常在这里
+    graduation_years = []
+
+    for line in lines:
+        if not line:
+            continue
+        heading = _section_of(line)
+        if heading:
+            section = heading
+            continue
+
+        if section is None and len(leading_lines) < 5:
+            leading_lines.append(line)
+        if section in section_lines:
+            section_lines[section].append(line)
+        if section == 'education':
+            education_lines.append(line)
+            graduation_years.extend(end for _, end in _YEAR_RANGE_RE.findall(line) if end[0].isdigit())
+
+        for label, value in _LABEL_RE.findall(line):
+            fields.setdefault(_LABEL_FIELDS[label], value)
+        if 'email' not in fields:
+            match = _EMAIL_RE.search(line)
+            if match:
+                fields['email'] = match.group(0)
+        if 'phone' not in fields:
+            match = _PHONE_RE.search(line)
+            if match:
+                fields['phone'] = re.sub(r'[- ]', '', match.group(1))
+
+    if 'name' not in fields:
+        for line in leading_lines:
+            candidate = re.sub(r'(?:的)?(?:个人)?简历$', '', line.split()[0])
+            if _NAME_RE.match(candidate):
+                fields['name'] = candidate
+                break
+
+    _extract_education(fields, education_lines, graduation_years)
+
+    for key in ('skills', 'projects'):
+        if section_lines[key]:
+            fields[key] = "\n".join(section_lines[key])
+
+    if 'phone' in fields:
+        fields['phone'] = re.sub(r'[-\s]', '', fields['phone'])
+    if 'graduation_year' in fields:
+        year = re.search(r'(?:19|20)\d{2}', fields['graduation_year'])
+        if year:
+            fields['graduation_year'] = year.group(0)
+    if 'degree' in fields:
+        fields['degree'] = _normalize_degree(fields['degree']) or fields['degree']
+    return fields
+
+
+def _extract_education(fields: dict, education_lines: list, graduation_years: list):
+    """从教育经历区块中补充学校、专业、学历和毕业年份"""
+    if 'school' not in fields:
+        for line in education_lines:
+            match = _SCHOOL_RE.search(line)
+            if match:
+                fields['school'] = match.group(0)
+                break
+
+    if 'degree' not in fields:
+        text = " ".join(education_lines)
+        degree = _normalize_degree(text)
+        if degree:
+            fields['degree'] = degree
+
+    if 'major' not in fields and 'school' in fields:
+        # 常见写法: "北京大学 | 计算机科学与技术 | 本科 | 2016.09-2020.06"
+        for line in education_lines:
+            if fields['school'] not in line:
+                continue
+            for token in re.split(r'[\s|｜/、,，]+', line.replace(fields['school'], ' ')):
+                if (re.search(r'[一-龥]', token) and not re.search(r'\d', token)
+                        and not _normalize_degree(token) and token not in ('至今', '今')):
+                    fields['major'] = token
+                    break
+            break
+
+    if 'graduation_year' not in fields and graduation_years:
+        fields['graduation_year'] = max(graduation_years)
+
+
+def _normalize_degree(text: str) -> str:
+    """返回文本中出现的最高学历，没有时返回空字符串"""
+    for keyword, degree in _DEGREES:
+        if keyword in text:
+            return degree
+    return ""
+
+
+def parse_resume(path: str) -> dict:
+    """
+    解析简历文件
+
+    Args:
+        path: 简历文件路径
+
+    Returns:
+        dict: {节名: {键名: 值}}，可直接写入档案
+    """
+    data = {}
+    for field, value in extract_fields(iter_lines(path)).items():
+        section, key = FIELD_MAPPING[field]
+        data.setdefault(section, {})[key] = value
+    return data
+
+
+def iter_resume_files(paths: list):
+    """展开文件和目录，返回所有支持格式的简历文件路径"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith('~$'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def _drop_existing(data: dict, existing: dict) -> dict:
+    """去掉档案中已经有值的配置项"""
+    result = {}
+    for section, items in data.items():
+        kept = {key: value for key, value in items.items() if not existing.get(section, {}).get(key)}
+        if kept:
+            result[section] = kept
+    return result
+
+
+def import_resume(path: str, config: config_manager.ConfigManager, overwrite: bool = False) -> dict:
+    """
+    解析一份简历并写入指定的配置（一次批量保存）
+
+    Args:
+        path: 简历文件路径
+        config: 目标配置管理器
+        overwrite: 是否覆盖已有的配置值，默认只补充空缺的配置项
+
+    Returns:
+        dict: 实际写入的 {节名: {键名: 值}}
+    """
+    data = parse_resume(path)
+    if not overwrite:
+        existing = {section: {key: config.get_config_value(section, key) for key in items}
+                    for section, items in data.items()}
+        data = _drop_existing(data, existing)
+    if data:
+        config.set_many(data)
+    return data
+
+
+def import_resumes(paths: list, store: profile_store.ProfileStore = None, overwrite: bool = False) -> list:
+    """
+    批量导入简历，每份简历写入以候选人姓名命名的档案（无法识别姓名时使用文件名）
+
+    Args:
+        paths: 简历文件或目录列表
+        store: 档案库实例，默认使用共享档案库
+        overwrite: 是否覆盖已有档案中的配置值
+
+    Returns:
+        list: 每份简历的 {file, profile, imported, error}
+    """
+    store = store or config_manager.get_profile_store()
+    results = []
+    for path in iter_resume_files(paths):
+        try:
+            data = parse_resume(path)
+            name = data.get('PersonalInfo', {}).get('name') or os.path.splitext(os.path.basename(path))[0]
+            if not overwrite and store.has_profile(name):
+                data = _drop_existing(data, store.load_profile(name))
+            store.set_values(name, data)
+            config_manager.forget_profile(name)
+            count = sum(len(items) for items in data.values())
+            results.append({'file': path, 'profile': name, 'imported': count, 'error': None})
+            print(f"[导入] {path} -> 档案 {name}: {count} 项")
+        except Exception as e:
+            results.append({'file': path, 'profile': None, 'imported': 0, 'error': str(e)})
+            print(f"[错误] 导入简历失败 {path}: {e}")
+    return results
+
+
+def main(argv: list = None) -> int:
+    """命令行入口: python resume_importer.py 简历文件或目录... [--dry-run] [--overwrite]"""
+    parser = argparse.ArgumentParser(description="从简历文件批量创建候选人档案")
+    parser.add_argument('paths', nargs='+', help="简历文件或目录")
+    parser.add_argument('--dry-run', action='store_true', help="只打印提取结果，不写入档案")
+    parser.add_argument('--overwrite', action='store_true', help="覆盖档案中已有的配置值")
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        for path in iter_resume_files(args.paths):
+            print(f"\n=== {path} ===")
+            for section, items in parse_resume(path).items():
+                for key, value in items.items():
+                    print(f"{section}.{key} = {value}")
+        return 0
+
+    results = import_resumes(args.paths, overwrite=args.overwrite)
+    return 1 if any(item['error'] for item in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+登录会话缓存
+把登录后的 Cookie、localStorage 和 sessionStorage 加密保存在本地，
+下次启动浏览器时恢复，会话有效时无需再次手动登录
+"""
+
+import json
+import os
+import re
+import time
+from typing import Optional
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # cryptography 为可选依赖，缺失时不缓存会话（不保存明文）
+    Fernet = None
+    InvalidToken = Exception
+
+try:
+    import keyring
+except ImportError:  # keyring 为可选依赖，缺失时密钥保存在仅本人可读的密钥文件中
+    keyring = None
+
+
+# 通过环境变量提供密钥时不会在磁盘上生成密钥文件
+KEY_ENV = "RESUME_FILLER_SESSION_KEY"
+
+# 安装 keyring 时密钥保存在系统钥匙串（macOS 钥匙串、Windows 凭据管理器、Secret Service）
+KEYRING_SERVICE = "resume-filler"
+KEYRING_USER = "session-key"
+
+
+class SessionCache:
+    """加密的会话缓存，每个 站点+账户 一个文件"""
+
+    def __init__(self, cache_dir: str = "sessions", max_age_days: int = 7):
+        """
+        初始化会话缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_age_days: 超过该天数的缓存视为过期
+        """
+        self.cache_dir = cache_dir
+        self.max_age = max_age_days * 86400
+        self._fernet = None
+
+        if Fernet is None:
+            print("[警告] 未安装 cryptography，登录会话将不会被缓存")
+            return
+        os.makedirs(cache_dir, exist_ok=True)
+        self._fernet = Fernet(self._load_key())
+
+    @property
+    def available(self) -> bool:
+        """是否可以使用会话缓存"""
+        return self._fernet is not None
+
+    def _load_key(self) -> bytes:
+        """
+        读取密钥，依次使用环境变量、系统钥匙串（需要 keyring）和密钥文件，
+        都不存在时生成新密钥
+        """
+        env_key = os.environ.get(KEY_ENV)
+        if env_key:
+            return env_key.encode('ascii')
+
+        key_file = os.path.join(self.cache_dir, ".key")
+        if keyring is not None:
+            try:
+                return self._load_keyring_key(key_file)
+            except Exception as e:
+                print(f"[警告] 系统钥匙串不可用，密钥将保存在 {key_file}: {e}")
+
+        if os.path.exists(key_file):
+            return self._read_key_file(key_file)
+
+        key = Fernet.generate_key()
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+
+    def _load_keyring_key(self, key_file: str) -> bytes:
+        """从系统钥匙串读取密钥，旧的密钥文件会被迁移到钥匙串后删除"""
+        stored = keyring.get_password(KEYRING_SERVICE, KEYRING_USER)
+        if stored:
+            return stored.encode('ascii')
+
+        # 沿用已有密钥文件中的密钥，已缓存的会话仍然可以解密
+        key = self._read_key_file(key_file) if os.path.exists(key_file) else Fernet.generate_key()
+        keyring.set_password(KEYRING_SERVICE, KEYRING_USER, key.decode('ascii'))
+        if os.path.exists(key_file):
+            os.remove(key_file)
+            print("[会话] 密钥已迁移到系统钥匙串")
+        return key
+
+    @staticmethod
+    def _read_key_file(key_file: str) -> bytes:
+        """读取密钥文件，权限过宽（其他用户可读）时收紧为仅本人可读写"""
+        if os.stat(key_file).st_mode & 0o077:
+            os.chmod(key_file, 0o600)
+            print(f"[警告] 密钥文件权限过宽，已修改为仅本人可读写: {key_file}")
+        with open(key_file, 'rb') as f:
+            return f.read().strip()
+
+    def _path(self, name: str) -> str:
+        """缓存文件路径，名称中的特殊字符会被替换"""
+        safe_name = re.sub(r'[^\w.-]', '_', name)
+        return os.path.join(self.cache_dir, f"{safe_name}.session")
+
+    def save(self, name: str, session: dict) -> bool:
+        """
+        加密保存会话
+
+        Args:
+            name: 缓存名称，通常为 站点_账户
+            session: BrowserEngine.export_session 的结果
+
+        Returns:
+            bool: 是否保存成功
+        """
+        if not self.available:
+            return False
+        try:
+            token = self._fernet.encrypt(json.dumps(session).encode('utf-8'))
+            path = self._path(name)
+            tmp_path = f"{path}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(token)
+            os.replace(tmp_path, path)
+            print(f"[会话] 已缓存登录状态: {name}")
+            return True
+        except Exception as e:
+            print(f"[错误] 缓存登录状态失败: {e}")
+            return False
+
+    def load(self, name: str) -> Optional[dict]:
+        """
+        读取并解密会话
+
+        Args:
+            name: 缓存名称
+
+        Returns:
+            dict 或 None: 缓存不存在、已过期或无法解密时返回 None
+        """
+        if not self.available:
+            return None
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                token = f.read()
+            session = json.loads(self._fernet.decrypt(token, ttl=self.max_age))
+            return session
+        except InvalidToken:
+            print(f"[会话] 缓存已过期或密钥不匹配: {name}")
+            self.delete(name)
+            return None
+        except Exception as e:
+            print(f"[错误] 读取登录状态失败: {e}")
+            return None
+
+    def delete(self, name: str):
+        """删除会话缓存"""
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+
+def drop_expired_cookies(cookies: list) -> list:
+    """去掉已过期的 Cookie"""
+    now = time.time()
+    return [cookie for cookie in cookies if not cookie.get('expiry') or cookie['expiry'] > now]
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+填充会话录制与回放
+录制浏览器引擎执行的每条命令及耗时，并在关键时刻保存DOM快照；
+回放时在本地启动静态服务器提供保存的页面，无需访问真实网站或登录账号即可复现和测速
+"""
+
+import functools
+import http.server
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+
+# 回放时去掉页面脚本，避免离线页面重新执行前端逻辑或跳转
+_SCRIPT_RE = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+
+class SessionRecorder:
+    """会话录制器 - 命令写入 commands.jsonl，DOM快照写入 pages/ 目录"""
+
+    def __init__(self, output_dir: str = "recordings"):
+        """
+        初始化录制器
+
+        Args:
+            output_dir: 录制文件的根目录，每次录制创建一个子目录
+        """
+        self.session_dir = os.path.join(
+            output_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}")
+        self.pages_dir = os.path.join(self.session_dir, "pages")
+        os.makedirs(self.pages_dir, exist_ok=True)
+
+        self._file = open(os.path.join(self.session_dir, "commands.jsonl"), 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._started = time.perf_counter()
+        print(f"[录制] 会话录制已开启: {self.session_dir}")
+
+    def record_command(self, command: str, args: dict, started: float, duration: float,
+                       result, error: str = None, snapshot: str = None):
+        """
+        记录一条命令
+
+        Args:
+            command: 命令名（BrowserEngine 的方法名）
+            args: 命令参数
+            started: 开始时间（perf_counter）
+            duration: 耗时（秒）
+            result: 返回值，元素对象会被记录为是否找到
+            error: 异常信息
+            snapshot: 命令执行后保存的快照文件名
+        """
+        if not isinstance(result, (bool, str, int, float, type(None))):
+            result = True
+        self._write({
+            'type': 'command',
+            'command': command,
+            'args': args,
+            'offset': round(started - self._started, 4),
+            'duration': round(duration, 4),
+            'result': result,
+            'error': error,
+            'snapshot': snapshot,
+        })
+
+    def record_snapshot(self, label: str, url: str, html: str) -> str:
+        """
+        保存一份DOM快照
+
+        Args:
+            label: 快照标签
+            url: 页面URL
+            html: 页面源码
+
+        Returns:
+            str: 快照文件名
+        """
+        with self._lock:
+            self._seq += 1
+            name = f"{self._seq:04d}.html"
+        with open(os.path.join(self.pages_dir, name), 'w', encoding='utf-8') as f:
+            f.write(_SCRIPT_RE.sub('', html))
+        self._write({
+            'type': 'snapshot',
+            'label': label,
+            'url': url,
+            'file': name,
+            'offset': round(time.perf_counter() - self._started, 4),
+        })
+        return name
+
+    def _write(self, event: dict):
+        """追加一条事件，每条立即落盘，崩溃时也能保留录制内容"""
+        with self._lock:
+            self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self):
+        """结束录制"""
+        with self._lock:
+            self._file.close()
+        print(f"[录制] 已保存: {self.session_dir}")
+
+
+def recorded(func):
+    """
+    BrowserEngine 方法装饰器：开启录制时记录调用参数、耗时和结果
+
+    只记录最外层调用（如 find_and_fill 内部的 find_element_safe 不单独记录）；
+    填充的值只记录长度，录制文件中不保存个人信息
+    """
+    arg_names = func.__code__.co_varnames[1:func.__code__.co_argcount]
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not self.recorder or self._record_depth:
+            return func(self, *args, **kwargs)
+
+        call_args = dict(zip(arg_names, args))
+        call_args.update(kwargs)
+        if 'value' in call_args:
+            call_args['value_length'] = len(str(call_args.pop('value')))
+        if 'by' in call_args:
+            call_args['by'] = str(call_args['by'])
+
+        self._record_depth += 1
+        started = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = func(self, *args, **kwargs)
+            return result
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            self._record_depth -= 1
+            snapshot = None
+            if func.__name__ == 'navigate_to' and result:
+                snapshot = self.record_snapshot('navigate')
+            self.recorder.record_command(func.__name__, call_args, started, duration,
+                                         result, error, snapshot)
+
+    return wrapper
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """不输出访问日志的静态文件处理器"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SessionReplayer:
+    """会话回放器 - 在本地静态服务器上重放录制的命令并对比耗时"""
+
+    def __init__(self, session_dir: str):
+        """
+        初始化回放器
+
+        Args:
+            session_dir: 录制目录（包含 commands.jsonl 和 pages/）
+        """
+        self.session_dir = session_dir
+        with open(os.path.join(session_dir, "commands.jsonl"), 'r', encoding='utf-8') as f:
+            self.events = [json.loads(line) for line in f if line.strip()]
+        self.results = []
+        self._server = None
+
+    def _start_server(self) -> str:
+        """启动本地静态服务器，返回页面根URL"""
+        handler = functools.partial(_QuietHandler, directory=os.path.join(self.session_dir, "pages"))
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}/"
+
+    def replay(self, browser) -> list:
+        """
+        回放录制的命令
+
+        Args:
+            browser: 已启动的 BrowserEngine 实例
+
+        Returns:
+            list: 每条命令的 {command, args, recorded, replayed, result}
+        """
+        base_url = self._start_server()
+        current_url = None
+        self.results = []
+        try:
+            for event in self.events:
+                if event['type'] == 'snapshot':
+                    # 导航快照由 navigate_to 命令加载；其余快照表示录制时页面发生了变化
+                    # （如用户手动跳转），回放时切换到对应快照
+                    if event['label'] != 'navigate' and event['url'] != current_url:
+                        browser.driver.get(base_url + event['file'])
+                        current_url = event['url']
+                    continue
+
+                command = event['command']
+                args = dict(event['args'])
+                if command == 'navigate_to':
+                    if not event.get('snapshot'):
+                        continue
+                    args['url'] = base_url + event['snapshot']
+                    current_url = event['args'].get('url')
+                if 'value_length' in args:
+                    args['value'] = 'x' * args.pop('value_length')
+
+                started = time.perf_counter()
+                result = getattr(browser, command)(**args)
+                replayed = time.perf_counter() - started
+                self.results.append({
+                    'command': command,
+                    'args': event['args'],
+                    'recorded': event['duration'],
+                    'replayed': round(replayed, 4),
+                    'result': bool(result),
+                    'recorded_result': event['result'],
+                })
+        finally:
+            self._server.shutdown()
+            self._server.server_close()
+        return self.results
+
+    def print_report(self):
+        """打印录制与回放的耗时对比"""
+        print("\n=== 会话回放报告 ===")
+        for item in self.results:
+            mismatch = "" if item['result'] == bool(item['recorded_result']) else "  [结果不一致]"
+            target = item['args'].get('selector') or item['args'].get('url', '')
+            print(f"{item['command']:<18} 录制 {item['recorded']:>7.3f}s  回放 {item['replayed']:>7.3f}s"
+                  f"  {target[:50]}{mismatch}")
+        recorded_total = sum(item['recorded'] for item in self.results)
+        replayed_total = sum(item['replayed'] for item in self.results)
+        print(f"合计: 录制 {recorded_total:.3f}s  回放 {replayed_total:.3f}s  命令数 {len(self.results)}")
+        print("==================\n")
+
+
+def main():
+    """命令行回放: python session_recorder.py <录制目录> [--headless]"""
+    # browser_engine 依赖本模块的装饰器，在函数内导入以避免循环导入
+    import browser_engine
+
+    if len(sys.argv) < 2:
+        print("用法: python session_recorder.py <录制目录> [--headless]")
+        return
+
+    replayer = SessionReplayer(sys.argv[1])
+    with browser_engine.create_browser(headless='--headless' in sys.argv) as browser:
+        if browser.start_browser():
+            replayer.replay(browser)
+            replayer.print_report()
+
+
+if __name__ == "__main__":
+    main()
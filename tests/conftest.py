@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""测试公共设置：模块位于仓库根目录，运行时生成的数据库和配置文件写入临时目录"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def _work_dir(tmp_path, monkeypatch):
+    """每个测试在独立的临时目录中运行，避免写入仓库中的 config.ini 等文件"""
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""命令行入口：配置读写、档案不存在和缺少配置时的退出码，以及 --json 输出"""
+
+import json
+import sys
+
+import pytest
+
+import profile_store
+
+
+@pytest.fixture
+def cli(tmp_path, monkeypatch):
+    # config_manager 导入时会在当前目录创建默认配置，放在测试的临时目录中导入；
+    # 全局的配置管理器和档案库在各测试之间共享，这里换成本测试目录中的实例
+    import cli
+    import config_manager
+
+    store = profile_store.ProfileStore(str(tmp_path / "profiles.db"))
+    monkeypatch.setattr(config_manager, '_config_manager', config_manager.ConfigManager())
+    monkeypatch.setattr(config_manager, '_profile_store', store)
+    monkeypatch.setattr(config_manager, '_profile_managers', {})
+    # 测试结束后恢复 cli 导入时记录的标准输出，run 中换成 pytest 捕获的输出
+    monkeypatch.setattr(cli, '_stdout', sys.stdout)
+    yield cli
+    store.close()
+
+
+def run(cli, capsys, *argv):
+    capsys.readouterr()
+    cli._stdout = sys.stdout
+    code = cli.main(list(argv))
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+def test_config_get_and_set(cli, capsys):
+    assert run(cli, capsys, 'config', 'get', 'PersonalInfo.name') == (cli.EXIT_OK, "张三\n", "")
+
+    code, _, _ = run(cli, capsys, 'config', 'set', 'WorkInfo.company', '某科技有限公司')
+    assert code == cli.EXIT_OK
+    assert run(cli, capsys, 'config', 'get', 'WorkInfo.company')[:2] == (cli.EXIT_OK, "某科技有限公司\n")
+
+    code, out, _ = run(cli, capsys, 'config', 'get', 'WorkInfo.position')
+    assert (code, out) == (cli.EXIT_NOT_FOUND, "未设置: WorkInfo.position\n")
+    assert run(cli, capsys, 'config', 'get', 'no_section')[0] == cli.EXIT_USAGE
+
+
+def test_unknown_profile_returns_not_found(cli, capsys):
+    code, out, _ = run(cli, capsys, 'config', 'get', 'PersonalInfo.name', '--profile', '不存在', '--json')
+    assert code == cli.EXIT_NOT_FOUND
+    assert json.loads(out) == {'ok': False, 'error': 'unknown_profile', 'profile': '不存在'}
+
+    code, _, _ = run(cli, capsys, 'config', 'set', 'PersonalInfo.name', '李四', '--profile', '不存在')
+    assert code == cli.EXIT_NOT_FOUND
+
+
+def test_config_set_create_profile(cli, capsys):
+    code, _, _ = run(cli, capsys, 'config', 'set', 'PersonalInfo.name', '李四', '--profile', '李四', '--create')
+    assert code == cli.EXIT_OK
+    code, out, _ = run(cli, capsys, 'config', 'get', 'PersonalInfo.name', '--profile', '李四')
+    assert (code, out) == (cli.EXIT_OK, "李四\n")
+    # 新档案不包含 config.ini 中的示例值
+    assert run(cli, capsys, 'config', 'get', 'PersonalInfo.phone', '--profile', '李四')[0] == cli.EXIT_NOT_FOUND
+
+
+def test_json_output_keeps_logs_on_stderr(cli, capsys):
+    code, out, err = run(cli, capsys, 'config', 'set', 'PersonalInfo.phone', '13900139000', '--json')
+    assert code == cli.EXIT_OK
+    assert json.loads(out) == {'ok': True, 'key': 'PersonalInfo.phone', 'value': '13900139000'}
+    assert "[保存] PersonalInfo.phone = 13900139000" in err
+
+    code, out, err = run(cli, capsys, 'config', 'get', 'PersonalInfo.phone', '--json')
+    assert len(out.splitlines()) == 1
+    assert json.loads(out)['value'] == '13900139000'
+
+
+def test_no_prompt_with_missing_config(cli, capsys):
+    # fill 需要加载浏览器引擎；未安装 selenium 时跳过
+    pytest.importorskip("selenium")
+    import config_manager
+
+    config_manager.get_profile_store().save_profile("王五", {'PersonalInfo': {'name': '王五'}})
+    code, out, _ = run(cli, capsys, 'fill', '--profile', '王五', '--no-prompt', '--json')
+    payload = json.loads(out)
+
+    assert code == cli.EXIT_MISSING_CONFIG
+    assert payload['error'] == 'missing_config'
+    assert 'PersonalInfo.phone' in payload['missing_keys']
+    assert 'PersonalInfo.name' not in payload['missing_keys']
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""共享配置快照：跨实例刷新、变更通知、快照文件复用和档案键名统一"""
+
+import os
+import time
+
+import pytest
+
+import config_snapshot
+import profile_store
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.ini"
+    path.write_text("[PersonalInfo]\nname = 张三\n", encoding='utf-8')
+    return str(path)
+
+
+def rewrite(config_file, text):
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_edit_is_picked_up_after_poll_interval(config_file):
+    writer = config_snapshot.SharedConfig(config_file, poll_interval=0)
+    reader = config_snapshot.SharedConfig(config_file, poll_interval=0.2)
+    assert reader.get('PersonalInfo', 'name') == '张三'
+
+    rewrite(config_file, "[PersonalInfo]\nname = 李四\nphone = 13800138000\n")
+    assert writer.get('PersonalInfo', 'name') == '李四'
+    # 未到检查间隔时继续使用旧快照，不做 stat
+    assert reader.get('PersonalInfo', 'name') == '张三'
+
+    time.sleep(0.25)
+    assert reader.get('PersonalInfo', 'name') == '李四'
+    assert reader.get('PersonalInfo', 'phone') == '13800138000'
+
+
+def test_subscribers_are_notified_once_per_change(config_file):
+    shared = config_snapshot.SharedConfig(config_file, poll_interval=0)
+    changes = []
+    shared.subscribe(lambda old, new: changes.append((old.get('PersonalInfo', 'name'),
+                                                      new.get('PersonalInfo', 'name'))))
+
+    assert not shared.refresh()
+    rewrite(config_file, "[PersonalInfo]\nname = 李四四\n")
+    assert shared.poll()
+    assert not shared.poll()
+    shared.get('PersonalInfo', 'name')
+    assert changes == [('张三', '李四四')]
+
+
+def test_snapshot_file_is_reused_while_signature_unchanged(config_file, monkeypatch):
+    first = config_snapshot.SharedConfig(config_file)
+    assert os.path.exists(first.snapshot_file)
+    written_at = os.stat(first.snapshot_file).st_mtime_ns
+
+    def fail_parse(self):
+        raise AssertionError("快照有效时不应重新解析配置")
+
+    monkeypatch.setattr(config_snapshot.SharedConfig, '_parse_source', fail_parse)
+    second = config_snapshot.SharedConfig(config_file)
+    assert second.get('PersonalInfo', 'name') == '张三'
+    assert second.snapshot.signature == first.snapshot.signature
+    assert os.stat(first.snapshot_file).st_mtime_ns == written_at
+
+
+def test_profile_snapshot_normalizes_keys(tmp_path):
+    store = profile_store.ProfileStore(str(tmp_path / "profiles.db"))
+    try:
+        store.save_profile("团队/张三", {'PersonalInfo': {'Name': '张三', 'PHONE': '13800138000'}})
+        shared = config_snapshot.SharedConfig(profile="团队/张三", store=store, poll_interval=0)
+
+        assert shared.get('PersonalInfo', 'name') == '张三'
+        assert shared.get('PersonalInfo', 'phone') == '13800138000'
+        assert os.path.dirname(shared.snapshot_file) == str(tmp_path)
+        assert os.path.exists(shared.snapshot_file)
+
+        store.set_value("团队/张三", 'PersonalInfo', 'Email', 'zs@example.com')
+        assert shared.refresh()
+        assert shared.get('PersonalInfo', 'email') == 'zs@example.com'
+    finally:
+        store.close()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""后台取证截图：内容寻址去重、DOM 快照压缩、队列满时丢弃最旧的截图"""
+
+import gzip
+import os
+import threading
+
+import pytest
+
+import evidence_capture
+
+
+PNG = b"\x89PNG\r\n\x1a\n fake image"
+
+
+@pytest.fixture
+def capture_dir(tmp_path):
+    return str(tmp_path / "captures")
+
+
+def read_index(capture_dir):
+    with open(os.path.join(capture_dir, "index.tsv"), encoding='utf-8') as f:
+        return [line.rstrip('\n').split('\t') for line in f]
+
+
+def test_identical_images_are_stored_once(capture_dir):
+    writer = evidence_capture.CaptureWriter(capture_dir, image_format='png')
+    writer.submit('after_personal', PNG)
+    writer.submit('after_work', PNG)
+    writer.submit('after_education', PNG + b" changed")
+    writer.close()
+
+    rows = read_index(capture_dir)
+    assert [row[1] for row in rows] == ['after_personal', 'after_work', 'after_education']
+    assert rows[0][2] == rows[1][2] != rows[2][2]
+    assert sorted(os.listdir(os.path.join(capture_dir, "objects"))) == sorted({rows[0][2], rows[2][2]})
+
+    # 已有的对象在新的写入器中同样会被复用
+    writer = evidence_capture.CaptureWriter(capture_dir, image_format='png')
+    writer.submit('again', PNG)
+    writer.close()
+    assert len(os.listdir(os.path.join(capture_dir, "objects"))) == 2
+
+
+def test_dom_snapshot_round_trips_through_gzip(capture_dir):
+    html = "<html><body><input name='姓名' value='张三'></body></html>"
+    writer = evidence_capture.CaptureWriter(capture_dir, image_format='png')
+    writer.submit('failed', PNG, dom_html=html, url="http://localhost/resume")
+    writer.close()
+
+    _, label, image_name, dom_name, url = read_index(capture_dir)[0]
+    assert (label, url) == ('failed', "http://localhost/resume")
+    assert image_name.endswith('.png') and dom_name.endswith('.html.gz')
+    with open(os.path.join(capture_dir, "objects", dom_name), 'rb') as f:
+        assert gzip.decompress(f.read()).decode('utf-8') == html
+
+
+def test_full_queue_drops_oldest(capture_dir, monkeypatch):
+    writer = evidence_capture.CaptureWriter(capture_dir, image_format='png', max_pending=2)
+    started = threading.Event()
+    release = threading.Event()
+    written = []
+
+    def slow_write(taken_at, label, png_bytes, dom_html, url):
+        started.set()
+        release.wait(5)
+        written.append(label)
+
+    monkeypatch.setattr(writer, '_write', slow_write)
+    writer.submit('first', PNG)
+    assert started.wait(5)  # 后台线程正在写入第一张，之后的截图留在队列中
+
+    for label in ('second', 'third', 'fourth'):
+        writer.submit(label, PNG)
+    release.set()
+    writer.close()
+
+    assert written == ['first', 'third', 'fourth']
+
+
+def test_close_flushes_index(capture_dir):
+    writer = evidence_capture.CaptureWriter(capture_dir, image_format='png')
+    for i in range(20):
+        writer.submit(f'step_{i}', PNG + bytes([i]))
+    writer.close()
+
+    assert not writer._worker.is_alive()
+    assert [row[1] for row in read_index(capture_dir)] == [f'step_{i}' for i in range(20)]
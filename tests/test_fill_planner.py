@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""离线填充规划：备选选择器按文档顺序匹配、标准库后备解析器和填充计划的各种结果"""
+
+import pytest
+
+
+CATALOG = {
+    'personal': {
+        'title': '个人基础信息',
+        'required': True,
+        'fields': [
+            {'selector': 'input[name="name"], input[placeholder*="姓名"]',
+             'config_section': 'PersonalInfo', 'config_key': 'name', 'prompt': ''},
+            {'selector': 'input[name="mobile"], input[placeholder*="手机"]',
+             'config_section': 'PersonalInfo', 'config_key': 'phone', 'prompt': ''},
+            {'selector': 'input[name="email"]',
+             'config_section': 'PersonalInfo', 'config_key': 'email', 'prompt': ''},
+        ],
+    },
+    'other': {
+        'title': '其他信息',
+        'required': False,
+        'fields': [
+            {'selector': 'textarea[name="advantage"]',
+             'config_section': 'Others', 'config_key': 'advantage', 'prompt': ''},
+        ],
+    },
+}
+
+
+class DictConfig:
+    """只提供 get_config_value 的配置"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get_config_value(self, section, key, default=""):
+        return self.data.get(section, {}).get(key, default)
+
+
+@pytest.fixture
+def fill_planner():
+    # config_manager 导入时会在当前目录创建默认配置，放在测试的临时目录中导入
+    import fill_planner
+    return fill_planner
+
+
+@pytest.fixture(params=['html.parser', 'lxml', 'selectolax'])
+def engine(request, fill_planner, monkeypatch):
+    """依次使用各个可用的解析器"""
+    if request.param == 'html.parser':
+        monkeypatch.setattr(fill_planner, 'SelectolaxParser', None)
+        monkeypatch.setattr(fill_planner, 'lxml', None)
+    elif request.param == 'lxml':
+        if fill_planner.lxml is None:
+            pytest.skip("未安装 lxml/cssselect")
+        monkeypatch.setattr(fill_planner, 'SelectolaxParser', None)
+    elif fill_planner.SelectolaxParser is None:
+        pytest.skip("未安装 selectolax")
+    return request.param
+
+
+def test_first_match_follows_document_order(fill_planner, engine):
+    html = """<html><body><form>
+        <input placeholder="请输入真实姓名">
+        <input name="name">
+    </form></body></html>"""
+    document = fill_planner.PageDocument(html)
+
+    assert document.engine == engine
+    # 两个备选都能匹配时，返回文档中更靠前的元素所对应的写法，而不是先写的备选
+    assert document.first_match('input[name="name"], input[placeholder*="姓名"]') == 'input[placeholder*="姓名"]'
+    assert document.first_match('input[name="name"], textarea') == 'input[name="name"]'
+    assert document.first_match('input[name="email"], select') == ''
+
+
+def test_simple_document_selector_subset(fill_planner):
+    document = fill_planner._SimpleDocument(
+        '<div><input type="email" name="userEmail" placeholder="工作邮箱"><br/>'
+        '<textarea name="advantage"></textarea></div>')
+
+    assert document.first_index('div') == 0
+    assert document.first_index('*[name]') == 1
+    assert document.first_index('input[type="email"]') == 1
+    assert document.first_index('input[name^="user"]') == 1
+    assert document.first_index('input[name$="Email"]') == 1
+    assert document.first_index('input[placeholder*="邮箱"]') == 1
+    assert document.first_index('textarea[name="advantage"]') == 3
+    assert document.first_index('input[name="email"]') is None
+    assert not document.matches('select')
+    with pytest.raises(ValueError):
+        document.first_index('div > input')
+
+
+def test_plan_fill_outcomes(fill_planner, engine):
+    html = """<form>
+        <input name="name">
+        <input placeholder="手机号码">
+        <textarea name="advantage"></textarea>
+    </form>"""
+    config = DictConfig({'PersonalInfo': {'name': '张三', 'phone': '  '}, 'Others': {}})
+
+    plan = fill_planner.plan_fill(html, config, CATALOG)
+    actions = {item['config_key']: (item['action'], item['matched_selector']) for item in plan['fields']}
+
+    assert plan['engine'] == engine
+    assert actions == {
+        'name': (fill_planner.ACTION_FILL, 'input[name="name"]'),
+        'phone': (fill_planner.ACTION_MISSING_VALUE, 'input[placeholder*="手机"]'),
+        'email': (fill_planner.ACTION_NOT_FOUND, ''),
+        'advantage': (fill_planner.ACTION_MISSING_VALUE, 'textarea[name="advantage"]'),
+    }
+    # 只有必填批次中缺值的字段计入 missing_keys，页面上没有的字段不算缺失
+    assert plan['missing_keys'] == ['PersonalInfo.phone']
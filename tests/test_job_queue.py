@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""批量任务队列：领取、检查点、失败重试和崩溃恢复"""
+
+import pytest
+
+import job_queue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = job_queue.JobQueue(str(tmp_path / "jobs.db"), max_attempts=2, lease_seconds=600)
+    yield queue
+    queue.close()
+
+
+def test_claim_in_order_and_skip_blank_lines(queue):
+    assert queue.add_many(["https://a.example/1\n", "\n", "https://a.example/2"]) == 2
+
+    first = queue.claim_next()
+    second = queue.claim_next()
+    assert (first['url'], second['url']) == ("https://a.example/1", "https://a.example/2")
+    assert first['state'] == job_queue.RUNNING and first['attempts'] == 1
+    assert queue.claim_next() is None
+
+
+def test_checkpoint_is_returned_on_retry(queue):
+    queue.add("https://a.example/1")
+    job = queue.claim_next()
+    assert job['checkpoint'] == []
+
+    queue.save_checkpoint(job['id'], ['personal', 'work'])
+    queue.mark_failed(job['id'], "表单未就绪")
+
+    retry = queue.claim_next()
+    assert retry['id'] == job['id']
+    assert retry['attempts'] == 2
+    assert retry['checkpoint'] == ['personal', 'work']
+
+
+def test_failed_after_max_attempts(queue):
+    queue.add("https://a.example/1")
+    for _ in range(2):
+        queue.mark_failed(queue.claim_next()['id'], "失败")
+
+    stats = queue.get_stats()
+    assert stats[job_queue.FAILED] == 1
+    assert stats['failure_rate'] == 1.0
+    assert queue.claim_next() is None
+
+    assert queue.retry_failed() == 1
+    assert queue.claim_next()['checkpoint'] == []
+
+
+def test_recover_respects_lease(queue):
+    queue.add("https://a.example/1")
+    job = queue.claim_next()
+    queue.save_checkpoint(job['id'], ['personal'])
+
+    # 租约未过期时其他进程不会抢走任务
+    assert queue.recover() == 0
+    assert queue.claim_next() is None
+
+    assert queue.recover(force=True) == 1
+    resumed = queue.claim_next()
+    assert resumed['id'] == job['id']
+    assert resumed['checkpoint'] == ['personal']
+
+
+def test_mark_done_updates_stats(queue):
+    queue.add("https://a.example/1")
+    queue.mark_done(queue.claim_next()['id'])
+
+    stats = queue.get_stats()
+    assert stats[job_queue.DONE] == 1
+    assert stats[job_queue.PENDING] == stats[job_queue.RUNNING] == 0
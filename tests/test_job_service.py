@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""本地填充任务服务：HTTP 接口、排队上限和事件流"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.priority = None
+        self.alive = False
+        self.restarts = 0
+
+    def set_rate_limiter(self, limiter, priority=None):
+        self.priority = priority
+
+
+class FakeFiller:
+    """不启动浏览器的填充器，release 被设置前一直阻塞"""
+
+    release = None
+    instances = []
+    login_ok = True
+
+    def __init__(self, profile=None, config=None, **kwargs):
+        self.profile = profile
+        self.config = config
+        self.browser = FakeBrowser()
+        self.fill_stats = {}
+        self.last_error = ""
+        self.opened = 0
+        self.closed = False
+        FakeFiller.instances.append(self)
+
+    def open_session(self):
+        self.opened += 1
+        self.browser.alive = FakeFiller.login_ok
+        if not FakeFiller.login_ok:
+            self.last_error = "登录状态不可用，无提示模式下无法手动登录"
+        return FakeFiller.login_ok
+
+    def recover_session(self):
+        if not self.browser.alive:
+            self.browser.restarts += 1
+            self.browser.alive = True
+        return True
+
+    def close_session(self):
+        self.closed = True
+
+    def missing_required_keys(self):
+        return []
+
+    def fill_specific_page(self, page_url=None):
+        self.last_error = ""
+        self.fill_stats = {'filled': [], 'empty': [], 'not_found': [], 'failed': []}
+        print(f"正在填充 {page_url}")
+        FakeFiller.release.wait(5)
+        if page_url == "bad":
+            self.last_error = "简历表单未就绪"
+            return False
+        self.fill_stats['filled'].append('PersonalInfo.name')
+        return True
+
+
+@pytest.fixture
+def job_service():
+    # config_manager 导入时会在当前目录创建默认配置，放在测试的临时目录中导入
+    import job_service
+    return job_service
+
+
+@pytest.fixture
+def server(job_service, monkeypatch, tmp_path):
+    monkeypatch.setitem(job_service.SITES, 'fake', FakeFiller)
+    FakeFiller.release = threading.Event()
+    FakeFiller.instances = []
+    FakeFiller.login_ok = True
+    service = job_service.JobService(workers=1, max_pending=1, rate_db=str(tmp_path / "rate.db"))
+    server = job_service.ServiceServer(('127.0.0.1', 0), service)
+    # pytest 在测试开始前会重新设置 sys.stdout，工作线程的输出转发由各测试自己启动
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    FakeFiller.release.set()
+    server.shutdown()
+    server.server_close()
+    service.stop(timeout=5)
+
+
+def request(server, method, path, payload=None):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, method=method), timeout=5) as response:
+            return response.status, response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode('utf-8')
+
+
+def submit(server, url, site='fake', profile=None, **fields):
+    status, body = request(server, 'POST', '/jobs', {'url': url, 'site': site, 'profile': profile, **fields})
+    return status, json.loads(body)
+
+
+def wait_for_state(job, state, timeout=5):
+    deadline = time.monotonic() + timeout
+    while job.state != state and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job.state == state
+
+
+def test_percentile(job_service):
+    assert job_service.percentile([], 0.5) == 0.0
+    assert job_service.percentile([3, 1, 2, 4], 0.5) == 2
+    assert job_service.percentile([3, 1, 2, 4], 0.99) == 4
+
+
+def test_rejects_invalid_submissions(server):
+    server.service.start()
+    assert submit(server, "u", site='unknown')[0] == 400
+    status, body = submit(server, "u", profile='不存在')
+    assert (status, body['error']) == (400, 'unknown_profile')
+    status, body = submit(server, "u", priority='urgent')
+    assert (status, body['error']) == (400, "无效的优先级: urgent")
+    assert request(server, 'GET', '/jobs/999')[0] == 404
+    assert request(server, 'GET', '/nothing')[0] == 404
+
+
+def test_backpressure_when_queue_is_full(server):
+    service = server.service
+    service.start()
+    status, first = submit(server, "page-1")
+    assert status == 202
+    assert wait_for_state(service.get(first['id']), 'running')
+
+    assert submit(server, "page-2")[0] == 202
+    status, body = submit(server, "page-3")
+    assert (status, body['error']) == (503, 'queue_full')
+
+    metrics = json.loads(request(server, 'GET', '/metrics')[1])
+    assert metrics['queue_depth'] == 1
+    assert metrics['running'] == 1
+
+
+def test_event_stream_ends_with_result(server):
+    server.service.start()
+    _, job = submit(server, "bad")
+    FakeFiller.release.set()
+
+    status, body = request(server, 'GET', f"/jobs/{job['id']}/events")
+    events = [json.loads(line) for line in body.splitlines()]
+    assert status == 200
+    assert [event['type'] for event in events][0:2] == ['queued', 'started']
+    assert any(event['type'] == 'log' and "正在填充 bad" in event['message'] for event in events)
+    assert events[-1]['type'] == 'failed'
+    assert events[-1]['result']['ok'] is False
+    assert events[-1]['result']['error'] == "简历表单未就绪"
+
+    detail = json.loads(request(server, 'GET', f"/jobs/{job['id']}")[1])
+    assert detail['state'] == 'failed'
+
+
+def test_successful_job_updates_metrics(server):
+    server.service.start()
+    FakeFiller.release.set()
+    _, job = submit(server, "page-1")
+    events = request(server, 'GET', f"/jobs/{job['id']}/events")[1].splitlines()
+    assert json.loads(events[-1])['type'] == 'done'
+
+    metrics = json.loads(request(server, 'GET', '/metrics')[1])
+    assert metrics['submitted'] == 1
+    assert [item['id'] for item in json.loads(request(server, 'GET', '/jobs')[1])] == [job['id']]
+
+
+def test_job_priority_selects_rate_lane(server):
+    import rate_limiter
+
+    server.service.start()
+    FakeFiller.release.set()
+    _, job = submit(server, "page-1", priority='high')
+    events = request(server, 'GET', f"/jobs/{job['id']}/events")[1].splitlines()
+    assert json.loads(events[-1])['type'] == 'done'
+    assert FakeFiller.instances[-1].browser.priority == rate_limiter.PRIORITY_HIGH
+    assert json.loads(request(server, 'GET', f"/jobs/{job['id']}")[1])['priority'] == 'high'
+
+
+def test_metrics_include_rate_limits(server):
+    import rate_limiter
+
+    server.service.start()
+    limiter = rate_limiter.RateLimiter(server.service.rate_db, jitter=0)
+    try:
+        limiter.acquire("a.example")
+    finally:
+        limiter.close()
+
+    metrics = json.loads(request(server, 'GET', '/metrics')[1])
+    assert metrics['rate_limits']['a.example']['acquired'] == 1
+    assert metrics['rate_limits']['a.example']['queue_depth'] == 0
+
+
+def run_job(server, url, **fields):
+    _, job = submit(server, url, **fields)
+    events = request(server, 'GET', f"/jobs/{job['id']}/events")[1].splitlines()
+    return json.loads(events[-1])
+
+
+def test_worker_reuses_browser_between_jobs(server, tmp_path, monkeypatch):
+    import config_manager
+    import profile_store
+
+    store = profile_store.ProfileStore(str(tmp_path / "profiles.db"))
+    monkeypatch.setattr(config_manager, '_profile_store', store)
+    store.save_profile("李四", {'PersonalInfo': {'name': '李四'}})
+    server.service.start()
+    FakeFiller.release.set()
+
+    assert run_job(server, "page-1")['type'] == 'done'
+    assert run_job(server, "page-2")['type'] == 'done'
+    first = FakeFiller.instances[0]
+    assert (len(FakeFiller.instances), first.opened) == (1, 1)
+
+    # 浏览器崩溃后在同一个填充器中重启并恢复登录
+    first.browser.alive = False
+    assert run_job(server, "page-3")['type'] == 'done'
+    assert (len(FakeFiller.instances), first.browser.restarts) == (1, 1)
+
+    # 切换档案时关闭旧浏览器
+    assert run_job(server, "page-4", profile="李四")['type'] == 'done'
+    assert first.closed
+    assert [filler.profile for filler in FakeFiller.instances] == [None, "李四"]
+
+
+def test_failed_login_is_retried_on_next_job(server):
+    server.service.start()
+    FakeFiller.release.set()
+    FakeFiller.login_ok = False
+
+    event = run_job(server, "page-1")
+    assert event['type'] == 'failed'
+    assert event['result']['error'] == "登录状态不可用，无提示模式下无法手动登录"
+    assert FakeFiller.instances[0].closed
+
+    FakeFiller.login_ok = True
+    assert run_job(server, "page-2")['type'] == 'done'
+    assert len(FakeFiller.instances) == 2
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""模拟站点：生成的页面能被离线规划匹配到字段目录中的每个字段"""
+
+import random
+
+import pytest
+
+import field_catalog
+import mock_site
+
+
+class EmptyConfig:
+    def get_config_value(self, section, key, default=""):
+        return default
+
+
+@pytest.fixture
+def fill_planner():
+    # config_manager 导入时会在当前目录创建默认配置，放在测试的临时目录中导入
+    import fill_planner
+    return fill_planner
+
+
+def test_every_selector_alternative_renders_a_match(fill_planner):
+    alternatives = [part.strip() for _, _, field in field_catalog.iter_fields()
+                    for part in field['selector'].split(',')]
+    page = "".join(mock_site.render_field(alternative, f"field-{index}")
+                   for index, alternative in enumerate(alternatives))
+    document = fill_planner.PageDocument(page)
+
+    for alternative in alternatives:
+        assert document.first_match(alternative), alternative
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_plan_finds_every_catalog_field(fill_planner, seed):
+    page = mock_site.render_resume_page(mock_site.MockOptions(), random.Random(seed))
+
+    plan = fill_planner.plan_fill(page, EmptyConfig())
+    not_found = [f"{item['config_section']}.{item['config_key']}" for item in plan['fields']
+                 if item['action'] == fill_planner.ACTION_NOT_FOUND]
+    assert not_found == []
+    assert len(plan['fields']) == len(list(field_catalog.iter_fields()))
+
+
+def test_absent_fields_are_not_planned(fill_planner):
+    page = mock_site.render_resume_page(mock_site.MockOptions(absent=1.0), random.Random(0))
+
+    plan = fill_planner.plan_fill(page, EmptyConfig())
+    assert all(item['action'] == fill_planner.ACTION_NOT_FOUND for item in plan['fields'])
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""多候选人档案库：读写、空节、导入导出，以及配置管理器对未知档案的处理"""
+
+import pytest
+
+import profile_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = profile_store.ProfileStore(str(tmp_path / "profiles.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def config_manager():
+    # 模块导入时会在当前目录创建默认配置，放在测试的临时目录中导入
+    import config_manager
+    return config_manager
+
+
+def test_save_and_load_keeps_empty_sections(store):
+    store.save_profile("张三", {'PersonalInfo': {'name': '张三', 'phone': '13800138000'}, 'Education': {}})
+
+    assert store.has_profile("张三")
+    assert store.load_profile("张三") == {
+        'PersonalInfo': {'name': '张三', 'phone': '13800138000'},
+        'Education': {},
+    }
+    assert store.list_profiles() == ["张三"]
+
+
+def test_set_values_only_touches_given_keys(store):
+    store.save_profile("张三", {'PersonalInfo': {'name': '张三', 'email': 'a@example.com'}})
+    version = store.profile_version("张三")
+
+    store.set_values("张三", {'PersonalInfo': {'email': 'b@example.com'}, 'Others': {'note': '涨薪 20%'}})
+
+    assert store.load_profile("张三") == {
+        'PersonalInfo': {'name': '张三', 'email': 'b@example.com'},
+        'Others': {'note': '涨薪 20%'},
+    }
+    assert store.profile_version("张三") >= version
+
+
+def test_delete_profile(store):
+    store.save_profile("张三", {'PersonalInfo': {'name': '张三'}})
+    assert store.delete_profile("张三")
+    assert not store.delete_profile("张三")
+    assert store.load_profile("张三") == {}
+    assert store.profile_version("张三") is None
+
+
+def test_json_and_csv_round_trip(store, tmp_path):
+    store.save_profile("张三", {'PersonalInfo': {'name': '张三'}, 'WorkInfo': {'company': 'A, B'}})
+    store.save_profile("李四", {'PersonalInfo': {'name': '李四'}})
+
+    assert store.export_json(str(tmp_path / "all.json")) == 2
+    assert store.export_csv(str(tmp_path / "all.csv")) == 3
+
+    other = profile_store.ProfileStore(str(tmp_path / "other.db"))
+    try:
+        assert other.import_json(str(tmp_path / "all.json")) == 2
+        assert other.load_profile("张三") == store.load_profile("张三")
+        other.delete_profile("张三")
+        assert other.import_csv(str(tmp_path / "all.csv")) == 3
+        assert other.load_profile("张三") == store.load_profile("张三")
+    finally:
+        other.close()
+
+
+def test_import_ini_keeps_percent(store, tmp_path):
+    ini = tmp_path / "config.ini"
+    ini.write_text("[Others]\nnote = 完成率 95%\n", encoding='utf-8')
+
+    store.import_ini("张三", str(ini))
+    assert store.load_profile("张三") == {'Others': {'note': '完成率 95%'}}
+
+
+def test_unknown_profile_is_not_created(store, config_manager):
+    with pytest.raises(config_manager.UnknownProfileError):
+        config_manager.ConfigManager(profile="不存在", store=store)
+    assert not store.has_profile("不存在")
+
+
+def test_create_profile_starts_empty(store, config_manager):
+    manager = config_manager.ConfigManager(profile="王五", store=store, create=True)
+
+    assert store.has_profile("王五")
+    assert manager.get_config_value('PersonalInfo', 'name') == ""
+    manager.set_config_value('PersonalInfo', 'name', '王五')
+    assert store.load_profile("王五")['PersonalInfo'] == {'name': '王五'}
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""按域名限速：突发额度、超时、域名覆盖和跨实例共享"""
+
+import json
+import sys
+
+import pytest
+
+import rate_limiter
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / "rate.db")
+
+
+def test_burst_then_wait(db_file):
+    limiter = rate_limiter.RateLimiter(db_file, rate=20, burst=2, jitter=0)
+    try:
+        assert limiter.acquire("a.example") < 0.05
+        assert limiter.acquire("a.example") < 0.05
+        # 令牌用完后需要等待约 1/rate 秒
+        assert limiter.acquire("a.example") >= 0.03
+
+        metrics = limiter.get_metrics()["a.example"]
+        assert metrics['acquired'] == 3
+        assert metrics['queue_depth'] == 0
+    finally:
+        limiter.close()
+
+
+def test_timeout_when_bucket_empty(db_file):
+    limiter = rate_limiter.RateLimiter(db_file, rate=0.01, burst=1, jitter=0)
+    try:
+        limiter.acquire("a.example")
+        with pytest.raises(TimeoutError):
+            limiter.acquire("a.example", timeout=0.1)
+        # 超时的排队记录会被清理，不会阻塞其他域名
+        assert limiter.acquire("b.example", timeout=0.1) < 0.1
+    finally:
+        limiter.close()
+
+
+def test_subdomain_uses_parent_limits(db_file):
+    limiter = rate_limiter.RateLimiter(db_file, rate=1, burst=5, jitter=0,
+                                       domain_rates={'zhipin.com': (0.01, 1)})
+    try:
+        assert limiter._limits_for("www.zhipin.com") == (0.01, 1)
+        assert limiter._limits_for("other.example") == (1, 5)
+        assert limiter.acquire_for_url("not a url") == 0.0
+    finally:
+        limiter.close()
+
+
+def test_instances_share_the_bucket(db_file):
+    first = rate_limiter.RateLimiter(db_file, rate=0.01, burst=1, jitter=0)
+    second = rate_limiter.RateLimiter(db_file, rate=0.01, burst=1, jitter=0)
+    try:
+        first.acquire_for_url("https://a.example/page")
+        with pytest.raises(TimeoutError):
+            second.acquire_for_url("https://a.example/other", timeout=0.1)
+    finally:
+        first.close()
+        second.close()
+
+
+def test_cli_rate_stats(db_file, monkeypatch, capsys):
+    # cli 导入时会加载 config_manager，在当前（临时）目录中创建默认配置
+    import cli
+
+    limiter = rate_limiter.RateLimiter(db_file, jitter=0)
+    try:
+        limiter.acquire("a.example")
+    finally:
+        limiter.close()
+
+    monkeypatch.setattr(cli, '_stdout', sys.stdout)
+    assert cli.main(['rate', 'stats', '--rate-db', db_file, '--json']) == cli.EXIT_OK
+    payload = json.loads(capsys.readouterr().out)
+    assert payload['domains']['a.example']['acquired'] == 1
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""简历导入：字段提取、DOCX 解析和批量写入档案"""
+
+import zipfile
+
+import pytest
+
+import profile_store
+
+RESUME_MD = """# 张三
+
+- 电话：138-0013-8000
+- 邮箱：**zhangsan@example.com**
+
+## 教育背景
+北京大学 | 计算机科学与技术 | 本科 | 2016.09-2020.06
+
+## 专业技能
+- Python、SQL，单元测试覆盖率 90%
+
+## 项目经验
+- 简历自动填充工具
+"""
+
+
+@pytest.fixture
+def importer():
+    # config_manager 导入时会在当前目录创建默认配置，放在测试的临时目录中导入
+    import resume_importer
+    return resume_importer
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = profile_store.ProfileStore(str(tmp_path / "profiles.db"))
+    yield store
+    store.close()
+
+
+def write_docx(path, paragraphs):
+    ns = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>')
+
+
+def test_parse_markdown_resume(importer, tmp_path):
+    path = tmp_path / "resume.md"
+    path.write_text(RESUME_MD, encoding='utf-8')
+
+    data = importer.parse_resume(str(path))
+    assert data['PersonalInfo'] == {'name': '张三', 'phone': '13800138000', 'email': 'zhangsan@example.com'}
+    assert data['Education'] == {'school_name': '北京大学', 'major': '计算机科学与技术',
+                                 'degree': '本科', 'graduation_year': '2020'}
+    assert data['Others']['professional_skills'] == "Python、SQL，单元测试覆盖率 90%"
+    assert data['Others']['project_experience'] == "简历自动填充工具"
+
+
+def test_parse_docx_with_labels(importer, tmp_path):
+    path = tmp_path / "resume.docx"
+    write_docx(path, ["个人简历", "姓名：李四  手机：13900139000", "学历：硕士研究生", "毕业时间：2022年6月"])
+
+    data = importer.parse_resume(str(path))
+    assert data['PersonalInfo'] == {'name': '李四', 'phone': '13900139000'}
+    assert data['Education'] == {'degree': '硕士', 'graduation_year': '2022'}
+
+
+def test_import_resumes_creates_profiles(importer, store, tmp_path):
+    folder = tmp_path / "resumes"
+    folder.mkdir()
+    (folder / "a.md").write_text(RESUME_MD, encoding='utf-8')
+    (folder / "notes.json").write_text("{}", encoding='utf-8')
+
+    results = importer.import_resumes([str(folder)], store=store)
+    assert [(item['profile'], item['error']) for item in results] == [('张三', None)]
+    # 值按原样保存，% 不会被转义
+    assert store.load_profile('张三')['Others']['professional_skills'].endswith("90%")
+
+
+def test_import_resumes_keeps_existing_values(importer, store, tmp_path):
+    path = tmp_path / "resume.md"
+    path.write_text(RESUME_MD, encoding='utf-8')
+    store.save_profile('张三', {'PersonalInfo': {'name': '张三', 'phone': '13700137000'}})
+
+    importer.import_resumes([str(path)], store=store)
+    assert store.load_profile('张三')['PersonalInfo']['phone'] == '13700137000'
+
+    importer.import_resumes([str(path)], store=store, overwrite=True)
+    assert store.load_profile('张三')['PersonalInfo']['phone'] == '13800138000'
+
+
+def test_import_resumes_reports_errors(importer, store, tmp_path):
+    results = importer.import_resumes([str(tmp_path / "missing.md")], store=store)
+    assert results[0]['profile'] is None
+    assert results[0]['error']
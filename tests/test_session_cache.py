@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""登录会话缓存：加密读写、密钥来源和密钥文件权限"""
+
+import os
+import stat
+import time
+
+import pytest
+
+import session_cache
+
+
+class FakeKeyring:
+    """内存中的系统钥匙串替身"""
+
+    def __init__(self):
+        self.passwords = {}
+
+    def get_password(self, service, user):
+        return self.passwords.get((service, user))
+
+    def set_password(self, service, user, password):
+        self.passwords[(service, user)] = password
+
+
+@pytest.fixture
+def no_keyring(monkeypatch):
+    pytest.importorskip("cryptography")
+    monkeypatch.delenv(session_cache.KEY_ENV, raising=False)
+    monkeypatch.setattr(session_cache, 'keyring', None)
+
+
+def test_save_and_load(no_keyring, tmp_path):
+    cache = session_cache.SessionCache(str(tmp_path / "sessions"))
+    session = {'cookies': [{'name': 'wt2', 'value': 'secret'}], 'local_storage': {}}
+
+    assert cache.save("zhipin_张三", session)
+    assert cache.load("zhipin_张三") == session
+    with open(cache._path("zhipin_张三"), 'rb') as f:
+        assert b'secret' not in f.read()
+
+    cache.delete("zhipin_张三")
+    assert cache.load("zhipin_张三") is None
+
+
+def test_wrong_key_drops_cache(no_keyring, tmp_path):
+    cache_dir = str(tmp_path / "sessions")
+    session_cache.SessionCache(cache_dir).save("zhipin_default", {'cookies': []})
+    os.remove(os.path.join(cache_dir, ".key"))
+
+    cache = session_cache.SessionCache(cache_dir)
+    assert cache.load("zhipin_default") is None
+    assert not os.path.exists(cache._path("zhipin_default"))
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Windows 不支持 POSIX 文件权限")
+def test_key_file_permissions_are_tightened(no_keyring, tmp_path):
+    cache_dir = str(tmp_path / "sessions")
+    session_cache.SessionCache(cache_dir)
+    key_file = os.path.join(cache_dir, ".key")
+    assert stat.S_IMODE(os.stat(key_file).st_mode) == 0o600
+
+    os.chmod(key_file, 0o644)
+    session_cache.SessionCache(cache_dir)
+    assert stat.S_IMODE(os.stat(key_file).st_mode) == 0o600
+
+
+def test_env_key_does_not_create_key_file(no_keyring, tmp_path, monkeypatch):
+    from cryptography.fernet import Fernet
+
+    monkeypatch.setenv(session_cache.KEY_ENV, Fernet.generate_key().decode('ascii'))
+    cache = session_cache.SessionCache(str(tmp_path / "sessions"))
+    assert cache.save("zhipin_default", {'cookies': []})
+    assert not os.path.exists(tmp_path / "sessions" / ".key")
+
+
+def test_key_file_is_migrated_to_keyring(no_keyring, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "sessions")
+    session_cache.SessionCache(cache_dir).save("zhipin_default", {'cookies': []})
+
+    keyring = FakeKeyring()
+    monkeypatch.setattr(session_cache, 'keyring', keyring)
+    cache = session_cache.SessionCache(cache_dir)
+
+    assert not os.path.exists(os.path.join(cache_dir, ".key"))
+    assert keyring.get_password(session_cache.KEYRING_SERVICE, session_cache.KEYRING_USER)
+    # 迁移后沿用原来的密钥，已缓存的会话仍然可以解密
+    assert cache.load("zhipin_default") == {'cookies': []}
+
+
+def test_drop_expired_cookies():
+    now = time.time()
+    cookies = [{'name': 'a', 'expiry': now - 10}, {'name': 'b', 'expiry': now + 3600}, {'name': 'c'}]
+    assert [cookie['name'] for cookie in session_cache.drop_expired_cookies(cookies)] == ['b', 'c']
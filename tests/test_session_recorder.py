@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""录制装饰器：只记录最外层调用、不保存填充值、记录异常和导航快照"""
+
+import json
+import os
+
+import pytest
+
+import session_recorder
+from session_recorder import recorded
+
+
+class FakeEngine:
+    """只实现装饰器用到的属性的浏览器引擎替身"""
+
+    def __init__(self, recorder=None):
+        self.recorder = recorder
+        self._record_depth = 0
+        self.html = "<html><body><input name='a'><script>alert(1)</script></body></html>"
+
+    def record_snapshot(self, label):
+        if self.recorder:
+            return self.recorder.record_snapshot(label, "https://a.example/", self.html)
+        return None
+
+    @recorded
+    def find_element_safe(self, selector, by="css selector"):
+        return object() if selector == "#found" else None
+
+    @recorded
+    def find_and_fill(self, selector, value, by="css selector"):
+        return self.find_element_safe(selector, by) is not None
+
+    @recorded
+    def navigate_to(self, url):
+        return True
+
+    @recorded
+    def broken(self, selector):
+        raise RuntimeError("元素已失效")
+
+
+def read_events(recorder):
+    with open(os.path.join(recorder.session_dir, "commands.jsonl"), encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    recorder = session_recorder.SessionRecorder(str(tmp_path / "recordings"))
+    yield recorder
+    recorder.close()
+
+
+def test_passthrough_without_recorder():
+    engine = FakeEngine()
+    assert engine.find_and_fill("#found", "张三")
+    assert engine.find_and_fill.__name__ == "find_and_fill"
+
+
+def test_records_outermost_call_without_value(recorder):
+    engine = FakeEngine(recorder)
+    assert engine.find_and_fill("#found", "13800138000")
+    assert not engine.find_element_safe("#missing")
+
+    commands = [event for event in read_events(recorder) if event['type'] == 'command']
+    assert [event['command'] for event in commands] == ["find_and_fill", "find_element_safe"]
+    assert commands[0]['args'] == {'selector': "#found", 'value_length': 11}
+    assert "13800138000" not in json.dumps(commands)
+    assert commands[0]['result'] is True
+    assert commands[1]['result'] is None
+    assert engine._record_depth == 0
+
+
+def test_records_error_and_reraises(recorder):
+    engine = FakeEngine(recorder)
+    with pytest.raises(RuntimeError):
+        engine.broken("#x")
+
+    event = read_events(recorder)[-1]
+    assert event['command'] == "broken"
+    assert event['error'] == "元素已失效"
+    assert engine._record_depth == 0
+
+
+def test_navigate_saves_snapshot_without_scripts(recorder):
+    engine = FakeEngine(recorder)
+    engine.navigate_to("https://a.example/")
+
+    snapshot, command = read_events(recorder)
+    assert snapshot['type'] == 'snapshot' and snapshot['label'] == 'navigate'
+    assert command['snapshot'] == snapshot['file']
+    with open(os.path.join(recorder.pages_dir, snapshot['file']), encoding='utf-8') as f:
+        assert "<script" not in f.read()
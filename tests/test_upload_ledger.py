@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""附件上传记录：文件哈希缓存和按 站点+账户 去重"""
+
+import os
+
+import pytest
+
+import upload_ledger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = upload_ledger.UploadLedger(str(tmp_path / "uploads.db"))
+    yield ledger
+    ledger.close()
+
+
+@pytest.fixture
+def resume(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF-1.4 resume")
+    return str(path)
+
+
+def test_same_content_has_same_hash(ledger, resume, tmp_path):
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(b"%PDF-1.4 resume")
+
+    assert ledger.file_hash(resume) == ledger.file_hash(str(copy))
+    assert ledger.file_hash(resume) == ledger.file_hash(resume)
+
+
+def test_hash_changes_when_file_changes(ledger, resume):
+    before = ledger.file_hash(resume)
+    with open(resume, 'ab') as f:
+        f.write(b" v2")
+    assert ledger.file_hash(resume) != before
+
+
+def test_cached_hash_is_used_while_file_is_unchanged(ledger, resume):
+    ledger.file_hash(resume)
+    stat = os.stat(resume)
+    ledger.conn.execute("UPDATE file_hashes SET sha256 = 'cached' WHERE path = ?", (os.path.abspath(resume),))
+    assert ledger.file_hash(resume) == 'cached'
+
+    os.utime(resume, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert ledger.file_hash(resume) != 'cached'
+
+
+def test_uploads_are_tracked_per_site_and_account(ledger, resume):
+    sha256 = ledger.file_hash(resume)
+    assert ledger.find_upload('zhipin', '张三', sha256) is None
+
+    ledger.record_upload('zhipin', '张三', sha256, resume, 1.5)
+    upload = ledger.find_upload('zhipin', '张三', sha256)
+    assert upload['file_name'] == "resume.pdf"
+    assert upload['size'] == os.path.getsize(resume)
+    assert upload['seconds'] == 1.5
+
+    assert ledger.find_upload('zhipin', '李四', sha256) is None
+    assert ledger.find_upload('other', '张三', sha256) is None
+
+
+def test_forget(ledger, resume):
+    sha256 = ledger.file_hash(resume)
+    ledger.record_upload('zhipin', '张三', sha256, resume, 1.0)
+    ledger.record_upload('zhipin', '张三', 'other', resume, 1.0)
+
+    assert ledger.forget('zhipin', '张三', sha256) == 1
+    assert ledger.find_upload('zhipin', '张三', sha256) is None
+    assert ledger.forget('zhipin', '张三') == 1
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""增量填充：滚动到底部后仍等待有配置值的必填字段渲染，其余情况空闲后提前结束"""
+
+import time
+
+import pytest
+
+import profile_store
+
+pytest.importorskip("selenium")
+
+
+class FakeBrowser:
+    """页面已滚动到底部，字段按 appear_at 指定的轮询次数出现"""
+
+    def __init__(self, appear_at: dict):
+        self.appear_at = appear_at
+        self.polls = 0
+        self.filled = []
+
+    def record_snapshot(self, label):
+        pass
+
+    def install_field_observer(self, selectors):
+        return True
+
+    def remove_field_observer(self):
+        pass
+
+    def click_if_present(self, selector):
+        return False
+
+    def poll_field_observer(self):
+        self.polls += 1
+        return [name for name, poll in self.appear_at.items() if poll == self.polls]
+
+    def scroll_page_step(self):
+        return True
+
+    def find_and_fill(self, selector, value):
+        self.filled.append(value)
+        return True
+
+
+@pytest.fixture
+def make_filler(tmp_path):
+    # config_manager 导入时会在当前目录创建默认配置，放在测试的临时目录中导入
+    import config_manager
+    import zhipin_filler
+
+    store = profile_store.ProfileStore(str(tmp_path / "profiles.db"))
+
+    def make(values: dict, browser: FakeBrowser):
+        store.save_profile("张三", values)
+        config = config_manager.ConfigManager(profile="张三", store=store)
+        filler = zhipin_filler.ZhipinFiller(config=config, interactive=False, use_session_cache=False)
+        filler.browser = browser
+        return filler
+
+    yield make
+    store.close()
+
+
+def test_waits_for_late_required_field(make_filler):
+    browser = FakeBrowser({'Education.school_name': 6})
+    filler = make_filler({'Education': {'school_name': '某大学'}}, browser)
+
+    filler.fill_incremental(timeout=1, idle_polls=3, poll_interval=0.01)
+
+    # 第 3 次空闲轮询后没有提前结束，第 6 次轮询出现的学校仍被填充
+    assert browser.polls > 6
+    assert browser.filled == ['某大学']
+    assert filler.fill_stats['filled'] == ['Education.school_name']
+    assert 'Education.major' in filler.fill_stats['not_found']
+
+
+def test_stops_when_only_unconfigured_fields_remain(make_filler):
+    browser = FakeBrowser({'Education.school_name': 6})
+    filler = make_filler({'Education': {}}, browser)
+
+    started = time.monotonic()
+    filler.fill_incremental(timeout=5, idle_polls=3, poll_interval=0.01)
+
+    # 没有任何批次有配置值，滚动到底部空闲 3 次即结束，不等待超时
+    assert browser.polls == 3
+    assert time.monotonic() - started < 1
+    assert browser.filled == []
+    assert 'Education.school_name' in filler.fill_stats['not_found']
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+附件上传记录
+按 站点+账户 记录已上传附件的内容哈希，网站上已有相同文件时跳过重复上传；
+文件哈希按 (路径, 修改时间, 大小) 缓存，批量投递时同一份简历只计算一次
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Optional
+
+
+class UploadLedger:
+    """附件上传记录 - 基于 SQLite，可被多个进程共享"""
+
+    def __init__(self, db_file: str = "uploads.db"):
+        """
+        初始化上传记录
+
+        Args:
+            db_file: SQLite 数据库文件路径
+        """
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        """创建文件哈希缓存表和上传记录表"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS uploads (
+                site TEXT NOT NULL,
+                account TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                seconds REAL NOT NULL,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (site, account, sha256)
+            ) WITHOUT ROWID
+        """)
+
+    def file_hash(self, path: str) -> str:
+        """
+        计算文件的 SHA-256，文件未修改时直接使用缓存
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            str: 十六进制哈希值
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        row = self.conn.execute(
+            "SELECT sha256 FROM file_hashes WHERE path = ? AND mtime_ns = ? AND size = ?",
+            (path, stat.st_mtime_ns, stat.st_size)).fetchone()
+        if row:
+            return row['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        self.conn.execute("REPLACE INTO file_hashes (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                          (path, stat.st_mtime_ns, stat.st_size, sha256))
+        return sha256
+
+    def find_upload(self, site: str, account: str, sha256: str) -> Optional[dict]:
+        """
+        查找相同内容的上传记录
+
+        Returns:
+            dict 或 None: {file_name, size, seconds, uploaded_at}，没有上传过时返回 None
+        """
+        row = self.conn.execute(
+            "SELECT file_name, size, seconds, uploaded_at FROM uploads "
+            "WHERE site = ? AND account = ? AND sha256 = ?", (site, account, sha256)).fetchone()
+        return dict(row) if row else None
+
+    def record_upload(self, site: str, account: str, sha256: str, path: str, seconds: float):
+        """
+        记录一次成功的上传
+
+        Args:
+            site: 站点名称
+            account: 账户（档案）名称
+            sha256: 文件哈希
+            path: 文件路径
+            seconds: 上传耗时（秒）
+        """
+        self.conn.execute("""
+            REPLACE INTO uploads (site, account, sha256, file_name, size, seconds, uploaded_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (site, account, sha256, os.path.basename(path), os.path.getsize(path), seconds, time.time()))
+
+    def forget(self, site: str, account: str, sha256: str = None) -> int:
+        """
+        删除上传记录（附件在网站上被删除后调用，下次会重新上传）
+
+        Args:
+            site: 站点名称
+            account: 账户名称
+            sha256: 只删除该文件的记录，默认删除该账户的全部记录
+
+        Returns:
+            int: 删除的记录数
+        """
+        if sha256:
+            cursor = self.conn.execute("DELETE FROM uploads WHERE site = ? AND account = ? AND sha256 = ?",
+                                       (site, account, sha256))
+        else:
+            cursor = self.conn.execute("DELETE FROM uploads WHERE site = ? AND account = ?", (site, account))
+        return cursor.rowcount
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
@@ -7,256 +7,577 @@ BOSS直聘信息填充脚本
 
 import config_manager
 import browser_engine
+import field_catalog
+import fill_planner
+import job_queue
+import rate_limiter
+import session_cache
+import upload_ledger
 from selenium.webdriver.common.by import By
+import os
+import sys
 import time
 
 
 class ZhipinFiller:
     """BOSS直聘信息填充器"""
 
-    def __init__(self):
-        """初始化填充器"""
-        self.browser = browser_engine.create_browser(headless=False, timeout=15)
+    # 登录后才会出现的页面元素，用于检查缓存的会话是否有效（需要根据实际页面调整）
+    LOGIN_PROBE_SELECTOR = '.nav-figure, .user-nav'
+
+    # 简历编辑页面的URL特征，可在配置 [Sites] zhipin_resume_url_pattern 中覆盖
+    RESUME_URL_PATTERN = r'zhipin\.com/.*(resume|geek)'
+
+    # 页面上至少出现几个必填字段才认为简历表单已就绪
+    FORM_SIGNATURE_MIN_MATCHES = 2
+
+    # 附件简历的文件输入框（按优先级排列），以及上传完成后显示文件名的元素（需要根据实际页面调整）
+    ATTACHMENT_INPUT_SELECTORS = ['input[type="file"][accept*="pdf"]', 'input[type="file"]']
+    ATTACHMENT_DONE_SELECTOR = '.attachment-name, .resume-file-name'
+
+    def __init__(self, profile: str = None, record_dir: str = None, use_session_cache: bool = True,
+                 interactive: bool = True, headless: bool = False,
+                 max_pages: int = None, max_rss_mb: int = None, incremental: bool = False,
+                 attachment: str = None, config: config_manager.ConfigManager = None,
+                 capture_dir: str = None, rate_db: str = None,
+                 rate_priority: int = rate_limiter.PRIORITY_NORMAL):
+        """
+        初始化填充器
+
+        Args:
+            profile: 候选人档案名称，不指定时使用当前配置
+            record_dir: 指定时录制填充会话到该目录，便于离线回放和测速
+            use_session_cache: 是否缓存并恢复登录状态，会话有效时跳过手动登录
+            interactive: 为 False 时从不等待终端输入，缺少配置或需要手动登录时直接失败
+            headless: 是否无头模式运行浏览器
+            max_pages: 浏览器访问页面数达到该值后自动重启（长时间批量运行时限制内存增长）
+            max_rss_mb: 浏览器内存超过该值（MB）后自动重启
+            incremental: 是否使用增量填充（字段出现即填充，适合懒加载和折叠区块较多的页面）
+            attachment: 附件简历文件，默认使用配置 [Others] resume_attachment，网站上已有相同文件时不重复上传
+            config: 使用的配置管理器，默认为 profile 对应的共享实例（多线程运行时每个线程传入自己的实例）
+            capture_dir: 指定时在每个批次完成后和失败时保存截图与DOM快照到该目录（后台写入，用于批量审计）
+            rate_db: 指定时按域名限制访问频率，与使用同一数据库的其他进程和服务共享限额
+            rate_priority: 填充页面使用的限速优先级通道（登录和会话探测始终使用高优先级）
+        """
+        self.browser = browser_engine.create_browser(headless=headless, timeout=15,
+                                                     max_pages=max_pages, max_rss_mb=max_rss_mb)
         self.base_url = "https://www.zhipin.com"
+        self.resume_url = "https://www.zhipin.com/web/geek/resume"
+        self.config = config or config_manager.get_manager(profile)
+        self.record_dir = record_dir
+        self.capture_dir = capture_dir
+        self.rate_db = rate_db
+        self.rate_priority = rate_priority
+        self._own_rate_limiter = None
+        self.session_cache = session_cache.SessionCache() if use_session_cache else None
+        self.session_name = f"zhipin_{self.config.profile or 'default'}"
+        self.interactive = interactive
+        self.incremental = incremental
+        self.attachment = attachment or self.config.get_config_value('Others', 'resume_attachment')
+        self.upload_ledger = None
+        self.fill_stats = {}
+        self.last_error = ""
+        self.resume_url_pattern = self.config.get_config_value(
+            'Sites', 'zhipin_resume_url_pattern', self.RESUME_URL_PATTERN)
+        self.login_timeout = 600  # 等待手动登录的最长时间（秒）
+        self.page_timeout = 15    # 等待页面表单就绪的最长时间（秒）
+
+    def start_filling_process(self, page_url: str = None):
+        """
+        开始填充流程
 
-    def start_filling_process(self):
-        """开始填充流程"""
+        Args:
+            page_url: 要填充的页面，默认为简历编辑页面
+
+        Returns:
+            bool: 是否成功，失败原因见 last_error
+        """
         print("=== BOSS直聘简历信息自动填充 ===\n")
+        print(f"[配置] 使用 {self.config.describe()}\n")
+        self.last_error = ""
+
+        if not self.interactive:
+            # 无提示模式在启动浏览器前检查必填配置，缺失时立即失败
+            missing = self.missing_required_keys()
+            if missing:
+                self.last_error = f"缺少必填配置: {', '.join(missing)}"
+                print(f"[错误] {self.last_error}")
+                return False
+        if not self._attachment_ready():
+            return False
 
         try:
             # 启动浏览器
             if not self.browser.start_browser():
+                self.last_error = "浏览器启动失败"
                 return False
+            if self.record_dir:
+                self.browser.start_recording(self.record_dir)
+            if self.capture_dir:
+                self.browser.enable_capture(self.capture_dir)
+            self._install_rate_limiter()
+
+            if self._restore_session():
+                # 会话有效，直接打开简历编辑页面
+                self.browser.navigate_to(page_url or self.resume_url)
+                if not self._wait_for_form(None if page_url else self.resume_url_pattern, self.page_timeout):
+                    self.last_error = "简历表单未就绪"
+                    print(f"[错误] {self.last_error}")
+                    return False
+            elif not self.interactive:
+                self.last_error = "登录状态不可用，无提示模式下无法手动登录"
+                print(f"[错误] {self.last_error}")
+                return False
+            else:
+                # 导航到BOSS直聘
+                print("请按以下步骤操作：")
+                print("1. 浏览器将打开BOSS直聘网站")
+                print("2. 请手动登录您的账户")
+                print("3. 登录后，请导航到简历编辑页面")
+                print("4. 检测到简历编辑页面后将自动开始填充")
+
+                with self.browser.priority_lane(rate_limiter.PRIORITY_HIGH):
+                    self.browser.navigate_to(self.base_url)
+
+                # 等待用户手动登录并导航到简历页面，表单一出现就开始填充
+                if not self._wait_for_form(self.resume_url_pattern, self.login_timeout):
+                    self.last_error = "等待简历编辑页面超时"
+                    return False
+                self._save_session()
+                if page_url:
+                    self.browser.navigate_to(page_url)
+                    if not self._wait_for_form(None, self.page_timeout):
+                        self.last_error = "简历表单未就绪"
+                        print(f"[错误] {self.last_error}")
+                        return False
+
+            # 依次填充各类信息
+            self._run_fill_steps()
 
-            # 导航到BOSS直聘
-            print("请按以下步骤操作：")
-            print("1. 浏览器将打开BOSS直聘网站")
-            print("2. 请手动登录您的账户")
-            print("3. 登录后，请导航到简历编辑页面")
-            print("4. 准备好后，按回车键继续自动填充...")
+            print("\n=== 填充完成 ===")
+            if self.interactive:
+                print("请检查填充结果，如需修改可直接在页面上编辑")
+                input("按回车键关闭浏览器...")
 
-            self.browser.navigate_to(self.base_url)
+            return True
 
-            # 等待用户手动登录并导航到简历页面
-            input("\n请完成登录并进入简历编辑页面，然后按回车继续...")
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"[错误] 填充过程出现异常: {e}")
+            return False
+        finally:
+            if self.last_error:
+                self._capture('failed', include_dom=True)
+            self.browser.close_browser()
+            self._release_rate_limiter()
+
+    def _install_rate_limiter(self):
+        """指定了 rate_db 时为浏览器创建限速器（外部已设置限速器时保持不变）"""
+        if self.rate_db and not self.browser.rate_limiter:
+            self._own_rate_limiter = rate_limiter.RateLimiter(self.rate_db)
+            self.browser.set_rate_limiter(self._own_rate_limiter, self.rate_priority)
+
+    def _release_rate_limiter(self):
+        """关闭 _install_rate_limiter 创建的限速器"""
+        if self._own_rate_limiter:
+            self._own_rate_limiter.close()
+            self._own_rate_limiter = None
+            self.browser.rate_limiter = None
+
+    def _attachment_ready(self) -> bool:
+        """检查配置的附件文件是否存在，避免每个任务都因找不到文件而失败"""
+        if self.attachment and not os.path.isfile(self.attachment):
+            self.last_error = f"附件文件不存在: {self.attachment}"
+            print(f"[错误] {self.last_error}")
+            return False
+        return True
 
-            # 开始填充个人信息
-            self._fill_personal_info()
+    def _wait_for_form(self, url_pattern: str, timeout: float) -> bool:
+        """
+        等待简历表单就绪（URL 匹配且出现足够多的必填字段）
 
-            # 填充工作相关信息
-            self._fill_work_info()
+        Args:
+            url_pattern: URL 正则表达式，None 表示不检查 URL
+            timeout: 最长等待时间（秒）
 
-            # 填充教育背景
-            self._fill_education_info()
+        Returns:
+            bool: 是否在超时前就绪
+        """
+        selectors = [field['selector'] for _, required, field in field_catalog.iter_fields() if required]
+        return self.browser.wait_for_page(url_pattern, selectors, self.FORM_SIGNATURE_MIN_MATCHES, timeout)
 
-            # 填充其他信息
-            self._fill_other_info()
+    def _restore_session(self) -> bool:
+        """
+        恢复缓存的登录状态并探测是否仍然有效
 
-            print("\n=== 填充完成 ===")
-            print("请检查填充结果，如需修改可直接在页面上编辑")
-            input("按回车键关闭浏览器...")
+        Returns:
+            bool: 会话有效时返回 True，否则需要手动登录
+        """
+        if not self.session_cache:
+            return False
+        cached = self.session_cache.load(self.session_name)
+        if not cached:
+            return False
+        with self.browser.priority_lane(rate_limiter.PRIORITY_HIGH):
+            if not self.browser.import_session(cached, self.base_url):
+                return False
+            logged_in = self.browser.probe_element(self.LOGIN_PROBE_SELECTOR)
 
+        if logged_in:
+            print("[会话] 登录状态有效，跳过手动登录")
             return True
 
+        print("[会话] 登录状态已失效，需要重新登录")
+        self.session_cache.delete(self.session_name)
+        return False
+
+    def _save_session(self):
+        """手动登录完成后缓存登录状态"""
+        if not self.session_cache or not self.session_cache.available:
+            return
+        if not self.browser.probe_element(self.LOGIN_PROBE_SELECTOR, timeout=2):
+            print("[会话] 未检测到登录状态，本次不缓存（如已登录，请检查 LOGIN_PROBE_SELECTOR）")
+            return
+        try:
+            self.session_cache.save(self.session_name, self.browser.export_session())
         except Exception as e:
-            print(f"[错误] 填充过程出现异常: {e}")
-            return False
+            print(f"[错误] 导出登录状态失败: {e}")
+
+    def _fill_steps(self) -> list:
+        """
+        按顺序返回各个字段批次，批量模式下每完成一批保存一次检查点
+
+        Returns:
+            list: (批次名称, 填充方法) 列表
+        """
+        steps = [
+            ('personal', self._fill_personal_info),
+            ('work', self._fill_work_info),
+            ('education', self._fill_education_info),
+            ('others', self._fill_other_info),
+        ]
+        if self.attachment:
+            steps.append(('attachment', self.upload_resume_attachment))
+        return steps
+
+    def _run_fill_steps(self):
+        """依次执行所有字段批次，录制时在填充前后保存DOM快照"""
+        if self.incremental:
+            self.fill_incremental()
+            self._capture('after_incremental')
+            if self.attachment:
+                self.upload_resume_attachment()
+                self._capture('after_attachment')
+            return
+        self.reset_fill_stats()
+        self.browser.record_snapshot('before_fill')
+        for step_name, fill_step in self._fill_steps():
+            fill_step()
+            self.browser.record_snapshot(f'after_{step_name}')
+            self._capture(f'after_{step_name}')
+
+    def _capture(self, label: str, include_dom: bool = False):
+        """
+        启用取证截图时抓取当前页面（交给后台线程写入，不阻塞填充）
+
+        Args:
+            label: 截图标签
+            include_dom: 是否同时保存DOM快照
+        """
+        if self.capture_dir and self.browser.capture_writer:
+            self.browser.capture_evidence(label, include_dom=include_dom)
+
+    def fill_incremental(self, timeout: float = None, idle_polls: int = 3, poll_interval: float = 0.2):
+        """
+        增量填充：按字段在页面上出现的先后顺序填充，一次连续滚动处理完整个页面
+
+        懒加载或折叠的区块（如教育经历、项目经验）滚动到可见或展开后才渲染，
+        页面中的观察器发现字段后立即填充，不再对尚未渲染的字段逐个等待超时；
+        折叠区块只在配置中有对应值时才展开
+
+        Args:
+            timeout: 最长处理时间（秒），默认为 page_timeout 的 4 倍
+            idle_polls: 滚动到底部后连续多少次轮询没有新字段即结束；仍有必填且所在批次有配置值的
+                字段未出现时继续轮询到超时（这类字段可能在滚动结束后才渲染）
+            poll_interval: 轮询间隔（秒）
+        """
+        self.reset_fill_stats()
+        self.browser.record_snapshot('before_fill')
+
+        steps_with_values = {
+            step_name for step_name, step in field_catalog.FIELD_CATALOG.items()
+            if any(self.config.get_config_value(field['config_section'], field['config_key']).strip()
+                   for field in step['fields'])
+        }
+        remaining = {}
+        awaited = set()  # 需要等到出现或超时的字段，未全部出现前不因页面空闲提前结束
+        for step_name, required, field in field_catalog.iter_fields():
+            name = f"{field['config_section']}.{field['config_key']}"
+            remaining[name] = (field, required)
+            if required and step_name in steps_with_values:
+                awaited.add(name)
+        pending_expand = [
+            step['expand_selector'] for step_name, step in field_catalog.FIELD_CATALOG.items()
+            if step.get('expand_selector') and step_name in steps_with_values
+        ]
+
+        print("\n--- 增量填充 ---")
+        if not self.browser.install_field_observer({name: item[0]['selector'] for name, item in remaining.items()}):
+            # 无法注入观察器时退回逐批填充
+            for step_name in field_catalog.FIELD_CATALOG:
+                self._fill_section(step_name)
+            return
+
+        deadline = time.monotonic() + (timeout or self.page_timeout * 4)
+        idle = 0
+        try:
+            while remaining and time.monotonic() < deadline:
+                for selector in list(pending_expand):
+                    if self.browser.click_if_present(selector):
+                        pending_expand.remove(selector)
+                        idle = 0
+
+                discovered = self.browser.poll_field_observer()
+                if discovered is None:
+                    # 页面重新渲染或跳转，只为尚未处理的字段重新注入观察器
+                    time.sleep(poll_interval)
+                    self.browser.install_field_observer(
+                        {name: item[0]['selector'] for name, item in remaining.items()})
+                    continue
+
+                for name in discovered:
+                    if name in remaining:
+                        field, required = remaining.pop(name)
+                        self._fill_field_safe(field, required, present=True)
+                if discovered:
+                    # 填充可能触发新的渲染，先处理完当前可见的字段再继续滚动
+                    idle = 0
+                    continue
+
+                if self.browser.scroll_page_step():
+                    idle += 1
+                    if idle >= idle_polls and awaited.isdisjoint(remaining):
+                        break
+                else:
+                    idle = 0
+                time.sleep(poll_interval)
         finally:
-            self.browser.close_browser()
+            self.browser.remove_field_observer()
 
-    def _fill_personal_info(self):
-        """填充个人基础信息"""
-        print("\n--- 填充个人基础信息 ---")
-
-        # 常见的个人信息字段选择器（需要根据实际页面调整）
-        fields = [
-            {
-                'selector': 'input[name="name"], input[placeholder*="姓名"], input[placeholder*="真实姓名"]',
-                'config_section': 'PersonalInfo',
-                'config_key': 'name',
-                'prompt': '[个人信息] 请输入您的真实姓名:'
-            },
-            {
-                'selector': 'input[name="mobile"], input[placeholder*="手机"], input[placeholder*="电话"]',
-                'config_section': 'PersonalInfo',
-                'config_key': 'phone',
-                'prompt': '[个人信息] 请输入您的手机号码:'
-            },
-            {
-                'selector': 'input[name="email"], input[placeholder*="邮箱"], input[type="email"]',
-                'config_section': 'PersonalInfo',
-                'config_key': 'email',
-                'prompt': '[个人信息] 请输入您的邮箱地址:'
-            },
-            {
-                'selector': 'input[name="age"], input[placeholder*="年龄"]',
-                'config_section': 'PersonalInfo',
-                'config_key': 'age',
-                'prompt': '[个人信息] 请输入您的年龄:'
-            },
-            {
-                'selector': 'input[name="address"], input[placeholder*="地址"], input[placeholder*="现居"]',
-                'config_section': 'PersonalInfo',
-                'config_key': 'address',
-                'prompt': '[个人信息] 请输入您的现居地址:'
-            }
+        for name in remaining:
+            self.fill_stats['not_found'].append(name)
+            print(f"[跳过] 未找到字段: {name}")
+        self.browser.record_snapshot('after_incremental')
+
+    def upload_resume_attachment(self, path: str = None, force: bool = False) -> dict:
+        """
+        上传附件简历，该账户在网站上已有相同内容的文件时跳过
+
+        Args:
+            path: 附件文件路径，默认使用 self.attachment
+            force: 忽略上传记录，强制重新上传
+
+        Returns:
+            dict: {uploaded, skipped, seconds, sha256}
+
+        Raises:
+            RuntimeError: 上传失败（批量模式下任务会被标记为失败并重试）
+        """
+        path = path or self.attachment
+        if self.upload_ledger is None:
+            self.upload_ledger = upload_ledger.UploadLedger()
+        account = self.config.profile or 'default'
+        sha256 = self.upload_ledger.file_hash(path)
+
+        previous = self.upload_ledger.find_upload('zhipin', account, sha256)
+        if previous and not force:
+            print(f"\n[附件] 网站上已有相同文件 {previous['file_name']}，跳过上传")
+            result = {'uploaded': False, 'skipped': True, 'seconds': 0.0, 'sha256': sha256}
+        else:
+            print("\n--- 上传附件简历 ---")
+            started = time.perf_counter()
+            selector = self._attachment_input_selector()
+            if not selector:
+                raise RuntimeError("未找到附件上传输入框")
+            # 页面上可能已经显示着之前的附件，上传前先记下文件名区域的内容
+            before = self.browser.get_texts(self.ATTACHMENT_DONE_SELECTOR)
+            file_name = os.path.basename(path)
+            if not self.browser.upload_file(selector, path):
+                raise RuntimeError(f"附件上传失败: {path}")
+            # 等待页面显示新上传的文件名（或文件名区域发生变化），只有确认完成的上传才会被记录
+            expected = None if any(file_name in text for text in before) else file_name
+            confirmed = self.browser.wait_for_text(self.ATTACHMENT_DONE_SELECTOR, expected, before,
+                                                   self.page_timeout * 4)
+            seconds = round(time.perf_counter() - started, 3)
+            if confirmed:
+                self.upload_ledger.record_upload('zhipin', account, sha256, path, seconds)
+                print(f"[附件] 上传完成，耗时 {seconds} 秒")
+            else:
+                print("[警告] 未检测到上传完成标志，本次不记录（请在页面上确认附件，"
+                      "或调整 ATTACHMENT_DONE_SELECTOR）")
+            result = {'uploaded': confirmed, 'skipped': False, 'seconds': seconds, 'sha256': sha256}
+
+        if not self.fill_stats:
+            self.reset_fill_stats()
+        self.fill_stats['attachment'] = result
+        return result
+
+    def _attachment_input_selector(self) -> str:
+        """
+        等待任一文件输入框出现，返回优先级最高的匹配选择器
+
+        Returns:
+            str: 选择器，超时未出现时返回空字符串
+        """
+        if not self.browser.wait_for_page(None, self.ATTACHMENT_INPUT_SELECTORS, 1, self.page_timeout):
+            return ""
+        for selector in self.ATTACHMENT_INPUT_SELECTORS:
+            if self.browser.probe_element(selector, timeout=0):
+                return selector
+        return ""
+
+    def reset_fill_stats(self):
+        """清空字段填充结果统计"""
+        self.fill_stats = {'filled': [], 'empty': [], 'not_found': [], 'failed': []}
+
+    def missing_required_keys(self) -> list:
+        """
+        检查必填字段在配置中是否都有值（不询问用户）
+
+        Returns:
+            list: 缺失的配置项，格式为 节名.键名
+        """
+        return [
+            f"{field['config_section']}.{field['config_key']}"
+            for _, required, field in field_catalog.iter_fields()
+            if required and not self.config.get_config_value(field['config_section'], field['config_key']).strip()
         ]
 
-        for field in fields:
-            self._fill_field_safe(field)
+    def _fill_personal_info(self):
+        """填充个人基础信息"""
+        self._fill_section('personal')
 
     def _fill_work_info(self):
         """填充工作相关信息"""
-        print("\n--- 填充工作相关信息 ---")
-
-        fields = [
-            {
-                'selector': 'input[name="expectedSalary"], input[placeholder*="期望薪资"], input[placeholder*="薪资"]',
-                'config_section': 'WorkInfo',
-                'config_key': 'expected_salary',
-                'prompt': '[工作信息] 请输入您的期望薪资 (如: 15k-25k):'
-            },
-            {
-                'selector': 'input[name="jobTitle"], input[placeholder*="职位"], input[placeholder*="岗位"]',
-                'config_section': 'WorkInfo',
-                'config_key': 'desired_position',
-                'prompt': '[工作信息] 请输入您的期望职位:'
-            },
-            {
-                'selector': 'input[name="workExperience"], input[placeholder*="工作经验"], input[placeholder*="经验"]',
-                'config_section': 'WorkInfo',
-                'config_key': 'work_experience',
-                'prompt': '[工作信息] 请输入您的工作经验 (如: 3年):'
-            },
-            {
-                'selector': 'textarea[name="selfIntroduction"], textarea[placeholder*="自我介绍"], textarea[placeholder*="个人描述"]',
-                'config_section': 'WorkInfo',
-                'config_key': 'self_introduction',
-                'prompt': '[工作信息] 请输入您的自我介绍:'
-            }
-        ]
-
-        for field in fields:
-            self._fill_field_safe(field)
+        self._fill_section('work')
 
     def _fill_education_info(self):
         """填充教育背景信息"""
-        print("\n--- 填充教育背景信息 ---")
-
-        fields = [
-            {
-                'selector': 'input[name="school"], input[placeholder*="学校"], input[placeholder*="院校"]',
-                'config_section': 'Education',
-                'config_key': 'school_name',
-                'prompt': '[教育背景] 请输入您的毕业院校:'
-            },
-            {
-                'selector': 'input[name="major"], input[placeholder*="专业"]',
-                'config_section': 'Education',
-                'config_key': 'major',
-                'prompt': '[教育背景] 请输入您的专业:'
-            },
-            {
-                'selector': 'input[name="degree"], input[placeholder*="学历"]',
-                'config_section': 'Education',
-                'config_key': 'degree',
-                'prompt': '[教育背景] 请输入您的学历 (如: 本科/硕士/博士):'
-            },
-            {
-                'selector': 'input[name="graduationYear"], input[placeholder*="毕业时间"], input[placeholder*="毕业年份"]',
-                'config_section': 'Education',
-                'config_key': 'graduation_year',
-                'prompt': '[教育背景] 请输入您的毕业年份 (如: 2020):'
-            }
-        ]
-
-        for field in fields:
-            self._fill_field_safe(field)
+        self._fill_section('education')
 
     def _fill_other_info(self):
         """填充其他信息"""
-        print("\n--- 填充其他信息 ---")
-
-        fields = [
-            {
-                'selector': 'textarea[name="projectExperience"], textarea[placeholder*="项目经验"]',
-                'config_section': 'Others',
-                'config_key': 'project_experience',
-                'prompt': '[其他信息] 请输入您的项目经验:'
-            },
-            {
-                'selector': 'textarea[name="skills"], textarea[placeholder*="技能"], textarea[placeholder*="专业技能"]',
-                'config_section': 'Others',
-                'config_key': 'professional_skills',
-                'prompt': '[其他信息] 请输入您的专业技能:'
-            },
-            {
-                'selector': 'input[name="github"], input[placeholder*="GitHub"], input[placeholder*="github"]',
-                'config_section': 'Others',
-                'config_key': 'github_url',
-                'prompt': '[其他信息] 请输入您的GitHub地址 (可选，直接回车跳过):'
-            }
-        ]
+        self._fill_section('others')
+
+    def _fill_section(self, step_name: str):
+        """
+        填充字段目录中的一个批次
+
+        Args:
+            step_name: 批次名称，见 field_catalog.FIELD_CATALOG
+        """
+        step = field_catalog.FIELD_CATALOG[step_name]
+        print(f"\n--- 填充{step['title']} ---")
 
-        for field in fields:
-            self._fill_field_safe(field, required=False)
+        for field in step['fields']:
+            self._fill_field_safe(field, required=step['required'])
 
-    def _fill_field_safe(self, field_config: dict, required: bool = True):
+    def _fill_field_safe(self, field_config: dict, required: bool = True, present: bool = False):
         """
         安全地填充字段
 
         Args:
             field_config: 字段配置字典
             required: 是否必填字段
+            present: 字段已确认在页面上存在时跳过查找
         """
         selector = field_config['selector']
-        config_section = field_config['config_section']
         config_key = field_config['config_key']
-        prompt = field_config['prompt']
+
+        name = f"{field_config['config_section']}.{config_key}"
+        if not self.fill_stats:
+            self.reset_fill_stats()
 
         try:
             # 尝试找到元素
-            element = self.browser.find_element_safe(selector)
-
-            if element:
+            if present or self.browser.find_element_safe(selector):
                 # 获取配置值（可能会询问用户）
-                if required:
-                    value = config_manager.get_or_ask(config_section, config_key, prompt)
-                else:
-                    # 非必填字段，允许空值
-                    try:
-                        value = config_manager.get_config(config_section, config_key)
-                        if not value:
-                            print(f"{prompt}")
-                            user_input = input("请输入 (可选，直接回车跳过): ").strip()
-                            if user_input:
-                                config_manager.set_config(config_section, config_key, user_input)
-                                value = user_input
-                    except:
-                        print(f"{prompt}")
-                        user_input = input("请输入 (可选，直接回车跳过): ").strip()
-                        if user_input:
-                            config_manager.set_config(config_section, config_key, user_input)
-                            value = user_input
-                        else:
-                            value = ""
-
-                # 如果有值则填充
-                if value:
-                    success = self.browser.find_and_fill(selector, value)
-                    if success:
-                        # 填充成功后稍等一下
-                        time.sleep(0.5)
-                    else:
-                        print(f"[跳过] 无法填充字段: {config_key}")
-                else:
-                    print(f"[跳过] 字段为空: {config_key}")
+                value = self._resolve_value(field_config, required)
+                self._fill_resolved(field_config, value)
             else:
+                self.fill_stats['not_found'].append(name)
                 print(f"[跳过] 未找到字段: {config_key}")
 
+        except config_manager.MissingConfigError:
+            # 无提示模式下缺少配置，中止整个填充
+            raise
         except Exception as e:
+            self.fill_stats['failed'].append(name)
             print(f"[错误] 填充字段失败 {config_key}: {e}")
 
+    def _resolve_value(self, field_config: dict, required: bool) -> str:
+        """
+        获取字段的配置值，交互模式下缺失时询问用户
+
+        Args:
+            field_config: 字段配置字典
+            required: 是否必填字段
+
+        Returns:
+            str: 配置值，非必填字段可能为空
+        """
+        config_section = field_config['config_section']
+        config_key = field_config['config_key']
+        prompt = field_config['prompt']
+
+        if required:
+            return self.config.get_or_ask(config_section, config_key, prompt,
+                                          interactive=self.interactive)
+
+        # 非必填字段，允许空值
+        try:
+            value = self.config.get_config_value(config_section, config_key)
+            if not value and self.interactive:
+                print(f"{prompt}")
+                user_input = input("请输入 (可选，直接回车跳过): ").strip()
+                if user_input:
+                    self.config.set_config_value(config_section, config_key, user_input)
+                    value = user_input
+        except:
+            print(f"{prompt}")
+            user_input = input("请输入 (可选，直接回车跳过): ").strip()
+            if user_input:
+                self.config.set_config_value(config_section, config_key, user_input)
+                value = user_input
+            else:
+                value = ""
+        return value
+
+    def _fill_resolved(self, field_config: dict, value: str):
+        """
+        把已获取的配置值填入页面上已存在的字段，并记录结果
+
+        Args:
+            field_config: 字段配置字典
+            value: 配置值
+        """
+        config_key = field_config['config_key']
+        name = f"{field_config['config_section']}.{config_key}"
+
+        # 如果有值则填充
+        if value:
+            success = self.browser.find_and_fill(field_config['selector'], value)
+            if success:
+                self.fill_stats['filled'].append(name)
+                # 填充成功后稍等一下
+                time.sleep(0.5)
+            else:
+                self.fill_stats['failed'].append(name)
+                print(f"[跳过] 无法填充字段: {config_key}")
+        else:
+            self.fill_stats['empty'].append(name)
+            print(f"[跳过] 字段为空: {config_key}")
+
     def _try_multiple_selectors(self, selectors: list) -> str:
         """
         尝试多个选择器，返回第一个找到的
@@ -273,25 +594,203 @@ class ZhipinFiller:
                 return selector
         return ""
 
-    def fill_specific_page(self, page_url: str):
+    def plan_current_page(self) -> dict:
+        """
+        抓取一次当前页面源码，离线生成填充计划（不查找元素、不询问用户）
+
+        Returns:
+            dict: fill_planner.plan_fill 的结果
         """
-        填充指定页面
+        plan = fill_planner.plan_fill(self.browser.driver.page_source, self.config)
+        fill_planner.print_plan(plan, self.browser.get_current_url())
+        return plan
+
+    def fill_specific_page(self, page_url: str = None):
+        """
+        在已打开的浏览器中填充指定页面（配合 open_session 连续填充多个页面）
 
         Args:
-            page_url: 页面URL
+            page_url: 页面URL，默认为简历编辑页面
+
+        Returns:
+            bool: 是否成功打开页面并执行了填充，失败原因见 last_error
         """
+        self.last_error = ""
+        page_url = page_url or self.resume_url
         print(f"导航到指定页面: {page_url}")
-        if self.browser.navigate_to(page_url):
-            time.sleep(2)  # 等待页面加载
-            self._fill_personal_info()
-            self._fill_work_info()
-            self._fill_education_info()
-            self._fill_other_info()
+        if not self.browser.navigate_to(page_url):
+            self.last_error = "页面导航失败"
+            return False
+        if not self._wait_for_form(None, self.page_timeout):
+            self.last_error = "简历表单未就绪"
+            print(f"[错误] {self.last_error}")
+            return False
+        self._run_fill_steps()
+        return True
+
+    def open_session(self) -> bool:
+        """
+        启动浏览器并恢复登录状态，之后可以在同一个浏览器中连续填充多个页面
+
+        Returns:
+            bool: 是否可以开始填充，失败原因见 last_error
+        """
+        self.last_error = ""
+        if not self._attachment_ready():
+            return False
+        if not self.browser.start_browser():
+            self.last_error = "浏览器启动失败"
+            print(f"[错误] {self.last_error}")
+            return False
+        if self.record_dir:
+            self.browser.start_recording(self.record_dir)
+        if self.capture_dir:
+            self.browser.enable_capture(self.capture_dir)
+        self._install_rate_limiter()
+        return self._ensure_logged_in()
+
+    def recover_session(self) -> bool:
+        """
+        浏览器崩溃后自动重启，新的浏览器需要重新恢复登录状态
+
+        Returns:
+            bool: 浏览器是否可用，失败原因见 last_error
+        """
+        if self.browser.is_alive():
+            return True
+        if not self.browser.restart_browser():
+            self.last_error = "浏览器重启失败"
+            print(f"[错误] {self.last_error}")
+            return False
+        return self._ensure_logged_in()
+
+    def close_session(self):
+        """关闭 open_session 启动的浏览器"""
+        self.browser.close_browser()
+        self._release_rate_limiter()
+
+    def run_queue(self, queue: job_queue.JobQueue, max_jobs: int = None) -> dict:
+        """
+        批量处理任务队列中的页面，浏览器崩溃或中断后未完成的任务会重新处理
+
+        Args:
+            queue: 任务队列
+            max_jobs: 最多处理的任务数，默认处理到队列为空
+
+        Returns:
+            dict: 队列统计信息；未能开始处理任务时原因见 last_error
+        """
+        print("=== BOSS直聘批量填充 ===\n")
+        try:
+            if not self.open_session():
+                return queue.get_stats()
+
+            processed = 0
+            while max_jobs is None or processed < max_jobs:
+                job = queue.claim_next()
+                if job is None:
+                    print("[队列] 没有待处理的任务")
+                    break
+
+                processed += 1
+                self._run_job(queue, job)
+
+        except KeyboardInterrupt:
+            print("\n[队列] 用户中断，未完成的任务将在下次运行时继续")
+        finally:
+            self.close_session()
+
+        if self.browser.recycle_count:
+            print(f"[回收] 本次运行共重启浏览器 {self.browser.recycle_count} 次")
+        queue.show_stats()
+        return queue.get_stats()
+
+    def _ensure_logged_in(self) -> bool:
+        """
+        恢复缓存的登录状态，无效时在交互模式下等待手动登录
+
+        Returns:
+            bool: 是否已登录，失败原因见 last_error
+        """
+        if self._restore_session():
+            return True
+        if not self.interactive:
+            self.last_error = "登录状态不可用，无提示模式下无法手动登录"
+            print(f"[错误] {self.last_error}")
+            return False
+        with self.browser.priority_lane(rate_limiter.PRIORITY_HIGH):
+            self.browser.navigate_to(self.base_url)
+        print("\n请在浏览器中完成登录，检测到登录后将自动开始处理任务队列...")
+        if not self.browser.wait_for_page(None, [self.LOGIN_PROBE_SELECTOR], 1, self.login_timeout):
+            self.last_error = "等待登录超时"
+            print(f"[错误] {self.last_error}")
+            return False
+        self._save_session()
+        return True
+
+    def _run_job(self, queue: job_queue.JobQueue, job: dict):
+        """
+        处理单个任务：重新打开的页面上没有上次填写的内容，所有批次都重新填充；
+        每完成一批（没有字段失败）保存检查点，记录本次尝试的进度。
+        增量模式下字段按出现顺序一次填充完，之后统一保存字段批次的检查点
+
+        Args:
+            queue: 任务队列
+            job: claim_next 返回的任务信息
+        """
+        print(f"\n[任务 {job['id']}] 第 {job['attempts']} 次尝试: {job['url']}")
+        if job['checkpoint']:
+            print(f"[任务 {job['id']}] 上次尝试已完成: {', '.join(job['checkpoint'])}，本次重新填充全部批次")
+        self.reset_fill_stats()
+
+        try:
+            if not self.recover_session():
+                raise RuntimeError(self.last_error)
+
+            if not self.browser.navigate_to(job['url']):
+                raise RuntimeError("页面导航失败")
+            if not self._wait_for_form(None, self.page_timeout):
+                raise RuntimeError("简历表单未就绪")
+
+            completed = []
+            steps = self._fill_steps()
+            if self.incremental:
+                # 增量填充一次处理所有字段批次，再按批次统计是否有字段失败
+                self.fill_incremental()
+                self._capture(f"job{job['id']}_after_incremental")
+                failed = set(self.fill_stats['failed'])
+                for step_name, step in field_catalog.FIELD_CATALOG.items():
+                    if not any(f"{field['config_section']}.{field['config_key']}" in failed
+                               for field in step['fields']):
+                        completed.append(step_name)
+                queue.save_checkpoint(job['id'], completed)
+                steps = [(step_name, fill_step) for step_name, fill_step in steps
+                         if step_name not in field_catalog.FIELD_CATALOG]
+
+            for step_name, fill_step in steps:
+                failed_before = len(self.fill_stats['failed'])
+                fill_step()
+                self.browser.record_snapshot(f'after_{step_name}')
+                self._capture(f"job{job['id']}_after_{step_name}")
+                if len(self.fill_stats['failed']) > failed_before:
+                    continue
+                completed.append(step_name)
+                queue.save_checkpoint(job['id'], completed)
+
+            if self.fill_stats['failed']:
+                raise RuntimeError(f"字段填充失败: {', '.join(self.fill_stats['failed'])}")
+            queue.mark_done(job['id'])
+            print(f"[任务 {job['id']}] 完成")
+
+        except Exception as e:
+            self._capture(f"job{job['id']}_failed", include_dom=True)
+            queue.mark_failed(job['id'], str(e))
+            print(f"[任务 {job['id']}] 失败: {e}")
 
 
 def main():
     """主函数"""
-    filler = ZhipinFiller()
+    filler = ZhipinFiller(profile=sys.argv[1] if len(sys.argv) > 1 else None)
     filler.start_filling_process()
 
 